@@ -1,13 +1,19 @@
-# Top-level modules
-from PSSimPy.bank import *
-from PSSimPy.account import *
-from PSSimPy.transaction import *
-from PSSimPy.system import *
+from PSSimPy._lazy import attach
 
-# Packages
-from PSSimPy.credit_facilities import *
-from PSSimPy.queues import *
-from PSSimPy.constraint_handler import *
-from PSSimPy.transaction_fee import *
-from PSSimPy.utils import *
-from PSSimPy.simulator import *
\ No newline at end of file
+# Public names are imported from their modules when first used, so that importing PSSimPy stays fast
+# and dependencies such as pandas and simpy are only loaded by the parts of the package that need them.
+__getattr__, __dir__, __all__ = attach(__name__, {
+    # Top-level modules
+    'bank': ['Bank', 'StrategyView', 'ArrayStrategyBank'],
+    'account': ['Account'],
+    'transaction': ['Transaction'],
+    'system': ['System'],
+
+    # Packages
+    'credit_facilities': '*',
+    'queues': '*',
+    'constraint_handler': '*',
+    'transaction_fee': '*',
+    'utils': '*',
+    'simulator': '*'
+})
\ No newline at end of file
@@ -0,0 +1,32 @@
+import importlib
+import sys
+from typing import Callable, Dict, List, Tuple, Union
+
+
+def attach(package_name: str, submodule_names: Dict[str, Union[List[str], str]]) -> Tuple[Callable, Callable, List[str]]:
+    """
+    Returns the __getattr__, __dir__ and __all__ of a package that exports the given public names of its submodules without importing them.
+    A submodule is only imported when one of its names is first accessed, after which the name is stored in the package.
+    A subpackage given '*' exports all the names in its own __all__. When a name is exported by several submodules, the last one is used.
+    """
+    package = sys.modules[package_name]
+    name_to_submodule = {}
+    for submodule, names in submodule_names.items():
+        if names == '*':
+            names = importlib.import_module(f'{package_name}.{submodule}').__all__
+        name_to_submodule.update(dict.fromkeys(names, submodule))
+
+    def __getattr__(name: str):
+        if name in submodule_names:
+            return importlib.import_module(f'{package_name}.{name}')
+        submodule = name_to_submodule.get(name)
+        if submodule is None:
+            raise AttributeError(f'module {package_name!r} has no attribute {name!r}')
+        value = getattr(importlib.import_module(f'{package_name}.{submodule}'), name)
+        setattr(package, name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(package)) | set(submodule_names) | set(name_to_submodule))
+
+    return __getattr__, __dir__, list(name_to_submodule)
@@ -1,17 +1,85 @@
+from collections import deque
+from typing import Union
+
+
 class Account:
 
+    # fixed fields are stored in slots, while additional user-defined attributes go to an instance dictionary that is only created when first needed
+    __slots__ = ('id', 'owner', 'balance', 'posted_collateral', '_txn_in', '_txn_out', '_history_windows',
+                 'txn_in_count', 'txn_in_value', 'txn_out_count', 'txn_out_value', '__dict__')
+
     def __init__(self, id: str, owner, balance: float=0, posted_collateral: float = 0, **kwargs):
         self.id = id
         self.owner = owner
         self.balance = balance
         self.posted_collateral = posted_collateral
-        self.txn_in = set()
-        self.txn_out = set()
+        self._txn_in = None
+        self._txn_out = None
+        self._history_windows = None # transactions of each retained window, only used with a rolling history
+        # running totals of all transactions received and sent, kept regardless of the history retained
+        self.txn_in_count = 0
+        self.txn_in_value = 0
+        self.txn_out_count = 0
+        self.txn_out_value = 0
 
         # Use the kwargs to store additional user-defined attributes
         for key, value in kwargs.items():
             setattr(self, key, value)
 
+    @property
+    def txn_in(self) -> set:
+        # created on first use as many accounts never receive or send a transaction
+        if self._txn_in is None:
+            self._txn_in = set()
+        return self._txn_in
+
+    @txn_in.setter
+    def txn_in(self, transactions: set) -> None:
+        self._txn_in = transactions
+
+    @property
+    def txn_out(self) -> set:
+        if self._txn_out is None:
+            self._txn_out = set()
+        return self._txn_out
+
+    @txn_out.setter
+    def txn_out(self, transactions: set) -> None:
+        self._txn_out = transactions
+
+    def add_transactions(self, txn_in: set, txn_out: set, history: Union[str, int] = 'all') -> None:
+        """
+        Records the transactions received and sent by the account in a time window.
+        history sets what is kept in txn_in and txn_out: 'all' transactions, those of the current 'day', the last N windows if an integer, or only the running totals if 'counters'.
+        """
+        self.txn_in_count += len(txn_in)
+        self.txn_in_value += sum(transaction.amount for transaction in txn_in)
+        self.txn_out_count += len(txn_out)
+        self.txn_out_value += sum(transaction.amount for transaction in txn_out)
+        if history == 'counters':
+            return
+        if isinstance(history, int):
+            if self._history_windows is None:
+                self._history_windows = deque()
+            self._history_windows.append((txn_in, txn_out))
+            # drop the transactions of the windows that are no longer retained
+            while len(self._history_windows) > history:
+                expired_in, expired_out = self._history_windows.popleft()
+                if expired_in:
+                    self.txn_in.difference_update(expired_in)
+                if expired_out:
+                    self.txn_out.difference_update(expired_out)
+        if txn_in:
+            self.txn_in.update(txn_in)
+        if txn_out:
+            self.txn_out.update(txn_out)
+
+    def clear_history(self) -> None:
+        """Drops the retained transactions while keeping the running totals."""
+        self._txn_in = None
+        self._txn_out = None
+        self._history_windows = None
+
     def transfer_to(self, recipient: 'Account', amount: float) -> None:
         self.balance -= amount
         recipient.balance += amount
@@ -1,7 +1,16 @@
+from typing import Sequence
+import numpy as np
+
 from PSSimPy.queues.abstract_queue import AbstractQueue
+from PSSimPy.transaction import Transaction
+from PSSimPy.account import Account
+from PSSimPy.utils.time_utils import time_to_minutes
 
 class Bank:
 
+    # fixed fields are stored in slots, while additional user-defined attributes go to an instance dictionary that is only created when first needed
+    __slots__ = ('name', 'strategy_type', 'is_failed', '__dict__')
+
     def __init__(self, name: str, strategy_type: str='Normal', **kwargs):
         self.name = name
         self.strategy_type = strategy_type
@@ -13,4 +22,65 @@ class Bank:
 
     # only relevant for agent-based modeling
     def strategy(self, txns_to_settle: set, all_outstanding_transactions: set, sim_name: str, day: int, current_time: str, queue: AbstractQueue) -> set:
-        return txns_to_settle
\ No newline at end of file
+        return txns_to_settle
+
+class StrategyView:
+    """
+    Array view of a bank's outstanding transactions, as passed to ArrayStrategyBank.array_strategy.
+    The transaction arrays share the same order, and so do the account arrays.
+    """
+
+    def __init__(self, transactions: Sequence[Transaction], accounts: Sequence[Account], day: int, current_time: str, credit_facility=None):
+        num_txns = len(transactions)
+        current_minutes = time_to_minutes(current_time)
+        # outstanding transactions
+        self.amounts = np.fromiter((transaction.amount for transaction in transactions), dtype=float, count=num_txns)
+        self.sender_accounts = np.array([transaction.sender_account.id for transaction in transactions], dtype=object)
+        self.recipient_accounts = np.array([transaction.recipient_account.id for transaction in transactions], dtype=object)
+        self.counterparties = np.array([transaction.recipient_account.owner.name for transaction in transactions], dtype=object)
+        self.priorities = np.fromiter((transaction.priority for transaction in transactions), dtype=int, count=num_txns)
+        self.arrival_days = np.fromiter((transaction.arrival_day for transaction in transactions), dtype=int, count=num_txns)
+        self.arrival_minutes = np.fromiter((time_to_minutes(transaction.arrival_time) if transaction.arrival_time is not None else current_minutes
+                                            for transaction in transactions), dtype=int, count=num_txns)
+        self.ages = (day - self.arrival_days) * 1440 + current_minutes - self.arrival_minutes # minutes since arrival
+        # accounts of the bank
+        self.account_ids = np.array([account.id for account in accounts], dtype=object)
+        self.balances = np.fromiter((account.balance for account in accounts), dtype=float, count=len(accounts))
+        self.credit = np.fromiter((credit_facility.get_total_credit(account) if credit_facility is not None else 0.0 for account in accounts),
+                                  dtype=float, count=len(accounts))
+
+    def __len__(self) -> int:
+        return len(self.amounts)
+
+    def selected_positions(self, selection) -> np.ndarray:
+        """Converts a boolean mask or an index array over the outstanding transactions into an array of positions."""
+        selection = np.asarray(selection)
+        if selection.dtype == bool:
+            if selection.shape != (len(self),):
+                raise ValueError(f'Boolean mask has shape {selection.shape} but {len(self)} transactions are outstanding.')
+            return np.flatnonzero(selection)
+        if selection.size == 0:
+            return np.empty(0, dtype=int)
+        if not np.issubdtype(selection.dtype, np.integer):
+            raise ValueError('Selection must be a boolean mask or an array of integer indices.')
+        if selection.min() < 0 or selection.max() >= len(self):
+            raise ValueError(f'Selection holds indices outside the range 0 to {len(self) - 1} of the {len(self)} outstanding transactions.')
+        return np.unique(selection)
+
+
+class ArrayStrategyBank(Bank):
+    """
+    Bank whose strategy works on NumPy arrays instead of sets of transactions.
+    Subclasses should overwrite array_strategy.
+    """
+
+    def array_strategy(self, view: StrategyView, sim_name: str, day: int, current_time: str) -> np.ndarray:
+        """Returns a boolean mask or an index array of the transactions in the view to settle in the current time window."""
+        return np.ones(len(view), dtype=bool)
+
+    def strategy(self, txns_to_settle: set, all_outstanding_transactions: set, sim_name: str, day: int, current_time: str, queue: AbstractQueue) -> set:
+        # only used if the bank is called through the set-based interface, in which case credit usage is not known
+        transactions = list(txns_to_settle)
+        accounts = list({transaction.sender_account.id: transaction.sender_account for transaction in transactions}.values())
+        view = StrategyView(transactions, accounts, day, current_time)
+        return {transactions[position] for position in view.selected_positions(self.array_strategy(view, sim_name, day, current_time))}
@@ -0,0 +1,290 @@
+"""
+Command-line runner for batches of simulations described in a JSON, TOML or YAML run spec.
+
+    pssimpy runs.yaml --workers 4
+
+The spec lists the jobs to run, with optional defaults shared by all jobs:
+
+    output_dir: output            # relative to the spec file, one subdirectory of logs per job
+    workers: 4
+    defaults:
+      simulator: abm              # 'basic' (default) or 'abm'
+      banks: banks.csv            # CSV, JSON (columns as lists) or Parquet files, relative to the spec file
+      accounts: accounts.csv
+      queue: FIFOQueue            # class names from PSSimPy or 'module.Class', optionally with parameters:
+      constraint_handler: {class: MinBalanceConstraintHandler, params: {min_balance: 50}}
+      num_days: 5                 # any other key is passed to the simulator
+    jobs:
+      - name: baseline
+        txn_arrival_prob: 0.05
+        txn_amount_range: [1, 100]
+        seeds: [1, 2, 3]          # one job per seed, named baseline-seed1 etc.
+      - name: synthetic
+        simulator: basic
+        workload: {num_banks: 50, num_payments_per_day: 10000, num_days: 5}   # generated by WorkloadGenerator, replacing input files
+        seed: 0
+
+Finished jobs leave a marker in their output directory and are skipped when the batch is run again, unless their spec changed or --force is given.
+Failed jobs leave their traceback in the same directory and are run again.
+"""
+import argparse
+import importlib
+import json
+import os
+import shutil
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+from typing import Callable, Dict, List
+
+SIMULATORS = {'basic': 'BasicSim', 'abm': 'ABMSim'}
+COMPONENT_PACKAGES = {
+    'constraint_handler': 'PSSimPy.constraint_handler',
+    'queue': 'PSSimPy.queues',
+    'credit_facility': 'PSSimPy.credit_facilities',
+    'transaction_fee_handler': 'PSSimPy.transaction_fee'
+}
+INPUT_KEYS = ('banks', 'accounts', 'transactions')
+DONE_MARKER = '_done.json'
+ERROR_FILE = '_error.txt'
+
+
+def load_spec(path: str) -> dict:
+    """Reads a run spec from a .json, .toml, .yaml or .yml file."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.json':
+        with open(path) as f:
+            return json.load(f)
+    if extension == '.toml':
+        try:
+            import tomllib
+        except ImportError: # Python < 3.11
+            try:
+                import tomli as tomllib
+            except ImportError:
+                raise ValueError('Reading TOML specs requires Python 3.11 or the tomli package (pip install PSSimPy[toml]).')
+        with open(path, 'rb') as f:
+            return tomllib.load(f)
+    if extension in ('.yaml', '.yml'):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError('Reading YAML specs requires the PyYAML package (pip install PSSimPy[yaml]).')
+        with open(path) as f:
+            return yaml.safe_load(f)
+    raise ValueError(f'Unsupported spec format {extension!r}. Use .json, .toml, .yaml or .yml.')
+
+
+def validate_job_name(name: str) -> None:
+    """Raises a ValueError if the name cannot be used as the job's directory under the output directory."""
+    separators = [separator for separator in (os.sep, os.altsep) if separator]
+    if not isinstance(name, str) or name in ('', '.', '..') or any(separator in name for separator in separators):
+        raise ValueError(f"Job name {name!r} must be a non-empty string that is not '.' or '..' and contains no path separator.")
+
+
+def expand_jobs(spec: dict, spec_dir: str) -> List[dict]:
+    """Returns the jobs of the spec with the defaults applied, input paths relative to spec_dir made absolute, and one job per seed."""
+    defaults = spec.get('defaults', {})
+    jobs = []
+    names = set()
+    for job_spec in spec.get('jobs', []):
+        job = dict(defaults, **job_spec)
+        if 'name' not in job:
+            raise ValueError('Every job needs a name.')
+        if job.get('simulator', 'basic') not in SIMULATORS:
+            raise ValueError(f"Job {job['name']!r}: simulator must be one of {', '.join(SIMULATORS)}.")
+        for key in INPUT_KEYS:
+            if isinstance(job.get(key), str):
+                job[key] = os.path.join(spec_dir, job[key])
+        seeds = job.pop('seeds', None)
+        expanded_jobs = [job] if seeds is None else [dict(job, name=f"{job['name']}-seed{seed}", seed=seed) for seed in seeds]
+        for expanded_job in expanded_jobs:
+            validate_job_name(expanded_job['name'])
+            if expanded_job['name'] in names:
+                raise ValueError(f"Job name {expanded_job['name']!r} is used more than once.")
+            names.add(expanded_job['name'])
+        jobs.extend(expanded_jobs)
+    return jobs
+
+
+def resolve_class(name: str, package: str) -> type:
+    """Returns the class with the given name from the package, or from the module of a dotted 'module.Class' name."""
+    module_name, _, class_name = name.rpartition('.')
+    return getattr(importlib.import_module(module_name or package), class_name)
+
+
+def component_factory(component_spec, package: str) -> Callable:
+    """Returns a factory for a component given as a class name or as {'class': name, 'params': {...}}."""
+    if isinstance(component_spec, str):
+        return resolve_class(component_spec, package)
+    return partial(resolve_class(component_spec['class'], package), **component_spec.get('params', {}))
+
+
+def read_table(path: str):
+    """Reads an input table as a dictionary of columns, or a DataFrame for CSV and Parquet files."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.json':
+        with open(path) as f:
+            return json.load(f)
+    import pandas as pd
+    if extension == '.csv':
+        return pd.read_csv(path)
+    if extension == '.parquet':
+        return pd.read_parquet(path)
+    raise ValueError(f'Unsupported input format {extension!r} for {path}. Use .csv, .json or .parquet.')
+
+
+def build_simulator(job: dict, log_prefix: str):
+    """Creates the simulator of a job, writing its logs to files starting with log_prefix."""
+    job = dict(job)
+    simulator = job.pop('simulator', 'basic')
+    name = job.pop('name')
+    seed = job.pop('seed', None)
+    workload = job.pop('workload', None)
+    kwargs = {}
+    # 1. inputs, either generated or read from files
+    if workload is not None:
+        from PSSimPy.utils import WorkloadGenerator
+        generator = WorkloadGenerator(seed=seed, **workload)
+        kwargs.update(banks=generator.banks(), accounts=generator.accounts(), num_days=generator.num_days, open_time=generator.open_time, close_time=generator.close_time)
+        # BasicSim loads the generated days as it reaches them
+        kwargs['transactions'] = generator.iter_days() if simulator == 'basic' else generator.transactions()
+        # the generated inputs replace any input files, e.g. from the defaults
+        for key in INPUT_KEYS:
+            job.pop(key, None)
+    elif seed is not None and simulator != 'abm':
+        raise ValueError(f'Job {name!r}: seed only applies to ABM simulations and generated workloads.')
+    for key in INPUT_KEYS:
+        if key in job:
+            kwargs[key] = read_table(job.pop(key))
+    # 2. components and strategies
+    for key, package in COMPONENT_PACKAGES.items():
+        if key in job:
+            kwargs[key] = component_factory(job.pop(key), package)
+    if 'strategy_mapping' in job:
+        kwargs['strategy_mapping'] = {strategy: resolve_class(class_name, 'PSSimPy.bank') for strategy, class_name in job.pop('strategy_mapping').items()}
+    if 'bank_failure' in job:
+        # days are strings in JSON and TOML keys
+        kwargs['bank_failure'] = {int(day): [tuple(failure) for failure in failures] for day, failures in job.pop('bank_failure').items()}
+    if 'txn_amount_range' in job:
+        kwargs['txn_amount_range'] = tuple(job.pop('txn_amount_range'))
+    if simulator == 'abm':
+        kwargs['seed'] = seed
+    # 3. any other setting is a simulator argument
+    kwargs.update(job)
+    simulator_class = getattr(importlib.import_module('PSSimPy.simulator'), SIMULATORS[simulator])
+    return simulator_class(log_prefix, **kwargs)
+
+
+def _job_key(job: dict) -> str:
+    return json.dumps(job, sort_keys=True, default=str)
+
+
+def is_done(job: dict, output_dir: str) -> bool:
+    """Whether the job has finished with the same spec in an earlier run."""
+    marker_path = os.path.join(output_dir, job['name'], DONE_MARKER)
+    if not os.path.exists(marker_path):
+        return False
+    with open(marker_path) as f:
+        return _job_key(json.load(f).get('job')) == _job_key(job)
+
+
+def run_job(job: dict, output_dir: str) -> dict:
+    """Runs a job, writing its logs and, once it has finished, its done marker to its own directory under output_dir."""
+    from PSSimPy.utils.transaction_utils import release_transaction_instances
+    job_dir = os.path.join(output_dir, job['name'])
+    # logs are appended to, so those of an interrupted run are removed first
+    shutil.rmtree(job_dir, ignore_errors=True)
+    os.makedirs(job_dir)
+    start = time.perf_counter()
+    sim = build_simulator(job, os.path.join(job_dir, job['name']))
+    try:
+        sim.run()
+    finally:
+        # transactions register themselves on creation, so the job's transactions would keep its accounts and banks alive while later jobs run in this process
+        # only this job's transactions are removed, as the caller may hold other simulations
+        release_transaction_instances(sim.accounts.values())
+    result = {'name': job['name'], 'seconds': time.perf_counter() - start, 'finished': time.strftime('%Y-%m-%dT%H:%M:%S')}
+    with open(os.path.join(job_dir, DONE_MARKER), 'w') as f:
+        json.dump(dict(result, job=job), f, indent=2, default=str)
+    return result
+
+
+def _run_job_safely(job: dict, output_dir: str) -> dict:
+    try:
+        return run_job(job, output_dir)
+    except Exception as error:
+        # the full traceback is kept next to the job's logs
+        job_dir = os.path.join(output_dir, job['name'])
+        if os.path.isdir(job_dir):
+            with open(os.path.join(job_dir, ERROR_FILE), 'w') as f:
+                f.write(traceback.format_exc())
+        return {'name': job['name'], 'error': f'{type(error).__name__}: {error}'}
+
+
+def run_jobs(jobs: List[dict], output_dir: str, workers: int = 1, force: bool = False, report: Callable[[str], None] = None) -> Dict[str, List[str]]:
+    """
+    Runs the jobs across worker processes, or in this process if workers is 1, and returns the names of the jobs that were 'done', 'skipped' and 'failed'.
+    Jobs that finished in an earlier run are skipped unless force is set. A failed job is reported and does not stop the others.
+    """
+    if report is None:
+        report = lambda message: print(message, file=sys.stderr, flush=True)
+    outcomes = {'done': [], 'skipped': [], 'failed': []}
+    pending_jobs = []
+    for job in jobs:
+        if not force and is_done(job, output_dir):
+            outcomes['skipped'].append(job['name'])
+        else:
+            pending_jobs.append(job)
+    if outcomes['skipped']:
+        report(f"Skipping {len(outcomes['skipped'])} finished job(s)")
+
+    def record(count: int, result: dict) -> None:
+        if 'error' in result:
+            outcomes['failed'].append(result['name'])
+            report(f"[{count}/{len(pending_jobs)}] {result['name']} failed: {result['error']}")
+        else:
+            outcomes['done'].append(result['name'])
+            report(f"[{count}/{len(pending_jobs)}] {result['name']} done in {result['seconds']:.1f}s")
+
+    if workers <= 1:
+        for count, job in enumerate(pending_jobs, 1):
+            record(count, _run_job_safely(job, output_dir))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_run_job_safely, job, output_dir) for job in pending_jobs]
+            for count, future in enumerate(as_completed(futures), 1):
+                record(count, future.result())
+    return outcomes
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog='pssimpy', description='Runs the simulation jobs of a JSON, TOML or YAML run spec.')
+    parser.add_argument('spec', help='path of the run spec')
+    parser.add_argument('--workers', type=int, default=None, help='number of worker processes, overriding the spec (default: 1)')
+    parser.add_argument('--output-dir', default=None, help="directory of the job outputs, overriding the spec's output_dir")
+    parser.add_argument('--only', nargs='+', default=None, metavar='NAME', help='only run the jobs with these names')
+    parser.add_argument('--force', action='store_true', help='rerun jobs that have already finished')
+    args = parser.parse_args(argv)
+
+    spec_dir = os.path.dirname(os.path.abspath(args.spec))
+    try:
+        spec = load_spec(args.spec)
+        jobs = expand_jobs(spec, spec_dir)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+    if args.only is not None:
+        jobs = [job for job in jobs if job['name'] in args.only]
+    output_dir = args.output_dir or os.path.join(spec_dir, spec.get('output_dir', 'output'))
+    workers = args.workers or spec.get('workers', 1)
+
+    start = time.perf_counter()
+    outcomes = run_jobs(jobs, output_dir, workers, args.force)
+    print(f"{len(outcomes['done'])} done, {len(outcomes['skipped'])} skipped, {len(outcomes['failed'])} failed in {time.perf_counter() - start:.1f}s. Outputs are in {output_dir}")
+    return 1 if outcomes['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,4 +1,8 @@
-from PSSimPy.constraint_handler.abstract_constraint_handler import *
-from PSSimPy.constraint_handler.max_size_constraint_handler import *
-from PSSimPy.constraint_handler.pass_through_handler import *
-from PSSimPy.constraint_handler.min_balance_constraint_handler import *
\ No newline at end of file
+from PSSimPy._lazy import attach
+
+__getattr__, __dir__, __all__ = attach(__name__, {
+    'abstract_constraint_handler': ['AbstractConstraintHandler'],
+    'max_size_constraint_handler': ['MaxSizeConstraintHandler'],
+    'pass_through_handler': ['PassThroughHandler'],
+    'min_balance_constraint_handler': ['MinBalanceConstraintHandler']
+})
\ No newline at end of file
@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
+from typing import Iterable, Dict, List
 from PSSimPy.transaction import Transaction
+from PSSimPy.utils.constants import TRANSACTION_STATUS_CODES
 
 class AbstractConstraintHandler(ABC):
 
@@ -11,6 +13,20 @@ class AbstractConstraintHandler(ABC):
         """Should return a list of passed transactions to be sent for further processing."""
         pass
 
+    def process_batch(self, transactions: Iterable[Transaction]) -> Dict[str, List[Transaction]]:
+        """
+        Processes a batch of transactions, returning the transactions that passed and the transactions that were failed by the handler.
+        Passed transactions are also added to the list of passed transactions.
+        By default, each transaction is sent through process_transaction. Subclasses can override this with a batch implementation.
+        """
+        num_passed_before = len(self.passed_transactions)
+        failed_transactions = []
+        for transaction in transactions:
+            self.process_transaction(transaction)
+            if transaction.status_code == TRANSACTION_STATUS_CODES['Failed']:
+                failed_transactions.append(transaction)
+        return {'Passed': self.passed_transactions[num_passed_before:], 'Failed': failed_transactions}
+
     def get_passed_transactions(self):
         """Returns the list of passed transactions."""
         return self.passed_transactions
@@ -1,42 +1,79 @@
+from typing import Iterable, Iterator, Dict, List, Tuple
+
 from PSSimPy.constraint_handler.abstract_constraint_handler import AbstractConstraintHandler
 from PSSimPy.transaction import Transaction
+from PSSimPy.utils.constants import TRANSACTION_STATUS_CODES
 
 class MaxSizeConstraintHandler(AbstractConstraintHandler):
-    """Splits a transaction if it exceeds max size"""
+    """
+    Splits a transaction if it exceeds max size.
+    A transaction that would have to be split into more than max_num_splits pieces is failed instead.
+    """
 
-    def __init__(self, max_txn_size: float):
+    def __init__(self, max_txn_size: float, max_num_splits: int = 100000):
         super().__init__()
+        if max_txn_size <= 0:
+            raise ValueError('max_txn_size must be greater than 0.')
         self.max_txn_size = max_txn_size
+        self.max_num_splits = max_num_splits
 
     # implement abstract function
     def process_transaction(self, transaction: Transaction):
         """Process a transaction, splitting it if it exceeds max size and ensuring all resulting transactions pass."""
-        kwargs = (transaction.kwargs if hasattr(transaction, 'kwargs') else {})
-
         # Check if transaction size exceeds max size
         if transaction.amount > self.max_txn_size:
-            # Split the transaction
-            txn1 = Transaction(
-                sender_account=transaction.sender_account,
-                recipient_account=transaction.recipient_account,
-                amount=self.max_txn_size,
-                priority=transaction.priority,
-                **kwargs
-            )
-            txn2 = Transaction(
-                sender_account=transaction.sender_account,
-                recipient_account=transaction.recipient_account,
-                amount=transaction.amount - self.max_txn_size,
-                priority=transaction.priority,
-                **kwargs
-            )
+            num_full_pieces, remainder = self.get_split_amounts(transaction.amount)
+            num_pieces = num_full_pieces + (1 if remainder > 0 else 0)
+            if self.max_num_splits is not None and num_pieces > self.max_num_splits:
+                transaction.update_transaction_status('Failed')
+                return
 
             # Update original transaction to update status
             transaction.update_transaction_status('Modified')
 
-            # Recursively process the split transactions
-            self.process_transaction(txn1)
-            self.process_transaction(txn2)
+            # Split the transaction in one pass
+            self.passed_transactions.extend(self.split_transaction(transaction))
         else:
             # If transaction does not exceed max size, consider it passed
-            self.passed_transactions.append(transaction)
\ No newline at end of file
+            self.passed_transactions.append(transaction)
+
+    def process_batch(self, transactions: Iterable[Transaction]) -> Dict[str, List[Transaction]]:
+        num_passed_before = len(self.passed_transactions)
+        failed_transactions = []
+        max_txn_size = self.max_txn_size
+        for transaction in transactions:
+            if transaction.amount > max_txn_size:
+                self.process_transaction(transaction)
+                if transaction.status_code == TRANSACTION_STATUS_CODES['Failed']:
+                    failed_transactions.append(transaction)
+            else:
+                self.passed_transactions.append(transaction)
+        return {'Passed': self.passed_transactions[num_passed_before:], 'Failed': failed_transactions}
+
+    def get_split_amounts(self, amount: float) -> Tuple[int, float]:
+        """Returns the number of max size pieces and the remaining amount that an amount is split into."""
+        num_full_pieces, remainder = divmod(amount, self.max_txn_size)
+        return int(num_full_pieces), remainder
+
+    def split_transaction(self, transaction: Transaction) -> Iterator[Transaction]:
+        """
+        Lazily creates the pieces of a transaction: max size pieces followed by the remainder, if any.
+        Each piece refers to the original transaction through its parent_transaction attribute.
+        """
+        kwargs = (transaction.kwargs if hasattr(transaction, 'kwargs') else {})
+        num_full_pieces, remainder = self.get_split_amounts(transaction.amount)
+        for _ in range(num_full_pieces):
+            yield self._create_piece(transaction, self.max_txn_size, kwargs)
+        if remainder > 0:
+            yield self._create_piece(transaction, remainder, kwargs)
+
+    @staticmethod
+    def _create_piece(transaction: Transaction, amount: float, kwargs: dict) -> Transaction:
+        return Transaction(
+            sender_account=transaction.sender_account,
+            recipient_account=transaction.recipient_account,
+            amount=amount,
+            priority=transaction.priority,
+            parent_transaction=transaction,
+            **kwargs
+        )
\ No newline at end of file
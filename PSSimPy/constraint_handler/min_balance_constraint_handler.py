@@ -1,3 +1,5 @@
+from typing import Iterable, Dict, List
+
 from PSSimPy.constraint_handler.abstract_constraint_handler import AbstractConstraintHandler
 from PSSimPy.transaction import Transaction
 from PSSimPy.utils.account_utils import min_balance_maintained
@@ -17,4 +19,19 @@ class MinBalanceConstraintHandler(AbstractConstraintHandler):
         if min_balance_maintained(transaction.sender_account, transaction.amount, self.min_balance):
             self.passed_transactions.append(transaction)
         else:
-            transaction.update_transaction_status('Failed')
\ No newline at end of file
+            transaction.update_transaction_status('Failed')
+
+    def process_batch(self, transactions: Iterable[Transaction]) -> Dict[str, List[Transaction]]:
+        # balances do not change while transactions pass through the handler, so every transaction is checked against the same balances
+        passed_transactions = []
+        failed_transactions = []
+        min_balance = self.min_balance
+        for transaction in transactions:
+            if transaction.sender_account.balance - transaction.amount >= min_balance:
+                passed_transactions.append(transaction)
+            else:
+                failed_transactions.append(transaction)
+        for transaction in failed_transactions:
+            transaction.update_transaction_status('Failed')
+        self.passed_transactions.extend(passed_transactions)
+        return {'Passed': passed_transactions, 'Failed': failed_transactions}
\ No newline at end of file
@@ -1,3 +1,5 @@
+from typing import Iterable, Dict, List
+
 from PSSimPy.constraint_handler.abstract_constraint_handler import AbstractConstraintHandler
 from PSSimPy.transaction import Transaction
 
@@ -9,4 +11,9 @@ class PassThroughHandler(AbstractConstraintHandler):
 
     # implement abstract function
     def process_transaction(self, transaction: Transaction):        
-        self.passed_transactions.append(transaction)
\ No newline at end of file
+        self.passed_transactions.append(transaction)
+
+    def process_batch(self, transactions: Iterable[Transaction]) -> Dict[str, List[Transaction]]:
+        passed_transactions = list(transactions)
+        self.passed_transactions.extend(passed_transactions)
+        return {'Passed': passed_transactions, 'Failed': []}
\ No newline at end of file
@@ -1,3 +1,7 @@
-from PSSimPy.credit_facilities.abstract_credit_facility import *
-from PSSimPy.credit_facilities.simple_priced import *
-from PSSimPy.credit_facilities.simple_collateralized import *
\ No newline at end of file
+from PSSimPy._lazy import attach
+
+__getattr__, __dir__, __all__ = attach(__name__, {
+    'abstract_credit_facility': ['AbstractCreditFacility'],
+    'simple_priced': ['SimplePriced'],
+    'simple_collateralized': ['SimpleCollateralized']
+})
\ No newline at end of file
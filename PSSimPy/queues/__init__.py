@@ -1,4 +1,10 @@
-from PSSimPy.queues.abstract_queue import *
-from PSSimPy.queues.direct_queue import *
-from PSSimPy.queues.fifo_queue import *
-from PSSimPy.queues.priority_queue import *
\ No newline at end of file
+from PSSimPy._lazy import attach
+
+__getattr__, __dir__, __all__ = attach(__name__, {
+    'abstract_queue': ['QueueItem', 'AbstractQueue'],
+    'direct_queue': ['DirectQueue'],
+    'fifo_queue': ['FIFOQueue'],
+    'priority_queue': ['PriorityQueue'],
+    'liquidity_saving_queue': ['LiquiditySavingQueue'],
+    'bilateral_offset_queue': ['BilateralOffsetQueue']
+})
\ No newline at end of file
@@ -1,13 +1,32 @@
-from typing import Tuple, List, Set
+from typing import Tuple, List, Set, Dict, Iterable, NamedTuple, Callable
 from PSSimPy.transaction import Transaction
 from abc import ABC, abstractmethod
 from sortedcontainers import SortedList
 
+
+class QueueItem(NamedTuple):
+    """Entry stored in the queue. Behaves like a (transaction, period) tuple."""
+    transaction: Transaction
+    period: int
+
+
 class AbstractQueue(ABC):
 
-    def __init__(self):
-        self.period_counter = 0 # to track when 
+    def __init__(self, track_sender_stats: bool = False, track_priority_stats: bool = False):
+        self.period_counter = 0 # to track when
         self.queue = SortedList(key=self.sorting_logic)
+        # running statistics, kept up to date on every enqueue and dequeue
+        self.num_txns = 0
+        self.txn_amount_total = 0
+        self.track_sender_stats = track_sender_stats
+        self.track_priority_stats = track_priority_stats
+        self.sender_stats = {} # sender account id -> [number of transactions, transaction amount]
+        self.priority_stats = {} # priority -> [number of transactions, transaction amount]
+        self._enqueued_priorities = {} # priority of each queued transaction at the time it was enqueued
+        # time-weighted statistics, accumulated as the simulation runs
+        self.elapsed_time = 0
+        self.time_weighted_num_txns = 0
+        self.time_weighted_txn_amount = 0
 
     def next_period(self):
         self.period_counter += 1
@@ -33,30 +52,127 @@ class AbstractQueue(ABC):
         If the transaction passes the checks, it should return true.
         """
         pass
-    
+
     def enqueue(self, transaction: Transaction) -> None:
-        self.queue.add((transaction, self.period_counter))
+        self.queue.add(QueueItem(transaction, self.period_counter))
+        self._track_enqueue(transaction)
 
     def bulk_enqueue(self, transactions: Set[Transaction]) -> None:
-        for transaction in transactions:
-            self.enqueue(transaction)
-    
+        new_items = [QueueItem(transaction, self.period_counter) for transaction in transactions]
+        if len(new_items) * 4 >= len(self.queue):
+            # cheaper to re-sort everything at once than to insert items one by one
+            # existing items are placed first so that they stay ahead of new items with the same sort key
+            all_items = list(self.queue)
+            all_items.extend(new_items)
+            self._rebuild(all_items)
+        else:
+            for item in new_items:
+                self.queue.add(item)
+        for transaction, _ in new_items:
+            self._track_enqueue(transaction)
+
     def dequeue(self, queue_item: Tuple[Transaction, int]) -> Transaction:
         self.queue.remove(queue_item)
+        self._track_dequeue(queue_item[0])
 
     def begin_dequeueing(self) -> List[Transaction]:
         items_to_dequeue = []
+        items_remaining = []
         for item in self.queue:
             if self.dequeue_criteria(item):
                 items_to_dequeue.append(item)
-        for item in items_to_dequeue:
-            self.dequeue(item)
-        return [transaction for transaction, _ in items_to_dequeue]
-    
+            else:
+                items_remaining.append(item)
+        return self._complete_dequeueing(items_to_dequeue, items_remaining)
+
+    def dequeue_all(self) -> List[Transaction]:
+        """Empties the queue, returning all queued transactions in queue order."""
+        transactions_dequeued = [transaction for transaction, _ in self.queue]
+        self.queue.clear()
+        for transaction in transactions_dequeued:
+            self._track_dequeue(transaction)
+        return transactions_dequeued
+
+    def remove_transactions(self, criteria: Callable[[Transaction], bool]) -> List[Transaction]:
+        """Removes and returns the queued transactions that meet the given criteria, regardless of the dequeue criteria."""
+        items_to_remove = []
+        items_remaining = []
+        for item in self.queue:
+            if criteria(item.transaction):
+                items_to_remove.append(item)
+            else:
+                items_remaining.append(item)
+        return self._complete_dequeueing(items_to_remove, items_remaining)
+
     def get_num_txns(self) -> int:
         return len(self.queue)
 
     def get_txn_amount_total(self) -> float:
-        total_amount = sum([transaction.amount for transaction, _ in self.queue])
-        return total_amount
+        return self.txn_amount_total
 
+    def get_sender_stats(self) -> Dict[str, Tuple[int, float]]:
+        """Number and total amount of queued transactions per sender account. Only populated if track_sender_stats is set."""
+        return {sender: (count, amount) for sender, (count, amount) in self.sender_stats.items()}
+
+    def get_priority_stats(self) -> Dict[int, Tuple[int, float]]:
+        """Number and total amount of queued transactions per priority. Only populated if track_priority_stats is set."""
+        return {priority: (count, amount) for priority, (count, amount) in self.priority_stats.items()}
+
+    def accumulate_time_weighted_stats(self, duration: float) -> None:
+        """Weights the current queue depth and value by the duration (in minutes) that the queue stays in its current state."""
+        self.elapsed_time += duration
+        self.time_weighted_num_txns += self.num_txns * duration
+        self.time_weighted_txn_amount += self.txn_amount_total * duration
+
+    def get_time_weighted_stats(self) -> Dict[str, float]:
+        """Average queue depth and value over the time accumulated so far."""
+        if self.elapsed_time == 0:
+            return {'elapsed_time': 0, 'avg_num_txns': 0.0, 'avg_txn_amount': 0.0}
+        return {
+            'elapsed_time': self.elapsed_time,
+            'avg_num_txns': self.time_weighted_num_txns / self.elapsed_time,
+            'avg_txn_amount': self.time_weighted_txn_amount / self.elapsed_time
+        }
+
+    def _complete_dequeueing(self, items_to_dequeue: List[QueueItem], items_remaining: List[QueueItem]) -> List[Transaction]:
+        """Removes the dequeued items, given the items that remain in queue order, and returns the dequeued transactions."""
+        # rebuild the queue from the remaining items in a single pass instead of removing dequeued items one by one
+        if items_to_dequeue:
+            self._rebuild(items_remaining)
+        transactions_dequeued = [transaction for transaction, _ in items_to_dequeue]
+        for transaction in transactions_dequeued:
+            self._track_dequeue(transaction)
+        return transactions_dequeued
+
+    def _rebuild(self, items: Iterable[QueueItem]) -> None:
+        """Replaces the contents of the queue. Items already in queue order are loaded in linear time."""
+        self.queue.clear()
+        self.queue.update(items)
+
+    def _track_enqueue(self, transaction: Transaction) -> None:
+        self.num_txns += 1
+        self.txn_amount_total += transaction.amount
+        if self.track_sender_stats:
+            self._add_to_breakdown(self.sender_stats, transaction.sender_account.id, 1, transaction.amount)
+        if self.track_priority_stats:
+            self._enqueued_priorities[transaction] = transaction.priority
+            self._add_to_breakdown(self.priority_stats, transaction.priority, 1, transaction.amount)
+
+    def _track_dequeue(self, transaction: Transaction) -> None:
+        self.num_txns -= 1
+        # avoid floating point drift once the queue is empty
+        self.txn_amount_total = self.txn_amount_total - transaction.amount if self.num_txns > 0 else 0
+        if self.track_sender_stats:
+            self._add_to_breakdown(self.sender_stats, transaction.sender_account.id, -1, -transaction.amount)
+        if self.track_priority_stats:
+            # transactions are tracked under the priority they entered the queue with, even if it changed since
+            priority = self._enqueued_priorities.pop(transaction, transaction.priority)
+            self._add_to_breakdown(self.priority_stats, priority, -1, -transaction.amount)
+
+    @staticmethod
+    def _add_to_breakdown(breakdown: dict, key, count: int, amount: float) -> None:
+        stats = breakdown.setdefault(key, [0, 0])
+        stats[0] += count
+        stats[1] += amount
+        if stats[0] <= 0:
+            del breakdown[key]
@@ -0,0 +1,85 @@
+from typing import Tuple, List
+
+from PSSimPy.queues.abstract_queue import AbstractQueue
+from PSSimPy.transaction import Transaction
+from PSSimPy.utils import min_balance_maintained
+
+class BilateralOffsetQueue(AbstractQueue):
+    """
+    This queue dequeues transactions that came in earlier first and offsets opposing transactions between the same pair of accounts.
+    Queued transactions are indexed by (sender, recipient) account pair.
+    After the transactions that can settle on their own are dequeued, the earliest remaining transactions in each direction of a pair are matched,
+    and both are dequeued together if the account paying the net amount can cover it.
+    Only pairs with transactions queued in both directions are visited.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.pair_index = {} # (sender account id, recipient account id) -> queued transactions in the order they were enqueued
+        self.offset_candidates = {} # account id pairs with transactions queued in both directions, in the order they became candidates
+
+    @staticmethod
+    def sorting_logic(queue_item: Tuple[Transaction, int]) -> int:
+        _, period = queue_item
+        return period
+
+    @staticmethod
+    def dequeue_criteria(queue_item: Tuple[Transaction, int]) -> bool:
+        transaction, _ = queue_item
+        return min_balance_maintained(transaction.sender_account, transaction.amount, min_balance=0)
+
+    def begin_dequeueing(self) -> List[Transaction]:
+        items = list(self.queue)
+        # 1. transactions that can settle on their own
+        dequeued = {transaction for transaction, period in items if self.dequeue_criteria((transaction, period))}
+        balance_changes = {}
+        for transaction in dequeued:
+            self._apply_to_balances(balance_changes, transaction.sender_account, transaction.recipient_account, transaction.amount)
+
+        # 2. offset opposing transactions of the remaining pairs
+        offset = set()
+        for account1_id, account2_id in self.offset_candidates:
+            outgoing = (txn for txn in self.pair_index[(account1_id, account2_id)] if txn not in dequeued)
+            incoming = (txn for txn in self.pair_index[(account2_id, account1_id)] if txn not in dequeued)
+            for txn_out, txn_in in zip(outgoing, incoming):
+                net_amount = txn_out.amount - txn_in.amount
+                payer, payee = (txn_out.sender_account, txn_in.sender_account) if net_amount >= 0 else (txn_in.sender_account, txn_out.sender_account)
+                if payer.balance + balance_changes.get(payer, 0) < abs(net_amount):
+                    break
+                self._apply_to_balances(balance_changes, payer, payee, abs(net_amount))
+                offset.add(txn_out)
+                offset.add(txn_in)
+        dequeued.update(offset)
+
+        # 3. remove dequeued transactions while keeping the queue order
+        items_to_dequeue = []
+        items_remaining = []
+        for item in items:
+            if item[0] in dequeued:
+                items_to_dequeue.append(item)
+            else:
+                items_remaining.append(item)
+        return self._complete_dequeueing(items_to_dequeue, items_remaining)
+
+    def _track_enqueue(self, transaction: Transaction) -> None:
+        super()._track_enqueue(transaction)
+        pair = (transaction.sender_account.id, transaction.recipient_account.id)
+        self.pair_index.setdefault(pair, {})[transaction] = None
+        if (pair[1], pair[0]) in self.pair_index:
+            self.offset_candidates[tuple(sorted(pair, key=str))] = None
+
+    def _track_dequeue(self, transaction: Transaction) -> None:
+        super()._track_dequeue(transaction)
+        pair = (transaction.sender_account.id, transaction.recipient_account.id)
+        pair_transactions = self.pair_index.get(pair)
+        if pair_transactions is None:
+            return
+        pair_transactions.pop(transaction, None)
+        if not pair_transactions:
+            del self.pair_index[pair]
+            self.offset_candidates.pop(tuple(sorted(pair, key=str)), None)
+
+    @staticmethod
+    def _apply_to_balances(balance_changes: dict, payer, payee, amount: float) -> None:
+        balance_changes[payer] = balance_changes.get(payer, 0) - amount
+        balance_changes[payee] = balance_changes.get(payee, 0) + amount
@@ -5,8 +5,8 @@ from PSSimPy.transaction import Transaction
 
 class DirectQueue(AbstractQueue):
     
-    def __init__(self):
-        super().__init__()
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
 
     @staticmethod
     def sorting_logic(queue_item: Tuple[Transaction, int]) -> int:
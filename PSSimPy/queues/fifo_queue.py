@@ -7,8 +7,8 @@ from PSSimPy.utils import min_balance_maintained
 class FIFOQueue(AbstractQueue):
     """This queue attempts to dequeue transactions that came in earlier first."""
     
-    def __init__(self):
-        super().__init__()
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
 
     @staticmethod
     def sorting_logic(queue_item: Tuple[Transaction, int]) -> int:
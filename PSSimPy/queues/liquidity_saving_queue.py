@@ -0,0 +1,72 @@
+from collections import defaultdict
+from typing import Tuple, List
+
+from PSSimPy.queues.abstract_queue import AbstractQueue
+from PSSimPy.transaction import Transaction
+from PSSimPy.utils import min_balance_maintained
+
+class LiquiditySavingQueue(AbstractQueue):
+    """
+    This queue resolves gridlock by settling queued transactions multilaterally.
+    At each dequeue, the net position of every account over all queued transactions is computed.
+    While an account cannot cover its net position with its balance, its transactions are removed from the batch starting from the back of the queue.
+    The transactions left in the batch have net positions that all fit available balances and are dequeued together.
+    """
+
+    def __init__(self, min_balance: float = 0, **kwargs):
+        super().__init__(**kwargs)
+        self.min_balance = min_balance
+
+    @staticmethod
+    def sorting_logic(queue_item: Tuple[Transaction, int]) -> int:
+        _, period = queue_item
+        return period
+
+    def dequeue_criteria(self, queue_item: Tuple[Transaction, int]) -> bool:
+        # whether the transaction could settle on its own, against the same minimum balance as the multilateral check
+        transaction, _ = queue_item
+        return min_balance_maintained(transaction.sender_account, transaction.amount, min_balance=self.min_balance)
+
+    def begin_dequeueing(self) -> List[Transaction]:
+        items = list(self.queue)
+        # 1. liquidity left in each account if every queued transaction were settled
+        net_positions = {}
+        outgoing = defaultdict(list) # index of each account's outgoing transactions, in queue order
+        for index, (transaction, _) in enumerate(items):
+            sender = transaction.sender_account
+            recipient = transaction.recipient_account
+            if sender not in net_positions:
+                net_positions[sender] = sender.balance - self.min_balance
+            if recipient not in net_positions:
+                net_positions[recipient] = recipient.balance - self.min_balance
+            net_positions[sender] -= transaction.amount
+            net_positions[recipient] += transaction.amount
+            outgoing[sender].append(index)
+
+        # 2. drop transactions of accounts that cannot cover their net position, latest in the queue first
+        # each transaction is dropped at most once, so this takes linear time in the size of the queue
+        excluded = [False] * len(items)
+        accounts_to_check = [account for account, position in net_positions.items() if position < 0]
+        while accounts_to_check:
+            account = accounts_to_check.pop()
+            account_outgoing = outgoing[account]
+            while net_positions[account] < 0 and account_outgoing:
+                index = account_outgoing.pop()
+                excluded[index] = True
+                transaction = items[index][0]
+                recipient = transaction.recipient_account
+                net_positions[account] += transaction.amount
+                net_positions[recipient] -= transaction.amount
+                # the recipient loses an incoming payment and may no longer cover its own position
+                if net_positions[recipient] < 0:
+                    accounts_to_check.append(recipient)
+
+        # 3. the remaining transactions are settled together
+        items_to_dequeue = []
+        items_remaining = []
+        for item, is_excluded in zip(items, excluded):
+            if is_excluded:
+                items_remaining.append(item)
+            else:
+                items_to_dequeue.append(item)
+        return self._complete_dequeueing(items_to_dequeue, items_remaining)
@@ -7,8 +7,8 @@ from PSSimPy.utils import min_balance_maintained
 class PriorityQueue(AbstractQueue):
     """This queue dequeues transactions based on the order of their priorities."""
     
-    def __init__(self):
-        super().__init__()
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
 
     @staticmethod
     def sorting_logic(queue_item: Tuple[Transaction, int]) -> int:
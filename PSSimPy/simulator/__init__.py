@@ -1,2 +1,9 @@
-from PSSimPy.simulator.basic_sim import *
-from PSSimPy.simulator.abm_sim import *
\ No newline at end of file
+from PSSimPy._lazy import attach
+
+__getattr__, __dir__, __all__ = attach(__name__, {
+    'engine': ['NativeEnvironment', 'ENGINES', 'validate_engine', 'create_environment'],
+    'scenario_engine': ['ScenarioResults', 'LockstepScenarioEngine'],
+    'basic_sim': ['BasicSim'],
+    'abm_sim': ['ABMSim'],
+    'abm_env': ['ABMEnv', 'VectorABMEnv']
+})
\ No newline at end of file
@@ -0,0 +1,249 @@
+import copy
+import random
+import multiprocessing
+from functools import partial
+from typing import Any, Callable, Dict, List, Sequence, Tuple, Union
+import numpy as np
+
+from PSSimPy.bank import StrategyView
+from PSSimPy.queues import AbstractQueue
+from PSSimPy.transaction_fee import AbstractTransactionFee
+from PSSimPy.constraint_handler import AbstractConstraintHandler
+from PSSimPy.credit_facilities import AbstractCreditFacility
+from PSSimPy.simulator.abm_sim import ABMSim
+from PSSimPy.simulator.engine import create_environment
+from PSSimPy.utils.time_utils import minutes_between
+from PSSimPy.utils.transaction_utils import release_transaction_instances
+from PSSimPy.utils.logger import Logger
+
+COMPONENT_BASE_CLASSES = {
+    'constraint_handler': AbstractConstraintHandler,
+    'queue': AbstractQueue,
+    'credit_facility': AbstractCreditFacility,
+    'transaction_fee_handler': AbstractTransactionFee
+}
+
+
+class ABMEnv:
+    """
+    Environment that runs an ABMSim one processing window at a time, following the reset/step convention of reinforcement learning environments.
+    The keyword arguments are those of ABMSim. Component instances, such as the queue, are copied on every reset so that each episode starts from the same initial state.
+    Other arguments, such as instrumentation, memory_profiler and strategy_executor, are passed to the simulator of every episode as they are.
+    The logs are started afresh on every reset, and the transactions of an episode are removed from Transaction._instances when the next one starts or the environment is closed.
+    If include_views is False, info does not include the views of outstanding transactions, which saves building and transferring them.
+    """
+
+    def __init__(self, reward_fn: Callable[[ABMSim], Any] = None, include_views: bool = True, **sim_kwargs):
+        self.reward_fn = reward_fn
+        self.include_views = include_views
+        self.sim_kwargs = sim_kwargs
+        self.sim = None
+        self.day = None
+        self.current_time = None
+        self._txns_failed_from_bank_failure = None
+        self._day_length = None
+        self._seed_rng = None
+        self._views, self._view_transactions = {}, {}
+
+    def reset(self, seed: int = None) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+        """
+        Starts a new simulation and returns the observation and info of its first time window.
+        Resets without a seed draw the simulation's seed from the last seed given, so a sequence of episodes is reproducible.
+        """
+        if seed is not None:
+            self._seed_rng = random.Random(seed)
+        elif self._seed_rng is not None:
+            seed = self._seed_rng.randrange(2**31)
+        self.close()
+        self.sim = ABMSim(seed=seed, **self._fresh_sim_kwargs())
+        # every episode writes to the same log files, which only hold the current episode
+        for logger in vars(self.sim).values():
+            if isinstance(logger, Logger):
+                logger.clear()
+        self.sim._executor = self.sim._create_executor()
+        self.sim.env = create_environment(self.sim.engine)
+        self._day_length = minutes_between(self.sim.open_time, self.sim.close_time)
+        self.day = 1
+        self._start_window()
+        return self._observe(), self._info()
+
+    def step(self, actions: Dict[str, Union[np.ndarray, Sequence[int]]] = None) -> Tuple[Dict[str, np.ndarray], Any, bool, bool, Dict[str, Any]]:
+        """
+        Settles the current time window and moves to the next one.
+        actions maps bank names to a boolean mask or an index array over the bank's outstanding transactions, in the order of the views in info['views'].
+        Banks without an action use their own strategy.
+        Returns the observation, reward, whether the simulation has ended, whether it was truncated (always False) and info.
+        """
+        if self.sim is None or self.day > self.sim.num_days:
+            raise RuntimeError('reset must be called before step, and again once the simulation has ended.')
+        actions = actions or {}
+        # 1. transactions chosen by the actions
+        transactions_to_settle = set()
+        for bank_name, selection in actions.items():
+            view = self._get_view(bank_name)
+            transactions_to_settle.update(self._view_transactions[bank_name][position] for position in view.selected_positions(selection))
+        # 2. transactions chosen by the strategies of the other banks
+        other_banks = {bank_name: bank for bank_name, bank in self.sim.banks.items() if bank_name not in actions}
+        if other_banks:
+            transactions_to_settle.update(self.sim._evaluate_strategies(self.day, self.current_time, other_banks))
+        self.sim._complete_window(self.day, self.current_time, transactions_to_settle, self._txns_failed_from_bank_failure)
+        reward = self.reward_fn(self.sim) if self.reward_fn is not None else 0.0
+        # 3. move to the next time window, performing end of day processing when the day is over
+        self.sim.env.run(until=self.sim.env.now + self.sim.processing_window)
+        if self.sim.env.now >= self._day_length:
+            self.sim._perform_eod(self.day)
+            self.day += 1
+            if self.day > self.sim.num_days:
+                self._views, self._view_transactions = {}, {}
+                return self._observe(), reward, True, False, self._info()
+            self.sim.env = create_environment(self.sim.engine)
+        self._start_window()
+        return self._observe(), reward, False, False, self._info()
+
+    def close(self) -> None:
+        if self.sim is not None:
+            self.sim._shutdown_executor()
+            # the registry of transactions would otherwise keep every episode alive
+            release_transaction_instances(self.sim.accounts.values())
+        self.sim = None
+
+    def _fresh_sim_kwargs(self) -> Dict[str, Any]:
+        # components hold the state of a simulation, so each episode gets a copy of the component instances given, which are left untouched
+        # ABMSim creates its own default components, and components given as classes or factories, while other arguments such as instrumentation are shared
+        sim_kwargs = dict(self.sim_kwargs)
+        for name, base_class in COMPONENT_BASE_CLASSES.items():
+            if isinstance(sim_kwargs.get(name), base_class):
+                sim_kwargs[name] = partial(copy.deepcopy, sim_kwargs[name])
+        return sim_kwargs
+
+    def _start_window(self) -> None:
+        self.current_time, self._txns_failed_from_bank_failure = self.sim._prepare_window(self.day)
+        # views of each bank's outstanding transactions, ordered by arrival
+        bank_outstanding_transactions = self.sim._group_outstanding_by_bank()
+        self._view_transactions = {bank_name: sorted(transactions, key=lambda transaction: (transaction.arrival_day, transaction.arrival_time or ''))
+                                   for bank_name, transactions in bank_outstanding_transactions.items()}
+        self._views = {}
+        if self.include_views:
+            for bank_name in self._view_transactions:
+                self._get_view(bank_name)
+
+    def _get_view(self, bank_name: str) -> StrategyView:
+        if bank_name not in self._views:
+            self._views[bank_name] = StrategyView(self._view_transactions[bank_name], self.sim.bank_accounts[bank_name], self.day, self.current_time, self.sim.credit_facility)
+        return self._views[bank_name]
+
+    def _observe(self) -> Dict[str, np.ndarray]:
+        accounts = list(self.sim.accounts.values())
+        bank_names = list(self.sim.banks)
+        outstanding_num_txns = np.zeros(len(bank_names), dtype=int)
+        outstanding_amount = np.zeros(len(bank_names), dtype=float)
+        bank_index = {bank_name: index for index, bank_name in enumerate(bank_names)}
+        for transaction in self.sim.outstanding_transactions:
+            index = bank_index[transaction.sender_account.owner.name]
+            outstanding_num_txns[index] += 1
+            outstanding_amount[index] += transaction.amount
+        return {
+            'balances': np.fromiter((account.balance for account in accounts), dtype=float, count=len(accounts)),
+            'credit': np.fromiter((self.sim.credit_facility.get_total_credit(account) for account in accounts), dtype=float, count=len(accounts)),
+            'queue_num_txns': np.array(self.sim.queue.get_num_txns(), dtype=int),
+            'queue_txn_amount': np.array(self.sim.queue.get_txn_amount_total(), dtype=float),
+            'outstanding_num_txns': outstanding_num_txns,
+            'outstanding_amount': outstanding_amount
+        }
+
+    def _info(self) -> Dict[str, Any]:
+        info = {'day': self.day, 'time': self.current_time}
+        if self.include_views:
+            info['views'] = dict(self._views)
+        return info
+
+
+class VectorABMEnv:
+    """
+    Steps several independent ABMEnv environments in lockstep, either in this process ('sync') or each in its own worker process ('process').
+    Observations are stacked along a leading axis, so all environments should have the same banks and accounts.
+    Environments that end are reset automatically, with their final observation and info stored under 'final_observation' and 'final_info' in their info.
+    """
+
+    def __init__(self, env_kwargs: List[Dict[str, Any]], mode: str = 'sync'):
+        if mode not in ('sync', 'process'):
+            raise ValueError("mode must be 'sync' or 'process'.")
+        self.num_envs = len(env_kwargs)
+        self.mode = mode
+        if mode == 'sync':
+            self.envs = [ABMEnv(**kwargs) for kwargs in env_kwargs]
+        else:
+            self.pipes, self.processes = [], []
+            for kwargs in env_kwargs:
+                parent_conn, child_conn = multiprocessing.Pipe()
+                process = multiprocessing.Process(target=_worker, args=(child_conn, kwargs), daemon=True)
+                process.start()
+                child_conn.close()
+                self.pipes.append(parent_conn)
+                self.processes.append(process)
+        self._seeds = [None] * self.num_envs
+
+    def reset(self, seed: int = None) -> Tuple[Dict[str, np.ndarray], List[Dict[str, Any]]]:
+        """Resets all environments. Environment i is seeded with seed + i if a seed is given."""
+        self._seeds = [seed + i if seed is not None else None for i in range(self.num_envs)]
+        results = self._call_all('reset', [(env_seed,) for env_seed in self._seeds])
+        observations, infos = zip(*results)
+        return self._stack(observations), list(infos)
+
+    def step(self, actions: Sequence[Dict[str, Any]] = None) -> Tuple[Dict[str, np.ndarray], np.ndarray, np.ndarray, np.ndarray, List[Dict[str, Any]]]:
+        """Steps all environments, with actions[i] passed to environment i."""
+        actions = actions if actions is not None else [None] * self.num_envs
+        results = self._call_all('step_autoreset', [(env_actions,) for env_actions in actions])
+        observations, rewards, terminated, truncated, infos = zip(*results)
+        return self._stack(observations), np.array(rewards), np.array(terminated), np.array(truncated), list(infos)
+
+    def close(self) -> None:
+        if self.mode == 'sync':
+            for env in self.envs:
+                env.close()
+            return
+        for pipe in self.pipes:
+            pipe.send(('close', ()))
+        for process in self.processes:
+            process.join()
+
+    def _call_all(self, command: str, args: List[tuple]) -> list:
+        if self.mode == 'sync':
+            return [_run_command(env, command, env_args) for env, env_args in zip(self.envs, args)]
+        # send all commands before waiting so that the workers run concurrently
+        for pipe, env_args in zip(self.pipes, args):
+            pipe.send((command, env_args))
+        results = [pipe.recv() for pipe in self.pipes]
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        return results
+
+    @staticmethod
+    def _stack(observations: Sequence[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+        return {key: np.stack([observation[key] for observation in observations]) for key in observations[0]}
+
+
+def _run_command(env: ABMEnv, command: str, args: tuple):
+    if command == 'reset':
+        return env.reset(*args)
+    # step, resetting the environment once it ends
+    observation, reward, terminated, truncated, info = env.step(*args)
+    if terminated or truncated:
+        final_observation, final_info = observation, info
+        observation, info = env.reset()
+        info = dict(info, final_observation=final_observation, final_info=final_info)
+    return observation, reward, terminated, truncated, info
+
+
+def _worker(conn, env_kwargs: Dict[str, Any]) -> None:
+    env = ABMEnv(**env_kwargs)
+    while True:
+        command, args = conn.recv()
+        if command == 'close':
+            conn.close()
+            return
+        try:
+            conn.send(_run_command(env, command, args))
+        except Exception as error:
+            conn.send(error)
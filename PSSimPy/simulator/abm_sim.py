@@ -1,10 +1,13 @@
-from random import random, randint
-from typing import Union, Dict, List, Tuple, Set
-import simpy
-import pandas as pd
+from __future__ import annotations
+import os
+import asyncio
+import inspect
+import random
+from typing import TYPE_CHECKING, Union, Dict, List, Tuple, Set, FrozenSet, Callable, Iterable
 from collections import defaultdict
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
 
-from PSSimPy.bank import Bank
+from PSSimPy.bank import Bank, ArrayStrategyBank, StrategyView
 from PSSimPy.account import Account
 from PSSimPy.queues import AbstractQueue, DirectQueue
 from PSSimPy.transaction import Transaction
@@ -17,9 +20,17 @@ from PSSimPy.utils.constants import TRANSACTION_STATUS_CODES, TRANSACTION_LOGGER
     QUEUE_STATS_HEADER, TRANSACTION_ARRIVAL_HEADER, ACCOUNT_BALANCE_HEADER, CREDIT_FACILITY_LOGGER_HEADER
 from PSSimPy.utils.time_utils import is_valid_24h_time, add_minutes_to_time, is_time_later, minutes_between
 from PSSimPy.utils.file_utils import logger_file_name
-from PSSimPy.utils.data_utils import initialize_classes_from_dict
-from PSSimPy.utils.account_utils import load_account_with_transactions
-from PSSimPy.utils.transaction_utils import settle_transaction
+from PSSimPy.utils.data_utils import initialize_classes_from_dict, instance_attributes, compile_bank_failure_schedule, to_column_dict
+from PSSimPy.utils.account_utils import load_accounts_with_transactions, validate_account_history
+from PSSimPy.utils.component_utils import create_component, claim_components
+from PSSimPy.utils.snapshot_utils import dumps_snapshot, loads_snapshot
+from PSSimPy.utils.transaction_utils import settle_transaction, calculate_transaction_fees
+from PSSimPy.utils.instrumentation import Instrumentation, phase
+from PSSimPy.utils.memory_profiler import MemoryProfiler
+from PSSimPy.simulator.engine import create_environment, validate_engine
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 class ABMSim:
     """Simulator that supports Agent-Based Modeling"""
@@ -34,20 +45,30 @@ class ABMSim:
                  close_time: str = '17:00',
                  processing_window: int = 15, # the number of minutes between iteration
                  num_days: int = 1,
-                 constraint_handler: AbstractConstraintHandler = PassThroughHandler(),
-                 queue: AbstractQueue = DirectQueue(),
-                 credit_facility: AbstractCreditFacility = SimplePriced(),
-                 transaction_fee_handler: AbstractTransactionFee = FixedTransactionFee(),
+                 constraint_handler: Union[AbstractConstraintHandler, Callable[[], AbstractConstraintHandler]] = None, # PassThroughHandler if not provided, each component can also be a class or factory creating it
+                 queue: Union[AbstractQueue, Callable[[], AbstractQueue]] = None, # DirectQueue if not provided
+                 credit_facility: Union[AbstractCreditFacility, Callable[[], AbstractCreditFacility]] = None, # SimplePriced if not provided
+                 transaction_fee_handler: Union[AbstractTransactionFee, Callable[[], AbstractTransactionFee]] = None, # FixedTransactionFee if not provided
                  transaction_fee_rate: Union[float, Dict[str, float]] = 0.0,
                  bank_failure: Dict[int, List[Tuple[str, str]]] = None, # key is day and value is a tuple of time and bank name
                  eod_clear_queue: bool = False,
                  eod_force_settlement: bool = False,
                  txn_arrival_prob: float = None, # only required if transactions are not provided
                  txn_amount_range: Tuple[int, int] = None, # only required if transactions are not provide
-                 txn_priority_range: Tuple[int, int] = (1, 1)
+                 txn_priority_range: Tuple[int, int] = (1, 1),
+                 strategy_executor: Union[str, Executor] = None, # 'thread', 'process' or an Executor to evaluate bank strategies concurrently
+                 max_workers: int = None,
+                 seed: int = None, # seeds the generation of transactions for this simulation only, otherwise the global random state is used
+                 instrumentation: Instrumentation = None, # times the phases of the simulation if provided
+                 memory_profiler: MemoryProfiler = None, # samples the memory used by the simulation at each day boundary if provided
+                 account_history: Union[str, int] = 'all', # transactions kept on accounts: 'all', 'day', 'counters' or the number of windows to retain
+                 release_finished_transactions: bool = False, # drop settled and failed transactions from the simulator's state once they are logged
+                 engine: Union[str, Callable] = 'simpy' # 'simpy', 'native' or a callable creating environments like simpy.Environment
                  ): 
         if not (is_valid_24h_time(open_time) and is_valid_24h_time(close_time)):
             raise ValueError('Invalid time input. Both open_time and close_time must be valid 24h format times.')
+        validate_account_history(account_history)
+        validate_engine(engine)
         if transactions is None and (txn_arrival_prob is None or txn_amount_range is None):
             raise ValueError('txn_arrival_prob and txn_amount_range must be specified if no transactions are provided.')
         if transactions is None and not (txn_arrival_prob > 0.0 and txn_arrival_prob <= 1):
@@ -56,22 +77,38 @@ class ABMSim:
             raise ValueError('The first value of txn_amount_range cannot be greater than the second value.')
         if transactions is None and (txn_priority_range[0] > txn_priority_range[1]):
             raise ValueError('The first value fo txn_priority_range cannot be greater than the second value.')
+        if isinstance(strategy_executor, str) and strategy_executor not in ('thread', 'process'):
+            raise ValueError("strategy_executor must be 'thread', 'process' or an Executor instance.")
         self.name = name
         self.open_time = open_time
         self.close_time = close_time
         self.processing_window = processing_window
         self.num_days = num_days
-        self.constraint_handler = constraint_handler
-        self.queue = queue
-        self.credit_facility = credit_facility
-        self.transaction_fee_handler = transaction_fee_handler
+        # each simulator creates its own components, as they hold the state of the simulation
+        self.constraint_handler = create_component(constraint_handler, AbstractConstraintHandler, PassThroughHandler)
+        self.queue = create_component(queue, AbstractQueue, DirectQueue)
+        self.credit_facility = create_component(credit_facility, AbstractCreditFacility, SimplePriced)
+        self.transaction_fee_handler = create_component(transaction_fee_handler, AbstractTransactionFee, FixedTransactionFee)
         self.transaction_fee_rate = transaction_fee_rate
         self.bank_failure = bank_failure
+        self.bank_failure_schedule = compile_bank_failure_schedule(bank_failure, open_time, processing_window)
+        self.failed_banks = set()
+        self.exposure_by_bank = defaultdict(set) # bank name -> pending transactions involving the bank, only tracked if bank failures are scheduled
         self.eod_clear_queue = eod_clear_queue
         self.eod_force_settlement = eod_force_settlement
         self.txn_arrival_prob = txn_arrival_prob
         self.txn_amount_range = txn_amount_range
         self.txn_priority_range = txn_priority_range
+        self.strategy_executor = strategy_executor
+        self.max_workers = max_workers
+        self._executor = None
+        self.rng = random.Random(seed) if seed is not None else random
+        self.instrumentation = instrumentation
+        self.memory_profiler = memory_profiler
+        self.account_history = account_history
+        self.release_finished_transactions = release_finished_transactions
+        self.engine = engine
+        self._num_arrivals = 0 # transactions arriving in the current time window, reported to the instrumentation
         if transactions is None:
             self.generate_txns_flag = 1
         else:
@@ -79,19 +116,19 @@ class ABMSim:
         self.outstanding_transactions = set()
         
         # load data
-        if isinstance(banks, pd.DataFrame):
-            banks = banks.to_dict(orient='list')
-        if isinstance(accounts, pd.DataFrame):
-            accounts = accounts.to_dict(orient='list')
-        if isinstance(transactions, pd.DataFrame):
-            transactions = transactions.to_dict(orient='list')
+        banks = to_column_dict(banks)
+        accounts = to_column_dict(accounts)
+        transactions = to_column_dict(transactions)
         self._load_initial_data(banks, accounts, transactions, strategy_mapping)
         self.account_map = self._account_mappings()
+        self._account_pairs = sorted(self.account_map) # fixed order so that seeded simulations generate the same transactions
+        self.bank_accounts = {bank_name: [account for account in self.accounts.values() if account.owner.name == bank_name] for bank_name in self.banks}
 
         # set up simulator
         # self.env = simpy.Environment()
         # self.env.process(self._simulate_day())
-        self.system = System(constraint_handler, queue)
+        # queued transactions are indexed as they are enqueued, after the constraint handler may have split them
+        self.system = System(self.constraint_handler, self.queue, instrumentation, enqueue_callback=self._track_exposure if self.bank_failure_schedule else None)
 
         # loggers
         if self.generate_txns_flag == 1:
@@ -101,6 +138,8 @@ class ABMSim:
         self.queue_stats_logger = Logger(logger_file_name(name, 'queue_stats'), QUEUE_STATS_HEADER)
         self.account_balance_logger = Logger(logger_file_name(name, 'account_balance'), ACCOUNT_BALANCE_HEADER)
         self.credit_facility_logger = Logger(logger_file_name(name, 'credit_facility'), CREDIT_FACILITY_LOGGER_HEADER)
+        claim_components(self, {'constraint_handler': self.constraint_handler, 'queue': self.queue, 'credit_facility': self.credit_facility,
+                                'transaction_fee_handler': self.transaction_fee_handler})
 
     def load_transactions(self, transactions_dict: List[Dict]):
         """Overwrites existing transactions if they already exist"""
@@ -113,10 +152,14 @@ class ABMSim:
 
     def _perform_eod(self, day: int = 1):
             processed_transactions = []
-            transaction_fees = []
+            force_settled_transactions = []
+            cancelled_transactions = []
+            if self.instrumentation is not None:
+                self.instrumentation.begin_window(day, self.close_time)
 
             # 1. credit facility repayment
-            self.credit_facility.collect_all_repayment(day, self.accounts.values())
+            with phase(self.instrumentation, 'eod_repayment'):
+                self.credit_facility.collect_all_repayment(day, self.accounts.values())
             
             if self.eod_clear_queue or self.eod_force_settlement: 
                 # 2. force the system to process all outstanding transactions if eod_force_settlement flag is set
@@ -127,105 +170,196 @@ class ABMSim:
                     processed_transactions.extend(eod_processed_transactions['Failed'])
 
                 # 3. remove all transactions from queue if appropriate
-                for txn, priority in list(self.queue.queue):
-                    self.queue.dequeue((txn, priority))
-
-                    # 4a. forced unsettled transactions regardless constraints if appropriate            
-                    if self.eod_force_settlement:
-                        settle_transaction(txn)
-                        txn.settle_day = day
-                        txn.settle_time = self.close_time
-                        processed_transactions.append(txn)
-                        transaction_fees.append((txn.sender_account.id,
-                                                 day,
-                                                 self.close_time,
-                                                 self.transaction_fee_handler.calculate_fee(txn.amount,
-                                                                                            self.close_time,
-                                                                                            self.transaction_fee_rate)))
-                    # 4b. dequeued transactions cancelled
-                    else:
-                        txn.update_transaction_status('Failed')
+                with phase(self.instrumentation, 'eod_queue'):
+                    for txn in self.queue.dequeue_all():
+
+                        # 4a. forced unsettled transactions regardless constraints if appropriate            
+                        if self.eod_force_settlement:
+                            settle_transaction(txn)
+                            txn.settle_day = day
+                            txn.settle_time = self.close_time
+                            processed_transactions.append(txn)
+                            force_settled_transactions.append(txn)
+                        # 4b. dequeued transactions cancelled
+                        else:
+                            txn.update_transaction_status('Failed')
+                            cancelled_transactions.append(txn)
 
             # 5. any remaining outstanding transactions will need to be updated to be picked up the next day
             for txn in self.outstanding_transactions:
                 txn.time = self.open_time
                 txn.day += 1
 
+            # -> calculate transaction fees of force settled transactions
+            with phase(self.instrumentation, 'fees'):
+                transaction_fees = calculate_transaction_fees(self.transaction_fee_handler, force_settled_transactions, day, self.close_time, self.transaction_fee_rate)
+                self.transaction_fee_handler.end_of_day(day)
+            with phase(self.instrumentation, 'bank_failure'):
+                self._prune_exposure()
+            # -> drop the day's account history if only the current day is retained
+            if self.account_history == 'day':
+                for account in self.accounts.values():
+                    account.clear_history()
+
             # 6. print logs
-            # -> transaction log
-            self.transaction_logger.write(self._extract_logging_details(processed_transactions, day, self.close_time)) 
-            # -> queueu statistics log
-            self.queue_stats_logger.write([(day, self.close_time, self.queue.get_num_txns(), self.queue.get_txn_amount_total())])
-            # -> transaction fees log
-            self.transaction_fee_logger.write(transaction_fees)
-            # -> account balance statistics log
-            self.account_balance_logger.write([(day, self.close_time, account.id, account.balance) for account in self.accounts.values()])
-            # -> credit facility usage log
-            self.credit_facility_logger.write([
-                (day, self.close_time, account.id, account.posted_collateral, self.credit_facility.get_total_credit(account), self.credit_facility.get_total_fee(account))
-                for account in self.accounts.values()
-            ])
+            self._write_logs(day, self.close_time, processed_transactions, transaction_fees)
+            self._release_transactions(processed_transactions + cancelled_transactions)
+            if self.instrumentation is not None:
+                self.instrumentation.end_window(num_processed=len(processed_transactions), queue_num_txns=self.queue.get_num_txns(),
+                                                queue_txn_amount=self.queue.get_txn_amount_total(), num_outstanding=len(self.outstanding_transactions))
 
     def run(self):
         """Main function that executes the simulation"""
-        # repeate simulation for each day
-        for i in range(self.num_days):
-            self.env = simpy.Environment()
-            self.env.process(self._simulate_day(i+1))
-            self.env.run(until=minutes_between(self.open_time, self.close_time))
-            # EOD handling
-            self._perform_eod(i+1)
-        # logging
-        # Transactions arrival - only if transactions are generated by the simulation
-        if self.generate_txns_flag == 1:
-            arrived_transactions_to_log = [(day, time, transaction.sender_account.id, transaction.recipient_account.id, transaction.amount, transaction.priority) 
-                                           for transaction, day, time in self.transactions]
-            self.transaction_arrival_logger.write(arrived_transactions_to_log)
+        self._executor = self._create_executor()
+        if self.memory_profiler is not None:
+            self.memory_profiler.start()
+        try:
+            self._sample_memory(0)
+            # repeate simulation for each day
+            for i in range(self.num_days):
+                self.env = create_environment(self.engine)
+                self.env.process(self._simulate_day(i+1))
+                self.env.run(until=minutes_between(self.open_time, self.close_time))
+                # EOD handling
+                self._perform_eod(i+1)
+                self._sample_memory(i+1)
+        finally:
+            self._shutdown_executor()
+            if self.memory_profiler is not None:
+                self.memory_profiler.stop()
+        if self.instrumentation is not None:
+            self.instrumentation.end_run()
+
+    async def run_async(self, strategy_timeout: float = None, strategy_fallback: Union[str, Callable] = 'hold'):
+        """
+        Executes the simulation, awaiting the strategies of banks whose strategy function is a coroutine function concurrently in each time window.
+        strategy_timeout is the number of seconds to wait for each asynchronous strategy. If it runs out, the decision is taken from strategy_fallback:
+        'hold' settles none of the bank's transactions, 'release' settles all of them, and a callable is called with the bank followed by the strategy arguments.
+        """
+        if isinstance(strategy_fallback, str) and strategy_fallback not in ('hold', 'release'):
+            raise ValueError("strategy_fallback must be 'hold', 'release' or a callable.")
+        self._executor = self._create_executor()
+        if self.memory_profiler is not None:
+            self.memory_profiler.start()
+        try:
+            self._sample_memory(0)
+            # repeate simulation for each day
+            for i in range(self.num_days):
+                self.env = create_environment(self.engine)
+                day_length = minutes_between(self.open_time, self.close_time)
+                while self.env.now < day_length:
+                    current_time_str, txns_failed_from_bank_failure = self._prepare_window(i+1)
+                    with phase(self.instrumentation, 'strategy'):
+                        transactions_to_settle = await self._evaluate_strategies_async(i+1, current_time_str, strategy_timeout, strategy_fallback)
+                    self._complete_window(i+1, current_time_str, transactions_to_settle, txns_failed_from_bank_failure)
+                    # end of period
+                    self.env.run(until=self.env.now + self.processing_window)
+                # EOD handling
+                self._perform_eod(i+1)
+                self._sample_memory(i+1)
+        finally:
+            self._shutdown_executor()
+            if self.memory_profiler is not None:
+                self.memory_profiler.stop()
+        if self.instrumentation is not None:
+            self.instrumentation.end_run()
+
+    def _shutdown_executor(self):
+        # only shut down executors created by the simulator
+        if self._executor is not None and self._executor is not self.strategy_executor:
+            self._executor.shutdown()
+        self._executor = None
+
+    def _release_transactions(self, transactions: Iterable[Transaction]) -> None:
+        """Drops finished transactions from the simulator's state once they are logged, if release_finished_transactions is set."""
+        if not self.release_finished_transactions:
+            return
+        for transaction in transactions:
+            # a split transaction is not processed itself, so it is released with the first of its pieces to finish
+            while transaction is not None:
+                self.transactions.discard((transaction, transaction.arrival_day, transaction.arrival_time))
+                Transaction._instances.discard(transaction)
+                transaction = getattr(transaction, 'parent_transaction', None)
 
     def _simulate_day(self, day: int=1):
         while True:
-            current_time_str = add_minutes_to_time(self.open_time, self.env.now)
-            period_end_time_str = add_minutes_to_time(current_time_str, self.processing_window - 1)
-            # check if any bank fails in this time period
-            self._update_failed_banks(day, current_time_str, period_end_time_str)
-
-            # settlement logic
-            if self.generate_txns_flag == 1:
-                # 1a. for each account pair (exclude pairs belonging to the same bank), generate a transaction with probability p and add to outstanding transactions
-                # generated transactions will have arrival time set as current_time_str and a random size between lower and upper bounds
+            current_time_str, txns_failed_from_bank_failure = self._prepare_window(day)
+            # proceed with identifying transactions to settle
+            with phase(self.instrumentation, 'strategy'):
+                transactions_to_settle = self._evaluate_strategies(day, current_time_str)
+            self._complete_window(day, current_time_str, transactions_to_settle, txns_failed_from_bank_failure)
+
+            # end of period
+            yield self.env.timeout(self.processing_window)
+
+    def _prepare_window(self, day: int) -> Tuple[str, Set[Transaction]]:
+        """Brings in the transactions arriving in the current time window and handles bank failures. Returns the window's time and the transactions failed due to bank failures."""
+        current_time_str = add_minutes_to_time(self.open_time, self.env.now)
+        period_end_time_str = add_minutes_to_time(current_time_str, self.processing_window - 1)
+        if self.instrumentation is not None:
+            self.instrumentation.begin_window(day, current_time_str)
+        # check if any bank fails in this time period
+        newly_failed_banks = self._update_failed_banks(day)
+
+        # settlement logic
+        if self.generate_txns_flag == 1:
+            # 1a. for each account pair (exclude pairs belonging to the same bank), generate a transaction with probability p and add to outstanding transactions
+            # generated transactions will have arrival time set as current_time_str and a random size between lower and upper bounds
+            with phase(self.instrumentation, 'generate'):
                 curr_period_transactions = set()
-                for account1_id, account2_id in self.account_map:
+                for account1_id, account2_id in self._account_pairs:
                     if self._txn_arrival(): # account1 -> account2
-                        rand_txn_amt = randint(self.txn_amount_range[0], self.txn_amount_range[1])
-                        rand_priority = randint(self.txn_priority_range[0], self.txn_priority_range[1])
+                        rand_txn_amt = self.rng.randint(self.txn_amount_range[0], self.txn_amount_range[1])
+                        rand_priority = self.rng.randint(self.txn_priority_range[0], self.txn_priority_range[1])
                         new_txn = Transaction(self.accounts[account1_id], self.accounts[account2_id], rand_txn_amt, rand_priority, day=day, time=current_time_str)
                         curr_period_transactions.add(new_txn)
                     if self._txn_arrival(): # account2 -> account1
-                        rand_txn_amt = randint(self.txn_amount_range[0], self.txn_amount_range[1])
-                        rand_priority = randint(self.txn_priority_range[0], self.txn_priority_range[1])
+                        rand_txn_amt = self.rng.randint(self.txn_amount_range[0], self.txn_amount_range[1])
+                        rand_priority = self.rng.randint(self.txn_priority_range[0], self.txn_priority_range[1])
                         new_txn = Transaction(self.accounts[account2_id], self.accounts[account1_id], rand_txn_amt, rand_priority, day=day, time=current_time_str)
                         curr_period_transactions.add(new_txn)
                 # add created transactions to class transactions set
                 self.transactions.update({(transaction, day, current_time_str) for transaction in curr_period_transactions})
-            else:
-                # 1b. get the transactions pertaining to this time window
+            # -> transactions arrival log, written as the transactions arrive
+            with phase(self.instrumentation, 'log_transaction_arrivals'):
+                self.transaction_arrival_logger.write([(day, current_time_str, transaction.sender_account.id, transaction.recipient_account.id, transaction.amount, transaction.priority)
+                                                       for transaction in curr_period_transactions])
+        else:
+            # 1b. get the transactions pertaining to this time window
+            with phase(self.instrumentation, 'gather'):
                 curr_period_transactions = self._gather_transactions_in_window(day, current_time_str, period_end_time_str, self.transactions)
-            for account in self.accounts.values():
-                load_account_with_transactions(account, curr_period_transactions)
-            self.outstanding_transactions.update(curr_period_transactions)
-            # 2. go through outstanding transaction list and identify transactions to settle in current period based on bank strategy
-            # remove outstanding transactions where a failed bank is involved
-            txns_failed_from_bank_failure = {transaction for transaction in self.outstanding_transactions if transaction.involves_failed_bank()}
+        with phase(self.instrumentation, 'load_accounts'):
+            load_accounts_with_transactions(self.accounts.values(), curr_period_transactions, self.account_history)
+        self._num_arrivals = len(curr_period_transactions)
+        # 2. go through outstanding transaction list and identify transactions to settle in current period based on bank strategy
+        with phase(self.instrumentation, 'bank_failure'):
+            # remove new transactions where a failed bank is involved
+            txns_failed_from_bank_failure = set()
+            if self.failed_banks:
+                txns_failed_from_bank_failure = {transaction for transaction in curr_period_transactions if transaction.involves_failed_bank()}
+                curr_period_transactions = curr_period_transactions - txns_failed_from_bank_failure
+            # remove outstanding and queued transactions of banks that failed in this time window
+            if newly_failed_banks:
+                exposed_transactions = set()
+                for bank_name in newly_failed_banks:
+                    exposed_transactions.update(self.exposure_by_bank.pop(bank_name, set()))
+                exposed_outstanding_transactions = exposed_transactions & self.outstanding_transactions
+                self.outstanding_transactions -= exposed_outstanding_transactions
+                txns_failed_from_bank_failure.update(exposed_outstanding_transactions)
+                if exposed_transactions - exposed_outstanding_transactions:
+                    txns_failed_from_bank_failure.update(self.queue.remove_transactions(exposed_transactions.__contains__))
             for transaction in txns_failed_from_bank_failure:
                 transaction.status_code = TRANSACTION_STATUS_CODES['Failed']
-            self.outstanding_transactions -= txns_failed_from_bank_failure
-            # proceed with identifying transactions to settle
-            transactions_to_settle = set()
-            for bank_name, bank in self.banks.items():
-                bank_oustanding_transactions = {transaction for transaction in self.outstanding_transactions if transaction.sender_account.owner.name == bank_name}
-                transactions_to_settle.update(bank.strategy(bank_oustanding_transactions, self.outstanding_transactions, self.name, day, current_time_str, self.queue))
-            self.outstanding_transactions -= transactions_to_settle # remove transactions being settled from outstanding transactions set
-            # 3. obtain necessary intraday credit
+            # outstanding transactions are indexed on arrival, before the banks send them to the system
+            self._track_exposure(curr_period_transactions)
+        self.outstanding_transactions.update(curr_period_transactions)
+        return current_time_str, txns_failed_from_bank_failure
+
+    def _complete_window(self, day: int, current_time_str: str, transactions_to_settle: Set[Transaction], txns_failed_from_bank_failure: Set[Transaction]) -> None:
+        """Settles the transactions chosen by the banks in the current time window and writes the logs."""
+        self.outstanding_transactions -= transactions_to_settle # remove transactions being settled from outstanding transactions set
+        # 3. obtain necessary intraday credit
+        with phase(self.instrumentation, 'credit'):
             liquidity_requirement = defaultdict(float)
             
             for txn in transactions_to_settle:
@@ -235,35 +369,48 @@ class ABMSim:
                 credit_amount = requirement - acc.balance
                 if credit_amount > 0:
                     self.credit_facility.lend_credit(acc, credit_amount)
-            # 4. identified transactions to be settled sent into System to be processed
-            processed_transactions = self.system.process(transactions_to_settle, day, current_time_str)
-            # update the settlement time information for processed transactions
-            for processed_transaction in processed_transactions['Processed']:
-                processed_transaction.settle_day = day
-                processed_transaction.settle_time = current_time_str
-            transactions_to_log = {transaction for transactions in processed_transactions.values() for transaction in transactions} # merge the settled and failed transactions
-            transactions_to_log.update(txns_failed_from_bank_failure) # add the failed transactions due to bank failure
-
-            # extract transaction fees from successful transactions
-            transaction_fees = [(transaction.sender_account.id, day, current_time_str, self.transaction_fee_handler.calculate_fee(transaction.amount, current_time_str, self.transaction_fee_rate)) 
-                                for transaction in processed_transactions['Processed']]
-            # 5. processed transactions printed to log
-            self.transaction_logger.write(self._extract_logging_details(transactions_to_log, day, current_time_str)) # settled and failed transactions
-            # aggregate queue statistics
-            self.queue_stats_logger.write([(day, current_time_str, self.queue.get_num_txns(), self.queue.get_txn_amount_total())])
-            # account balance statistics
-            self.account_balance_logger.write([(day, current_time_str, account.id, account.balance) for account in self.accounts.values()])
-            # transaction fees
+        # 4. identified transactions to be settled sent into System to be processed
+        processed_transactions = self.system.process(transactions_to_settle, day, current_time_str)
+        # update the settlement time information for processed transactions
+        for processed_transaction in processed_transactions['Processed']:
+            processed_transaction.settle_day = day
+            processed_transaction.settle_time = current_time_str
+        transactions_to_log = {transaction for transactions in processed_transactions.values() for transaction in transactions} # merge the settled and failed transactions
+        transactions_to_log.update(txns_failed_from_bank_failure) # add the failed transactions due to bank failure
+
+        # extract transaction fees from successful transactions
+        with phase(self.instrumentation, 'fees'):
+            transaction_fees = calculate_transaction_fees(self.transaction_fee_handler, processed_transactions['Processed'], day, current_time_str, self.transaction_fee_rate)
+        # 5. processed transactions printed to log
+        self._write_logs(day, current_time_str, transactions_to_log, transaction_fees)
+        self._release_transactions(transactions_to_log)
+        self.queue.accumulate_time_weighted_stats(self.processing_window)
+        if self.instrumentation is not None:
+            self.instrumentation.end_window(num_arrivals=self._num_arrivals, num_processed=len(processed_transactions['Processed']),
+                                            num_failed=len(processed_transactions['Failed']) + len(txns_failed_from_bank_failure),
+                                            queue_num_txns=self.queue.get_num_txns(), queue_txn_amount=self.queue.get_txn_amount_total(),
+                                            num_outstanding=len(self.outstanding_transactions))
+
+    def _write_logs(self, day: int, time: str, transactions_to_log: Set[Transaction], transaction_fees: List[Tuple]) -> None:
+        # settled and failed transactions
+        with phase(self.instrumentation, 'log_transactions'):
+            self.transaction_logger.write(self._extract_logging_details(transactions_to_log, day, time))
+        # aggregate queue statistics
+        with phase(self.instrumentation, 'log_queue_stats'):
+            self.queue_stats_logger.write([(day, time, self.queue.get_num_txns(), self.queue.get_txn_amount_total())])
+        # account balance statistics
+        with phase(self.instrumentation, 'log_account_balance'):
+            self.account_balance_logger.write([(day, time, account.id, account.balance) for account in self.accounts.values()])
+        # transaction fees
+        with phase(self.instrumentation, 'log_transaction_fees'):
             self.transaction_fee_logger.write(transaction_fees)
-            # Intraday credit fees and outstanding credit logger
+        # Intraday credit fees and outstanding credit logger
+        with phase(self.instrumentation, 'log_credit_facility'):
             self.credit_facility_logger.write([
-                (day, current_time_str, account.id, account.posted_collateral, self.credit_facility.get_total_credit(account), self.credit_facility.get_total_fee(account))
+                (day, time, account.id, account.posted_collateral, self.credit_facility.get_total_credit(account), self.credit_facility.get_total_fee(account))
                 for account in self.accounts.values()
             ])
 
-            # end of period
-            yield self.env.timeout(self.processing_window)
-
     # consider switching transactions to a sorted data structure for efficiency
     @staticmethod
     def _gather_transactions_in_window(day: int, begin_time: str, end_time: str, transactions_set: Set[Tuple[Transaction, int, str]]) -> Set[Transaction]:
@@ -300,7 +447,7 @@ class ABMSim:
                 # update bank to use the appropriate class according to their defined strategies
                 bank_strategy = bank.strategy_type
                 if bank_strategy != 'Normal':
-                    bank_attrs = vars(bank)
+                    bank_attrs = instance_attributes(bank)
                     updated_bank = strategy_mapping[bank_strategy](**bank_attrs)
                     self.banks[bank_name] = updated_bank
         # load accounts data
@@ -331,15 +478,181 @@ class ABMSim:
                     bilateral_mappings.add(mapping)
         return bilateral_mappings
     
-    def _update_failed_banks(self, day, begin_time, end_time):
-        if self.bank_failure is not None and day in self.bank_failure:
-            failures_to_check = self.bank_failure[day]
-            for time, bank_name in failures_to_check:
-                if is_time_later(time, begin_time, True) and not(is_time_later(time, end_time, False)):
-                    # update bank status to failed
-                    self.banks[bank_name].is_failed = True
+    def _memory_components(self) -> Dict[str, object]:
+        """Data structures of the simulation whose size is sampled by the memory profiler."""
+        return {
+            'transactions': self.transactions,
+            'outstanding_transactions': self.outstanding_transactions,
+            'account_transactions': [(account._txn_in, account._txn_out, account._history_windows) for account in self.accounts.values()],
+            'queue': self.queue.queue,
+            'credit_facility_history': (self.credit_facility.used_credit, self.credit_facility.history),
+            'exposure_by_bank': self.exposure_by_bank,
+            'transaction_instances': Transaction._instances
+        }
+
+    def _sample_memory(self, day: int) -> None:
+        if self.memory_profiler is not None:
+            self.memory_profiler.sample(day, self._memory_components())
+
+    def _update_failed_banks(self, day: int) -> List[str]:
+        """Marks the banks scheduled to fail in the current processing window as failed and returns their names."""
+        newly_failed_banks = [bank_name for bank_name in self.bank_failure_schedule.get((day, self.env.now), []) if bank_name not in self.failed_banks]
+        for bank_name in newly_failed_banks:
+            self.banks[bank_name].is_failed = True
+            self.failed_banks.add(bank_name)
+        return newly_failed_banks
+
+    def _track_exposure(self, transactions: Iterable[Transaction]) -> None:
+        """Indexes pending transactions by the banks involved so that a bank failure only touches that bank's transactions."""
+        if not self.bank_failure_schedule:
+            return
+        for transaction in transactions:
+            self.exposure_by_bank[transaction.sender_account.owner.name].add(transaction)
+            self.exposure_by_bank[transaction.recipient_account.owner.name].add(transaction)
+
+    def _prune_exposure(self) -> None:
+        """Drops settled, failed and split transactions from the bank exposure index, keeping those still open."""
+        for bank_name in list(self.exposure_by_bank):
+            pending_transactions = {transaction for transaction in self.exposure_by_bank[bank_name] if transaction.status_code == TRANSACTION_STATUS_CODES['Open']}
+            if pending_transactions:
+                self.exposure_by_bank[bank_name] = pending_transactions
+            else:
+                del self.exposure_by_bank[bank_name]
+
+    def _create_executor(self) -> Executor:
+        if self.strategy_executor is None or isinstance(self.strategy_executor, Executor):
+            return self.strategy_executor
+        if self.strategy_executor == 'thread':
+            return ThreadPoolExecutor(max_workers=self.max_workers)
+        return ProcessPoolExecutor(max_workers=self.max_workers)
+
+    def _evaluate_strategies(self, day: int, current_time: str, banks: Dict[str, Bank] = None) -> Set[Transaction]:
+        """
+        Collects the transactions that each bank chooses to settle in the current time window.
+        If an executor is set, all strategies are evaluated concurrently against a snapshot of the outstanding transactions.
+        The chosen transactions are merged in bank order, so the result is the same as evaluating the strategies one after another.
+        Only the given banks are evaluated if banks is set.
+        """
+        if banks is None:
+            banks = self.banks
+        # 1. group outstanding transactions by the sending bank
+        bank_outstanding_transactions = self._group_outstanding_by_bank()
+        # 2. array strategies receive views of the outstanding transactions, ordered by arrival
+        array_strategy_transactions = {}
+        for bank_name, bank in banks.items():
+            if isinstance(bank, ArrayStrategyBank):
+                array_strategy_transactions[bank_name] = sorted(bank_outstanding_transactions[bank_name], key=lambda transaction: (transaction.arrival_day, transaction.arrival_time or ''))
+        array_strategy_views = {bank_name: StrategyView(transactions, self.bank_accounts[bank_name], day, current_time, self.credit_facility)
+                                for bank_name, transactions in array_strategy_transactions.items()}
+        transactions_to_settle = set()
+        # 3a. evaluate strategies one after another
+        if self._executor is None:
+            for bank_name, bank in banks.items():
+                if bank_name in array_strategy_views:
+                    view = array_strategy_views[bank_name]
+                    selection = bank.array_strategy(view, self.name, day, current_time)
+                    transactions_to_settle.update(array_strategy_transactions[bank_name][position] for position in view.selected_positions(selection))
+                else:
+                    transactions_to_settle.update(self._check_strategy_result(bank, bank.strategy(bank_outstanding_transactions[bank_name], self.outstanding_transactions, self.name, day, current_time, self.queue)))
+            return transactions_to_settle
+        # 3b. evaluate strategies concurrently against a read-only snapshot
+        outstanding_snapshot = frozenset(self.outstanding_transactions)
+        # array strategies only receive the arrays of their views
+        futures = {bank_name: self._executor.submit(banks[bank_name].array_strategy, view, self.name, day, current_time) for bank_name, view in array_strategy_views.items()}
+        other_banks = [bank_name for bank_name in banks if bank_name not in array_strategy_views]
+        if isinstance(self._executor, ProcessPoolExecutor):
+            # the banks, outstanding transactions and queue are pickled once per window as records without account histories
+            # each batch of banks receives its transactions as positions in the outstanding list and returns the chosen positions
+            outstanding_list = list(outstanding_snapshot)
+            outstanding_positions = {transaction: position for position, transaction in enumerate(outstanding_list)}
+            num_batches = min(len(other_banks), self.max_workers or os.cpu_count() or 1)
+            bank_batches = [other_banks[i::num_batches] for i in range(num_batches)]
+            snapshot = dumps_snapshot(({bank_name: banks[bank_name] for bank_name in other_banks}, outstanding_list, self.queue)) if other_banks else None
+            batch_futures = [self._executor.submit(_evaluate_strategies_by_position, snapshot, bank_batch,
+                                                   [[outstanding_positions[transaction] for transaction in bank_outstanding_transactions[bank_name]] for bank_name in bank_batch],
+                                                   self.name, day, current_time)
+                             for bank_batch in bank_batches]
+            chosen_positions = {}
+            for bank_batch, future in zip(bank_batches, batch_futures):
+                chosen_positions.update(zip(bank_batch, future.result()))
+        else:
+            futures.update((bank_name, self._executor.submit(banks[bank_name].strategy, bank_outstanding_transactions[bank_name], outstanding_snapshot, self.name, day, current_time, self.queue))
+                           for bank_name in other_banks)
+        # 4. merge the chosen transactions in bank order
+        for bank_name in banks:
+            if bank_name in array_strategy_views:
+                positions = array_strategy_views[bank_name].selected_positions(futures[bank_name].result())
+                transactions_to_settle.update(array_strategy_transactions[bank_name][position] for position in positions)
+            elif bank_name in futures:
+                transactions_to_settle.update(self._check_strategy_result(banks[bank_name], futures[bank_name].result()))
+            else:
+                transactions_to_settle.update(outstanding_list[position] for position in chosen_positions[bank_name])
+        return transactions_to_settle
+
+    async def _evaluate_strategies_async(self, day: int, current_time: str, strategy_timeout: float, strategy_fallback: Union[str, Callable]) -> Set[Transaction]:
+        """
+        Collects the transactions that each bank chooses to settle in the current time window, awaiting all asynchronous strategies concurrently.
+        Other strategies are evaluated as in _evaluate_strategies while the asynchronous ones are pending.
+        """
+        bank_outstanding_transactions = self._group_outstanding_by_bank()
+        outstanding_snapshot = frozenset(self.outstanding_transactions)
+        async_banks = {bank_name: bank for bank_name, bank in self.banks.items() if inspect.iscoroutinefunction(bank.strategy)}
+        other_banks = {bank_name: bank for bank_name, bank in self.banks.items() if bank_name not in async_banks}
+        # 1. start all asynchronous strategies
+        tasks = [asyncio.ensure_future(self._await_strategy(bank, bank_outstanding_transactions[bank_name], outstanding_snapshot, day, current_time, strategy_timeout, strategy_fallback))
+                 for bank_name, bank in async_banks.items()]
+        await asyncio.sleep(0) # let the asynchronous strategies send their requests before evaluating the other strategies
+        # 2. evaluate the other strategies
+        transactions_to_settle = self._evaluate_strategies(day, current_time, other_banks) if other_banks else set()
+        # 3. merge the results of the asynchronous strategies in bank order
+        for chosen_transactions in await asyncio.gather(*tasks):
+            transactions_to_settle.update(chosen_transactions)
+        return transactions_to_settle
+
+    async def _await_strategy(self, bank: Bank, txns_to_settle: Set[Transaction], all_outstanding_transactions: FrozenSet[Transaction], day: int, current_time: str,
+                              strategy_timeout: float, strategy_fallback: Union[str, Callable]) -> Set[Transaction]:
+        try:
+            return await asyncio.wait_for(bank.strategy(txns_to_settle, all_outstanding_transactions, self.name, day, current_time, self.queue), strategy_timeout)
+        except asyncio.TimeoutError:
+            if strategy_fallback == 'hold':
+                return set()
+            if strategy_fallback == 'release':
+                return txns_to_settle
+            return strategy_fallback(bank, txns_to_settle, all_outstanding_transactions, self.name, day, current_time, self.queue)
+
+    def _group_outstanding_by_bank(self) -> Dict[str, Set[Transaction]]:
+        bank_outstanding_transactions = {bank_name: set() for bank_name in self.banks}
+        for transaction in self.outstanding_transactions:
+            bank_outstanding_transactions[transaction.sender_account.owner.name].add(transaction)
+        return bank_outstanding_transactions
+
+    @staticmethod
+    def _check_strategy_result(bank: Bank, chosen_transactions: Set[Transaction]) -> Set[Transaction]:
+        if asyncio.iscoroutine(chosen_transactions):
+            chosen_transactions.close()
+            raise TypeError(f'The strategy of bank {bank.name} is asynchronous. Use run_async to run the simulation.')
+        return chosen_transactions
 
     def _txn_arrival(self) -> bool:
         """Pseudorandom chance of transaction arrival"""
-        return random() < self.txn_arrival_prob
+        return self.rng.random() < self.txn_arrival_prob
+
 
+def _evaluate_strategies_by_position(snapshot: bytes, bank_names: List[str], bank_positions: List[List[int]], sim_name: str, day: int, current_time: str) -> List[List[int]]:
+    """
+    Evaluates bank strategies in a worker process against a snapshot of the banks, outstanding transactions and queue made by dumps_snapshot.
+    bank_positions holds the positions in the outstanding transactions of each bank's own outstanding transactions.
+    Returns, for each bank, the positions of the chosen transactions in the outstanding transactions.
+    """
+    banks, all_outstanding_transactions, queue = loads_snapshot(snapshot)
+    positions = {id(transaction): position for position, transaction in enumerate(all_outstanding_transactions)}
+    outstanding_snapshot = frozenset(all_outstanding_transactions)
+    chosen_positions = []
+    for bank_name, own_positions in zip(bank_names, bank_positions):
+        txns_to_settle = {all_outstanding_transactions[position] for position in own_positions}
+        chosen_transactions = banks[bank_name].strategy(txns_to_settle, outstanding_snapshot, sim_name, day, current_time, queue)
+        try:
+            chosen_positions.append(sorted(positions[id(transaction)] for transaction in chosen_transactions))
+        except KeyError:
+            raise ValueError(f'The strategy of bank {bank_name} returned a transaction that is not outstanding.')
+    return chosen_positions
@@ -1,6 +1,6 @@
-import simpy
-import pandas as pd
-from typing import Union, Dict, List, Tuple, Set
+from __future__ import annotations
+import numpy as np
+from typing import TYPE_CHECKING, Union, Dict, List, Tuple, Set, Iterable, Callable
 from collections import defaultdict
 
 from PSSimPy import System, Bank, Account, Transaction
@@ -13,9 +13,17 @@ from PSSimPy.utils.constants import TRANSACTION_STATUS_CODES, TRANSACTION_LOGGER
     QUEUE_STATS_HEADER, ACCOUNT_BALANCE_HEADER, CREDIT_FACILITY_LOGGER_HEADER
 from PSSimPy.utils.time_utils import is_valid_24h_time, add_minutes_to_time, is_time_later, minutes_between
 from PSSimPy.utils.file_utils import logger_file_name
-from PSSimPy.utils.data_utils import initialize_classes_from_dict
-from PSSimPy.utils.account_utils import load_account_with_transactions
-from PSSimPy.utils.transaction_utils import settle_transaction
+from PSSimPy.utils.data_utils import initialize_classes_from_dict, compile_bank_failure_schedule, to_column_dict
+from PSSimPy.utils.account_utils import load_accounts_with_transactions, validate_account_history
+from PSSimPy.utils.component_utils import create_component, claim_components
+from PSSimPy.utils.transaction_utils import settle_transaction, calculate_transaction_fees
+from PSSimPy.utils.instrumentation import Instrumentation, phase
+from PSSimPy.utils.memory_profiler import MemoryProfiler
+from PSSimPy.simulator.engine import create_environment, validate_engine
+from PSSimPy.simulator.scenario_engine import LockstepScenarioEngine, ScenarioResults
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class BasicSim:
@@ -25,50 +33,70 @@ class BasicSim:
                  name: str,
                  banks: Union[pd.DataFrame, Dict[str, List]],
                  accounts: Union[pd.DataFrame, Dict[str, List]],
-                 transactions: Union[pd.DataFrame, Dict[str, List]],
+                 transactions: Union[pd.DataFrame, Dict[str, List], Iterable[Union[pd.DataFrame, Dict[str, List]]]], # or chunks of transactions in day order, loaded as their first day begins
                  open_time: str = '08:00',
                  close_time: str = '17:00',
                  processing_window: int = 15,
                  num_days: int = 1,
-                 constraint_handler: AbstractConstraintHandler = PassThroughHandler(),
-                 queue: AbstractQueue = DirectQueue(),
-                 credit_facility: AbstractCreditFacility = SimplePriced(),
-                 transaction_fee_handler: AbstractTransactionFee = FixedTransactionFee(),
+                 constraint_handler: Union[AbstractConstraintHandler, Callable[[], AbstractConstraintHandler]] = None, # PassThroughHandler if not provided, each component can also be a class or factory creating it
+                 queue: Union[AbstractQueue, Callable[[], AbstractQueue]] = None, # DirectQueue if not provided
+                 credit_facility: Union[AbstractCreditFacility, Callable[[], AbstractCreditFacility]] = None, # SimplePriced if not provided
+                 transaction_fee_handler: Union[AbstractTransactionFee, Callable[[], AbstractTransactionFee]] = None, # FixedTransactionFee if not provided
                  transaction_fee_rate: Union[float, Dict[str, float]] = 0.0,
                  bank_failure: Dict[int, List[Tuple[str, str]]] = None, # key is day and value is a tuple of time and bank name
                  eod_clear_queue: bool = False,
-                 eod_force_settlement: bool = False
+                 eod_force_settlement: bool = False,
+                 instrumentation: Instrumentation = None, # times the phases of the simulation if provided
+                 memory_profiler: MemoryProfiler = None, # samples the memory used by the simulation at each day boundary if provided
+                 account_history: Union[str, int] = 'all', # transactions kept on accounts: 'all', 'day', 'counters' or the number of windows to retain
+                 release_finished_transactions: bool = False, # drop settled and failed transactions from the simulator's state once they are logged
+                 engine: Union[str, Callable] = 'simpy' # 'simpy', 'native' or a callable creating environments like simpy.Environment
                  ):
         
         if not (is_valid_24h_time(open_time) and is_valid_24h_time(close_time)):
             raise ValueError('Invalid time input. Both open_time and close_time must be valid 24h format times.')
+        validate_account_history(account_history)
+        validate_engine(engine)
 
         self.name = name
         self.open_time = open_time
         self.close_time = close_time
         self.processing_window = processing_window
         self.num_days = num_days
-        self.constraint_handler = constraint_handler
-        self.queue = queue
-        self.credit_facility = credit_facility
-        self.transaction_fee_handler = transaction_fee_handler
+        # each simulator creates its own components, as they hold the state of the simulation
+        self.constraint_handler = create_component(constraint_handler, AbstractConstraintHandler, PassThroughHandler)
+        self.queue = create_component(queue, AbstractQueue, DirectQueue)
+        self.credit_facility = create_component(credit_facility, AbstractCreditFacility, SimplePriced)
+        self.transaction_fee_handler = create_component(transaction_fee_handler, AbstractTransactionFee, FixedTransactionFee)
         self.transaction_fee_rate = transaction_fee_rate
         self.bank_failure = bank_failure
+        self.bank_failure_schedule = compile_bank_failure_schedule(bank_failure, open_time, processing_window)
+        self.failed_banks = set()
+        self.exposure_by_bank = defaultdict(set) # bank name -> pending transactions involving the bank, only tracked if bank failures are scheduled
         self.eod_clear_queue = eod_clear_queue
         self.eod_force_settlement = eod_force_settlement
+        self.instrumentation = instrumentation
+        self.memory_profiler = memory_profiler
+        self.account_history = account_history
+        self.release_finished_transactions = release_finished_transactions
+        self.engine = engine
         
         # load data
-        if isinstance(banks, pd.DataFrame):
-            banks = banks.to_dict(orient='list')
-        if isinstance(accounts, pd.DataFrame):
-            accounts = accounts.to_dict(orient='list')
-        if isinstance(transactions, pd.DataFrame):
-            transactions = transactions.to_dict(orient='list')
+        banks = to_column_dict(banks)
+        accounts = to_column_dict(accounts)
+        transactions = to_column_dict(transactions)
+        # transactions given in chunks are only loaded as the simulation reaches them
+        self._transaction_chunks = None
+        self._next_transaction_chunk = None
+        if not isinstance(transactions, dict):
+            self._transaction_chunks = iter(transactions)
+            transactions = None
         
         self._load_initial_data(banks, accounts, transactions)
         
         # setup system
-        self.system = System(constraint_handler, queue)
+        # queued transactions are indexed as they are enqueued, after the constraint handler may have split them
+        self.system = System(self.constraint_handler, self.queue, instrumentation, enqueue_callback=self._track_exposure if self.bank_failure_schedule else None)
         
         # setup loggers
         self.transaction_logger = Logger(logger_file_name(name, 'processed_transactions'), TRANSACTION_LOGGER_HEADER)
@@ -76,7 +104,9 @@ class BasicSim:
         self.queue_stats_logger = Logger(logger_file_name(name, 'queue_stats'), QUEUE_STATS_HEADER)
         self.account_balance_logger = Logger(logger_file_name(name, 'account_balance'), ACCOUNT_BALANCE_HEADER)
         self.credit_facility_logger = Logger(logger_file_name(name, 'credit_facility'), CREDIT_FACILITY_LOGGER_HEADER)
-        
+        claim_components(self, {'constraint_handler': self.constraint_handler, 'queue': self.queue, 'credit_facility': self.credit_facility,
+                                'transaction_fee_handler': self.transaction_fee_handler})
+
     def _load_initial_data(self, banks_dict: dict, accounts_dict: dict, transactions_dict: dict) -> None:
         # load banks
         bank_list = initialize_classes_from_dict(Bank, banks_dict)
@@ -89,40 +119,73 @@ class BasicSim:
         self.accounts = {account.id: account for account in account_list}
         
         # load transactions
+        self.transactions = self._create_transactions(transactions_dict) if transactions_dict is not None else set()
+
+    def _create_transactions(self, transactions_dict: dict) -> Set[Tuple[Transaction, int, str]]:
         transactions_revised_dict = transactions_dict.copy()
         transactions_revised_dict['sender_account'] = list(map(lambda x: self.accounts[x], transactions_dict['sender_account']))
         transactions_revised_dict['recipient_account'] = list(map(lambda x: self.accounts[x], transactions_dict['recipient_account']))
         transactions_list = initialize_classes_from_dict(Transaction, transactions_revised_dict)
         transactions_list_with_time = [(transaction, transaction.day, transaction.time) for transaction in transactions_list]
-        self.transactions = set(transactions_list_with_time)
+        return set(transactions_list_with_time)
+
+    def _load_transaction_chunks(self, day: int) -> None:
+        """Loads the transaction chunks whose first day has been reached."""
+        while self._transaction_chunks is not None:
+            if self._next_transaction_chunk is None:
+                chunk = next(self._transaction_chunks, None)
+                if chunk is None:
+                    self._transaction_chunks = None
+                    return
+                self._next_transaction_chunk = to_column_dict(chunk)
+            chunk = self._next_transaction_chunk
+            if len(chunk['sender_account']) > 0 and min(chunk.get('day', [1])) > day:
+                return
+            self.transactions.update(self._create_transactions(chunk))
+            self._next_transaction_chunk = None
     
     def _simulate_day(self, day: int = 1):
         while True:
             current_time_str = add_minutes_to_time(self.open_time, self.env.now)
             period_end_time_str = add_minutes_to_time(current_time_str, self.processing_window - 1) 
-            self._update_failed_banks(day, current_time_str, period_end_time_str)
+            if self.instrumentation is not None:
+                self.instrumentation.begin_window(day, current_time_str)
+            newly_failed_banks = self._update_failed_banks(day)
             
             # 1. get the transactions pertaining to this time window
-            curr_period_transactions = self._gather_transactions_in_window(day, current_time_str, period_end_time_str, self.transactions)
-            for account in self.accounts.values():
-                load_account_with_transactions(account, curr_period_transactions)
+            with phase(self.instrumentation, 'gather'):
+                curr_period_transactions = self._gather_transactions_in_window(day, current_time_str, period_end_time_str, self.transactions)
+            with phase(self.instrumentation, 'load_accounts'):
+                load_accounts_with_transactions(self.accounts.values(), curr_period_transactions, self.account_history)
+            num_arrivals = len(curr_period_transactions)
 
             # -> remove transactions from failed banks
-            txns_failed_from_bank_failure = {transaction for transaction in curr_period_transactions if transaction.involves_failed_bank()}
-            for transaction in txns_failed_from_bank_failure:
-                transaction.status_code = TRANSACTION_STATUS_CODES['Failed']
-            curr_period_transactions -= txns_failed_from_bank_failure
+            with phase(self.instrumentation, 'bank_failure'):
+                txns_failed_from_bank_failure = set()
+                if self.failed_banks:
+                    txns_failed_from_bank_failure = {transaction for transaction in curr_period_transactions if transaction.involves_failed_bank()}
+                    curr_period_transactions -= txns_failed_from_bank_failure
+                # -> remove queued transactions of banks that failed in this time window
+                if newly_failed_banks:
+                    exposed_transactions = set()
+                    for bank_name in newly_failed_banks:
+                        exposed_transactions.update(self.exposure_by_bank.pop(bank_name, set()))
+                    if exposed_transactions:
+                        txns_failed_from_bank_failure.update(self.queue.remove_transactions(exposed_transactions.__contains__))
+                for transaction in txns_failed_from_bank_failure:
+                    transaction.status_code = TRANSACTION_STATUS_CODES['Failed']
             
             # 2. obtain necessary intraday credit
-            liquidity_requirement = defaultdict(float)
-            # -> calculate liquidity requirements for all outstanding transactions
-            for txn in curr_period_transactions:
-                liquidity_requirement[txn.sender_account] += txn.amount
-            # -> lend required credit                
-            for acc, requirement in liquidity_requirement.items():
-                credit_amount = requirement - acc.balance
-                if credit_amount > 0:
-                    self.credit_facility.lend_credit(acc, credit_amount)
+            with phase(self.instrumentation, 'credit'):
+                liquidity_requirement = defaultdict(float)
+                # -> calculate liquidity requirements for all outstanding transactions
+                for txn in curr_period_transactions:
+                    liquidity_requirement[txn.sender_account] += txn.amount
+                # -> lend required credit                
+                for acc, requirement in liquidity_requirement.items():
+                    credit_amount = requirement - acc.balance
+                    if credit_amount > 0:
+                        self.credit_facility.lend_credit(acc, credit_amount)
             
             # 3. outstanding transactions to be settled sent into System to be processed
             processed_transactions = self.system.process(curr_period_transactions, day, current_time_str)
@@ -131,79 +194,128 @@ class BasicSim:
                 processed_transaction.settle_day = day
                 processed_transaction.settle_time = current_time_str
             # -> calculate transaction fees
-            transaction_fees = [(transaction.sender_account.id, day, current_time_str, self.transaction_fee_handler.calculate_fee(transaction.amount, current_time_str, self.transaction_fee_rate)) 
-                                for transaction in processed_transactions['Processed']]
+            with phase(self.instrumentation, 'fees'):
+                transaction_fees = calculate_transaction_fees(self.transaction_fee_handler, processed_transactions['Processed'], day, current_time_str, self.transaction_fee_rate)
             
             # 4. processed transactions printed to log
-            # -> transaction log
             transactions_to_log = {transaction for transactions in processed_transactions.values() for transaction in transactions}
             transactions_to_log.update(txns_failed_from_bank_failure) # add the failed transactions due to bank failure
-            self.transaction_logger.write(self._extract_logging_details(transactions_to_log, day, current_time_str)) # settled and failed transactions
-            # -> queueu statistics log
-            self.queue_stats_logger.write([(day, current_time_str, self.queue.get_num_txns(), self.queue.get_txn_amount_total())])
-            # -> account balance statistics log
-            self.account_balance_logger.write([(day, current_time_str, account.id, account.balance) for account in self.accounts.values()])
-            # -> transaction fees log
-            self.transaction_fee_logger.write(transaction_fees)
-            # -> credit facility usage log
-            self.credit_facility_logger.write([
-                (day, current_time_str, account.id, account.posted_collateral, self.credit_facility.get_total_credit(account), self.credit_facility.get_total_fee(account))
-                for account in self.accounts.values()
-            ])
+            self._write_logs(day, current_time_str, transactions_to_log, transaction_fees)
+            self._release_transactions(transactions_to_log)
+            self.queue.accumulate_time_weighted_stats(self.processing_window)
+            if self.instrumentation is not None:
+                self.instrumentation.end_window(num_arrivals=num_arrivals, num_processed=len(processed_transactions['Processed']),
+                                                num_failed=len(processed_transactions['Failed']) + len(txns_failed_from_bank_failure),
+                                                queue_num_txns=self.queue.get_num_txns(), queue_txn_amount=self.queue.get_txn_amount_total())
             
             yield self.env.timeout(self.processing_window)
 
     def _perform_eod(self, day: int = 1):
             processed_transactions = []
-            transaction_fees = []
+            force_settled_transactions = []
+            cancelled_transactions = []
+            if self.instrumentation is not None:
+                self.instrumentation.begin_window(day, self.close_time)
 
             # 1. credit facility repayment
-            self.credit_facility.collect_all_repayment(day, self.accounts.values())
+            with phase(self.instrumentation, 'eod_repayment'):
+                self.credit_facility.collect_all_repayment(day, self.accounts.values())
             
             # 2. remove all transactions from queue if appropriate
-            if self.eod_clear_queue or self.eod_force_settlement: 
-                for txn, priority in list(self.queue.queue):
-                    self.queue.dequeue((txn, priority))
-
-                    # 3a. forced unsettled transactions regardless constraints if appropriate            
-                    if self.eod_force_settlement:
-                        settle_transaction(txn)
-                        txn.settle_day = day
-                        txn.settle_time = self.close_time
-                        processed_transactions.append(txn)
-                        transaction_fees.append((txn.sender_account.id,
-                                                 day,
-                                                 self.close_time,
-                                                 self.transaction_fee_handler.calculate_fee(txn.amount,
-                                                                                            self.close_time,
-                                                                                            self.transaction_fee_rate)))
-                    # 3b. dequeued transactions cancelled
-                    else:
-                        txn.update_transaction_status('Failed')
+            with phase(self.instrumentation, 'eod_queue'):
+                if self.eod_clear_queue or self.eod_force_settlement: 
+                    for txn in self.queue.dequeue_all():
+
+                        # 3a. forced unsettled transactions regardless constraints if appropriate            
+                        if self.eod_force_settlement:
+                            settle_transaction(txn)
+                            txn.settle_day = day
+                            txn.settle_time = self.close_time
+                            processed_transactions.append(txn)
+                            force_settled_transactions.append(txn)
+                        # 3b. dequeued transactions cancelled
+                        else:
+                            txn.update_transaction_status('Failed')
+                            cancelled_transactions.append(txn)
+
+            # -> calculate transaction fees of force settled transactions
+            with phase(self.instrumentation, 'fees'):
+                transaction_fees = calculate_transaction_fees(self.transaction_fee_handler, force_settled_transactions, day, self.close_time, self.transaction_fee_rate)
+                self.transaction_fee_handler.end_of_day(day)
+            with phase(self.instrumentation, 'bank_failure'):
+                self._prune_exposure()
+            # -> drop the day's account history if only the current day is retained
+            if self.account_history == 'day':
+                for account in self.accounts.values():
+                    account.clear_history()
 
             # 4. print logs
-            # -> transaction log
-            self.transaction_logger.write(self._extract_logging_details(processed_transactions, day, self.close_time)) 
-            # -> queueu statistics log
-            self.queue_stats_logger.write([(day, self.close_time, self.queue.get_num_txns(), self.queue.get_txn_amount_total())])
-            # -> transaction fees log
+            self._write_logs(day, self.close_time, processed_transactions, transaction_fees)
+            self._release_transactions(processed_transactions + cancelled_transactions)
+            if self.instrumentation is not None:
+                self.instrumentation.end_window(num_processed=len(force_settled_transactions), queue_num_txns=self.queue.get_num_txns(),
+                                                queue_txn_amount=self.queue.get_txn_amount_total())
+
+    def _write_logs(self, day: int, time: str, transactions_to_log: Set[Transaction], transaction_fees: List[Tuple]) -> None:
+        # -> transaction log
+        with phase(self.instrumentation, 'log_transactions'):
+            self.transaction_logger.write(self._extract_logging_details(transactions_to_log, day, time)) # settled and failed transactions
+        # -> queueu statistics log
+        with phase(self.instrumentation, 'log_queue_stats'):
+            self.queue_stats_logger.write([(day, time, self.queue.get_num_txns(), self.queue.get_txn_amount_total())])
+        # -> account balance statistics log
+        with phase(self.instrumentation, 'log_account_balance'):
+            self.account_balance_logger.write([(day, time, account.id, account.balance) for account in self.accounts.values()])
+        # -> transaction fees log
+        with phase(self.instrumentation, 'log_transaction_fees'):
             self.transaction_fee_logger.write(transaction_fees)
-            # -> account balance statistics log
-            self.account_balance_logger.write([(day, self.close_time, account.id, account.balance) for account in self.accounts.values()])
-            # -> credit facility usage log
+        # -> credit facility usage log
+        with phase(self.instrumentation, 'log_credit_facility'):
             self.credit_facility_logger.write([
-                (day, self.close_time, account.id, account.posted_collateral, self.credit_facility.get_total_credit(account), self.credit_facility.get_total_fee(account))
+                (day, time, account.id, account.posted_collateral, self.credit_facility.get_total_credit(account), self.credit_facility.get_total_fee(account))
                 for account in self.accounts.values()
             ])
 
+    def _release_transactions(self, transactions: Iterable[Transaction]) -> None:
+        """Drops finished transactions from the simulator's state once they are logged, if release_finished_transactions is set."""
+        if not self.release_finished_transactions:
+            return
+        for transaction in transactions:
+            # a split transaction is not processed itself, so it is released with the first of its pieces to finish
+            while transaction is not None:
+                self.transactions.discard((transaction, transaction.arrival_day, transaction.arrival_time))
+                Transaction._instances.discard(transaction)
+                transaction = getattr(transaction, 'parent_transaction', None)
+
     def run(self):
         """Main function that executes the simulation"""
-        # repeate simulation for each day
-        for i in range(self.num_days):
-            self.env = simpy.Environment()
-            self.env.process(self._simulate_day(i+1))
-            self.env.run(until=minutes_between(self.open_time, self.close_time))
-            self._perform_eod(i+1)
+        if self.memory_profiler is not None:
+            self.memory_profiler.start()
+        try:
+            self._sample_memory(0)
+            # repeate simulation for each day
+            for i in range(self.num_days):
+                self._load_transaction_chunks(i+1)
+                self.env = create_environment(self.engine)
+                self.env.process(self._simulate_day(i+1))
+                self.env.run(until=minutes_between(self.open_time, self.close_time))
+                self._perform_eod(i+1)
+                self._sample_memory(i+1)
+        finally:
+            if self.memory_profiler is not None:
+                self.memory_profiler.stop()
+        if self.instrumentation is not None:
+            self.instrumentation.end_run()
+
+    def run_scenarios(self, balances: np.ndarray = None, transaction_fee_rates: List[Union[float, Dict[str, float]]] = None, posted_collateral: np.ndarray = None) -> ScenarioResults:
+        """
+        Simulates several scenarios that share this simulator's transactions and components in a single pass, without writing logs or changing the simulator's objects.
+        balances and posted_collateral are scenarios x accounts arrays, with accounts in the order of self.accounts, and transaction_fee_rates has one rate per scenario.
+        Parameters that are not given are taken from the simulator for every scenario.
+        """
+        if self._transaction_chunks is not None or self._next_transaction_chunk is not None:
+            raise ValueError('Scenarios cannot be run on transactions given in chunks, as they are only loaded while the simulation runs.')
+        return LockstepScenarioEngine(self, balances, transaction_fee_rates, posted_collateral).run()
 
     @staticmethod
     def _gather_transactions_in_window(day: int, begin_time: str, end_time: str, transactions_set: Set[Tuple[Transaction, int, str]]) -> Set[Transaction]:
@@ -228,10 +340,42 @@ class BasicSim:
             transaction.settle_time
         ) for transaction in transactions]
     
-    def _update_failed_banks(self, day, begin_time, end_time):
-        if self.bank_failure is not None and day in self.bank_failure:
-            failures_to_check = self.bank_failure[day]
-            for time, bank_name in failures_to_check:
-                if is_time_later(time, begin_time, True) and not(is_time_later(time, end_time, False)):
-                    # update bank status to failed
-                    self.banks[bank_name].is_failed = True
\ No newline at end of file
+    def _memory_components(self) -> Dict[str, object]:
+        """Data structures of the simulation whose size is sampled by the memory profiler."""
+        return {
+            'transactions': self.transactions,
+            'account_transactions': [(account._txn_in, account._txn_out, account._history_windows) for account in self.accounts.values()],
+            'queue': self.queue.queue,
+            'credit_facility_history': (self.credit_facility.used_credit, self.credit_facility.history),
+            'exposure_by_bank': self.exposure_by_bank,
+            'transaction_instances': Transaction._instances
+        }
+
+    def _sample_memory(self, day: int) -> None:
+        if self.memory_profiler is not None:
+            self.memory_profiler.sample(day, self._memory_components())
+
+    def _update_failed_banks(self, day: int) -> List[str]:
+        """Marks the banks scheduled to fail in the current processing window as failed and returns their names."""
+        newly_failed_banks = [bank_name for bank_name in self.bank_failure_schedule.get((day, self.env.now), []) if bank_name not in self.failed_banks]
+        for bank_name in newly_failed_banks:
+            self.banks[bank_name].is_failed = True
+            self.failed_banks.add(bank_name)
+        return newly_failed_banks
+
+    def _track_exposure(self, transactions: Iterable[Transaction]) -> None:
+        """Indexes pending transactions by the banks involved so that a bank failure only touches that bank's transactions."""
+        if not self.bank_failure_schedule:
+            return
+        for transaction in transactions:
+            self.exposure_by_bank[transaction.sender_account.owner.name].add(transaction)
+            self.exposure_by_bank[transaction.recipient_account.owner.name].add(transaction)
+
+    def _prune_exposure(self) -> None:
+        """Drops settled, failed and split transactions from the bank exposure index, keeping those still open."""
+        for bank_name in list(self.exposure_by_bank):
+            pending_transactions = {transaction for transaction in self.exposure_by_bank[bank_name] if transaction.status_code == TRANSACTION_STATUS_CODES['Open']}
+            if pending_transactions:
+                self.exposure_by_bank[bank_name] = pending_transactions
+            else:
+                del self.exposure_by_bank[bank_name]
\ No newline at end of file
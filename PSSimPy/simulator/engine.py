@@ -0,0 +1,73 @@
+import heapq
+from itertools import count
+from typing import Any, Callable, Generator, Union
+
+
+class NativeEnvironment:
+    """
+    Minimal next-event scheduler implementing the part of simpy.Environment used by the simulators: now, process, timeout and run.
+    Processes are generators that yield the delay returned by timeout. Processes due at the same time resume in the order they were scheduled, as in simpy.
+    """
+
+    def __init__(self, initial_time: float = 0):
+        self._now = initial_time
+        self._queue = [] # heap of (time, order, process)
+        self._order = count()
+
+    @property
+    def now(self) -> float:
+        return self._now
+
+    def process(self, generator: Generator) -> Generator:
+        """Starts the process at the current time."""
+        self._schedule(self._now, generator)
+        return generator
+
+    def timeout(self, delay: float, value: Any = None) -> float:
+        """Returns the delay to be yielded by a process to resume after it."""
+        if delay < 0:
+            raise ValueError(f'Negative delay {delay}')
+        return delay
+
+    def run(self, until: float = None) -> None:
+        """Resumes the processes due before until, or until no process is left, and then advances the time to until."""
+        if until is not None and until < self._now:
+            raise ValueError(f'until (={until}) must be greater than the current simulation time')
+        while self._queue and (until is None or self._queue[0][0] < until):
+            time, _, generator = heapq.heappop(self._queue)
+            self._now = time
+            try:
+                delay = next(generator)
+            except StopIteration:
+                continue
+            self._schedule(time + delay, generator)
+        if until is not None:
+            self._now = until
+
+    def _schedule(self, time: float, generator: Generator) -> None:
+        heapq.heappush(self._queue, (time, next(self._order), generator))
+
+
+def _simpy_environment() -> Any:
+    # simpy is only imported by simulations that use it
+    import simpy
+    return simpy.Environment()
+
+
+# engines that can be selected by name
+ENGINES = {
+    'simpy': _simpy_environment,
+    'native': NativeEnvironment
+}
+
+
+def validate_engine(engine: Union[str, Callable[[], Any]]) -> None:
+    if not callable(engine) and engine not in ENGINES:
+        raise ValueError(f"engine must be one of {', '.join(ENGINES)} or a callable that returns an environment.")
+
+
+def create_environment(engine: Union[str, Callable[[], Any]]) -> Any:
+    """Returns a new environment of the engine, given by name or as a callable that creates environments like simpy.Environment."""
+    if callable(engine):
+        return engine()
+    return ENGINES[engine]()
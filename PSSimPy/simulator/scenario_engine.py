@@ -0,0 +1,244 @@
+import copy
+from collections import defaultdict
+from typing import Dict, List, Sequence, Tuple, Union
+import numpy as np
+
+from PSSimPy.transaction import Transaction
+from PSSimPy.queues import DirectQueue, FIFOQueue, PriorityQueue
+from PSSimPy.constraint_handler import PassThroughHandler, MinBalanceConstraintHandler
+from PSSimPy.credit_facilities import SimplePriced, SimpleCollateralized
+from PSSimPy.transaction_fee import FixedTransactionFee
+from PSSimPy.utils.constants import TRANSACTION_STATUS_CODES
+from PSSimPy.utils.time_utils import time_to_minutes, minutes_between
+from PSSimPy.utils.transaction_utils import calculate_fees
+
+
+class ScenarioResults:
+    """
+    Outcome of simulating several scenarios in lockstep.
+    Rows of the arrays are scenarios. Account columns follow account_ids and transaction columns follow transactions.
+    """
+
+    def __init__(self, account_ids: List[str], transactions: List[Transaction]):
+        self.account_ids = account_ids
+        self.transactions = transactions
+        self.balances = None # final balances
+        self.posted_collateral = None # final posted collateral
+        self.credit = None # credit that is still outstanding at the end of the simulation
+        self.transaction_fees = None # total transaction fees paid by each account
+        self.status = None # transaction status codes
+        self.settle_day = None # 0 if the transaction was not settled
+        self.settle_minute = None # minute of the day when the transaction was settled, -1 if it was not settled
+        self.queue_stats_times = [] # (day, time) of each queue statistics entry
+        self.queue_num_txns = [] # number of queued transactions of each scenario, one row per queue statistics entry
+        self.queue_txn_amount = [] # amount of queued transactions of each scenario, one row per queue statistics entry
+
+    @property
+    def num_scenarios(self) -> int:
+        return self.balances.shape[0]
+
+
+class LockstepScenarioEngine:
+    """
+    Simulates several scenarios of a BasicSim at once. The scenarios share the simulator's transaction stream and components,
+    and differ in their initial balances, posted collateral and transaction fee rates.
+    Balances are held as a scenarios x accounts array and transaction statuses as a scenarios x transactions array.
+    Supports the DirectQueue, FIFOQueue and PriorityQueue queues, the PassThroughHandler and MinBalanceConstraintHandler constraint handlers,
+    and the SimplePriced and SimpleCollateralized credit facilities.
+    """
+
+    def __init__(self, sim, balances: np.ndarray = None, transaction_fee_rates: Sequence[Union[float, Dict[str, float]]] = None, posted_collateral: np.ndarray = None):
+        # 1. check that the simulator's components can be simulated in lockstep
+        if type(sim.queue) not in (DirectQueue, FIFOQueue, PriorityQueue):
+            raise ValueError(f'{type(sim.queue).__name__} is not supported when simulating scenarios in lockstep.')
+        if type(sim.constraint_handler) not in (PassThroughHandler, MinBalanceConstraintHandler):
+            raise ValueError(f'{type(sim.constraint_handler).__name__} is not supported when simulating scenarios in lockstep.')
+        if type(sim.credit_facility) not in (SimplePriced, SimpleCollateralized):
+            raise ValueError(f'{type(sim.credit_facility).__name__} is not supported when simulating scenarios in lockstep.')
+        self.sim = sim
+        # 2. scenario parameters
+        accounts = list(sim.accounts.values())
+        self.account_ids = [account.id for account in accounts]
+        num_accounts = len(accounts)
+        sizes = {len(value) for value in (balances, transaction_fee_rates, posted_collateral) if value is not None}
+        if len(sizes) != 1:
+            raise ValueError('At least one of balances, transaction_fee_rates and posted_collateral must be given, with one entry per scenario.')
+        self.num_scenarios = sizes.pop()
+        self.balances = self._scenario_matrix(balances, [account.balance for account in accounts], 'balances')
+        self.posted_collateral = self._scenario_matrix(posted_collateral, [account.posted_collateral for account in accounts], 'posted_collateral')
+        self.transaction_fee_rates = list(transaction_fee_rates) if transaction_fee_rates is not None else [sim.transaction_fee_rate] * self.num_scenarios
+        # 3. shared transaction stream
+        self.transactions = sorted((transaction for transaction, _, _ in sim.transactions), key=lambda transaction: (transaction.day, time_to_minutes(transaction.time)))
+        account_index = {account_id: index for index, account_id in enumerate(self.account_ids)}
+        bank_names = list(sim.banks)
+        bank_index = {bank_name: index for index, bank_name in enumerate(bank_names)}
+        self.bank_names = bank_names
+        self.account_bank = np.array([bank_index[account.owner.name] for account in accounts], dtype=int)
+        self.sender = np.array([account_index[transaction.sender_account.id] for transaction in self.transactions], dtype=int)
+        self.recipient = np.array([account_index[transaction.recipient_account.id] for transaction in self.transactions], dtype=int)
+        self.amount = np.array([transaction.amount for transaction in self.transactions], dtype=float)
+        self.num_accounts = num_accounts
+        # -> index transactions by the processing window in which they arrive
+        self.open_minutes = time_to_minutes(sim.open_time)
+        self.day_length = minutes_between(sim.open_time, sim.close_time)
+        window_transactions = defaultdict(list)
+        for column, transaction in enumerate(self.transactions):
+            minutes_from_open = time_to_minutes(transaction.time) - self.open_minutes
+            if 0 <= minutes_from_open < self.day_length:
+                window_transactions[(transaction.day, minutes_from_open - minutes_from_open % sim.processing_window)].append(column)
+        self.window_transactions = {window: np.array(columns, dtype=int) for window, columns in window_transactions.items()}
+        # 4. per scenario state
+        shape = (self.num_scenarios, len(self.transactions))
+        self.status = np.full(shape, TRANSACTION_STATUS_CODES['Open'], dtype=np.int8)
+        self.queued = np.zeros(shape, dtype=bool)
+        self.queued_columns = np.empty(0, dtype=int) # transactions queued in at least one scenario
+        self.settle_day = np.zeros(shape, dtype=np.int32)
+        self.settle_minute = np.full(shape, -1, dtype=np.int32)
+        self.transaction_fees = np.zeros((self.num_scenarios, num_accounts))
+        self.credit_entries = [] # credit lent in each time window, as scenarios x accounts arrays
+        self.failed_banks = np.array([sim.banks[bank_name].is_failed for bank_name in bank_names], dtype=bool)
+        # fee handlers keep state across transactions, so each scenario gets its own copy unless fees can be calculated for all scenarios at once
+        self.vectorized_fees = type(sim.transaction_fee_handler) is FixedTransactionFee and all(isinstance(rate, (int, float)) for rate in self.transaction_fee_rates)
+        self.fee_handlers = None if self.vectorized_fees else [copy.deepcopy(sim.transaction_fee_handler) for _ in range(self.num_scenarios)]
+        self.results = ScenarioResults(self.account_ids, self.transactions)
+
+    def run(self) -> ScenarioResults:
+        for day in range(1, self.sim.num_days + 1):
+            for window_start in range(0, self.day_length, self.sim.processing_window):
+                self._simulate_window(day, window_start)
+            self._perform_eod(day)
+        results = self.results
+        results.balances = self.balances
+        results.posted_collateral = self.posted_collateral
+        results.credit = sum(self.credit_entries) if self.credit_entries else np.zeros_like(self.balances)
+        results.transaction_fees = self.transaction_fees
+        results.status = self.status
+        results.settle_day = self.settle_day
+        results.settle_minute = self.settle_minute
+        results.queue_num_txns = np.array(results.queue_num_txns).reshape(-1, self.num_scenarios)
+        results.queue_txn_amount = np.array(results.queue_txn_amount).reshape(-1, self.num_scenarios)
+        return results
+
+    def _simulate_window(self, day: int, window_start: int) -> None:
+        current_minute = self.open_minutes + window_start
+        arrivals = self.window_transactions.get((day, window_start), np.empty(0, dtype=int))
+        # 1. bank failures
+        newly_failed_banks = [self.bank_names.index(bank_name) for bank_name in self.sim.bank_failure_schedule.get((day, window_start), [])]
+        if newly_failed_banks:
+            self.failed_banks[newly_failed_banks] = True
+            # -> queued transactions involving the failed banks fail
+            failed_columns = self.queued_columns[self._involves_failed_bank(self.queued_columns)]
+            self._fail(failed_columns, self.queued[:, failed_columns])
+        if self.failed_banks.any():
+            # -> arriving transactions involving failed banks fail in every scenario
+            arrivals_failed = self._involves_failed_bank(arrivals)
+            self.status[:, arrivals[arrivals_failed]] = TRANSACTION_STATUS_CODES['Failed']
+            arrivals = arrivals[~arrivals_failed]
+        if arrivals.size:
+            # 2. obtain necessary intraday credit for the arriving transactions
+            senders = self.sender[arrivals]
+            liquidity_requirement = np.bincount(senders, weights=self.amount[arrivals], minlength=self.num_accounts)
+            has_requirement = np.bincount(senders, minlength=self.num_accounts) > 0
+            credit_amount = liquidity_requirement - self.balances
+            lend = has_requirement & (credit_amount > 0)
+            if isinstance(self.sim.credit_facility, SimpleCollateralized):
+                lend &= credit_amount <= self.posted_collateral
+                self.posted_collateral -= np.where(lend, credit_amount, 0)
+            if lend.any():
+                credit_lent = np.where(lend, credit_amount, 0)
+                self.balances += credit_lent
+                self.credit_entries.append(credit_lent)
+            # 3. constraint handler
+            if isinstance(self.sim.constraint_handler, MinBalanceConstraintHandler):
+                passed = self.balances[:, senders] - self.amount[arrivals] >= self.sim.constraint_handler.min_balance
+                self.status[:, arrivals] = np.where(passed, TRANSACTION_STATUS_CODES['Open'], TRANSACTION_STATUS_CODES['Failed'])
+            else:
+                passed = True
+            self.queued[:, arrivals] = passed
+            self.queued_columns = np.union1d(self.queued_columns, arrivals)
+        # 4. dequeue and settle
+        if self.queued_columns.size:
+            columns = self.queued_columns
+            to_dequeue = self.queued[:, columns]
+            if type(self.sim.queue) is not DirectQueue:
+                # every queued transaction is checked against the balances before any of them is settled
+                to_dequeue = to_dequeue & (self.balances[:, self.sender[columns]] - self.amount[columns] >= 0)
+            rows, positions = np.nonzero(to_dequeue)
+            self._settle(rows, columns[positions], day, current_minute)
+        self._record_queue_stats(day, current_minute)
+
+    def _perform_eod(self, day: int) -> None:
+        close_minute = time_to_minutes(self.sim.close_time)
+        # 1. credit facility repayment, in the order in which credit was lent
+        collateralized = isinstance(self.sim.credit_facility, SimpleCollateralized)
+        for credit_lent in self.credit_entries:
+            repay = (credit_lent > 0) & (credit_lent <= self.balances)
+            repayment = np.where(repay, credit_lent, 0)
+            self.balances -= repayment
+            if collateralized:
+                self.posted_collateral += repayment
+            credit_lent[repay] = 0
+        self.credit_entries = [credit_lent for credit_lent in self.credit_entries if credit_lent.any()]
+        # 2. clear or force settle the queue
+        if (self.sim.eod_clear_queue or self.sim.eod_force_settlement) and self.queued_columns.size:
+            columns = self.queued_columns
+            if self.sim.eod_force_settlement:
+                rows, positions = np.nonzero(self.queued[:, columns])
+                self._settle(rows, columns[positions], day, close_minute)
+            else:
+                self._fail(columns, self.queued[:, columns])
+        if self.fee_handlers is not None:
+            for fee_handler in self.fee_handlers:
+                fee_handler.end_of_day(day)
+        self._record_queue_stats(day, close_minute)
+
+    def _settle(self, rows: np.ndarray, columns: np.ndarray, day: int, minute: int) -> None:
+        if not rows.size:
+            return
+        amounts = self.amount[columns]
+        size = self.num_scenarios * self.num_accounts
+        self.balances -= np.bincount(rows * self.num_accounts + self.sender[columns], weights=amounts, minlength=size).reshape(self.balances.shape)
+        self.balances += np.bincount(rows * self.num_accounts + self.recipient[columns], weights=amounts, minlength=size).reshape(self.balances.shape)
+        self.status[rows, columns] = TRANSACTION_STATUS_CODES['Success']
+        self.queued[rows, columns] = False
+        self.settle_day[rows, columns] = day
+        self.settle_minute[rows, columns] = minute
+        self._charge_fees(rows, columns, minute)
+        self.queued_columns = self.queued_columns[self.queued[:, self.queued_columns].any(axis=0)]
+
+    def _fail(self, columns: np.ndarray, mask: np.ndarray) -> None:
+        rows, positions = np.nonzero(mask)
+        self.status[rows, columns[positions]] = TRANSACTION_STATUS_CODES['Failed']
+        self.queued[rows, columns[positions]] = False
+        self.queued_columns = self.queued_columns[self.queued[:, self.queued_columns].any(axis=0)]
+
+    def _charge_fees(self, rows: np.ndarray, columns: np.ndarray, minute: int) -> None:
+        senders = self.sender[columns]
+        if self.vectorized_fees:
+            fees = self.amount[columns] * np.asarray(self.transaction_fee_rates, dtype=float)[rows]
+        else:
+            fees = np.zeros(len(rows))
+            for scenario in np.unique(rows):
+                selected = rows == scenario
+                account_ids = [self.account_ids[sender] for sender in senders[selected]]
+                fees[selected] = calculate_fees(self.fee_handlers[scenario], self.amount[columns[selected]], minute, self.transaction_fee_rates[scenario], account_ids)
+        size = self.num_scenarios * self.num_accounts
+        self.transaction_fees += np.bincount(rows * self.num_accounts + senders, weights=fees, minlength=size).reshape(self.balances.shape)
+
+    def _involves_failed_bank(self, columns: np.ndarray) -> np.ndarray:
+        return self.failed_banks[self.account_bank[self.sender[columns]]] | self.failed_banks[self.account_bank[self.recipient[columns]]]
+
+    def _record_queue_stats(self, day: int, minute: int) -> None:
+        columns = self.queued_columns
+        queued = self.queued[:, columns]
+        self.results.queue_stats_times.append((day, '%02d:%02d' % divmod(minute, 60)))
+        self.results.queue_num_txns.append(queued.sum(axis=1))
+        self.results.queue_txn_amount.append(queued @ self.amount[columns])
+
+    def _scenario_matrix(self, values, base_values: List[float], name: str) -> np.ndarray:
+        if values is None:
+            return np.tile(np.asarray(base_values, dtype=float), (self.num_scenarios, 1))
+        values = np.array(values, dtype=float)
+        if values.shape != (self.num_scenarios, len(base_values)):
+            raise ValueError(f'{name} must have one row per scenario and one column per account.')
+        return values
@@ -1,35 +1,40 @@
-from typing import Set
+from typing import Set, List, Callable
 
 from PSSimPy.transaction import Transaction
 from PSSimPy.constraint_handler.abstract_constraint_handler import AbstractConstraintHandler
 from PSSimPy.queues.abstract_queue import AbstractQueue
 from PSSimPy.utils.transaction_utils import settle_transaction
-from PSSimPy.utils.constants import TRANSACTION_STATUS_CODES
+from PSSimPy.utils.instrumentation import Instrumentation, phase
 
 class System:
 
-    def __init__(self, constraint_handler: AbstractConstraintHandler, queue: AbstractQueue):
+    def __init__(self, constraint_handler: AbstractConstraintHandler, queue: AbstractQueue, instrumentation: Instrumentation = None,
+                 enqueue_callback: Callable[[List[Transaction]], None] = None):
         self.constraint_handler = constraint_handler
         self.queue = queue
+        self.instrumentation = instrumentation
+        self.enqueue_callback = enqueue_callback # called with the transactions sent into the queue, e.g. the pieces of split transactions
 
     def process(self, transactions: Set[Transaction], submission_day: int, submission_time: str) -> dict:
-        txns_to_queue = set()
-        # send each transaction into the constraint handler
         for transaction in transactions:
             transaction.submission_day = submission_day
             transaction.submission_time = submission_time
-            self.constraint_handler.process_transaction(transaction)
-            txns_to_queue.update(self.constraint_handler.get_passed_transactions())
-        self.constraint_handler.clear()
+        # send the transactions into the constraint handler as one batch
+        with phase(self.instrumentation, 'constraint_handler'):
+            constraint_results = self.constraint_handler.process_batch(transactions)
+            self.constraint_handler.clear()
         # send transactions that passed constraints into queue
-        self.queue.bulk_enqueue(txns_to_queue)
+        with phase(self.instrumentation, 'enqueue'):
+            self.queue.bulk_enqueue(constraint_results['Passed'])
+        if self.enqueue_callback is not None:
+            with phase(self.instrumentation, 'bank_failure'):
+                self.enqueue_callback(constraint_results['Passed'])
         # obtain dequeued transactions to process
-        txns_to_process = self.queue.begin_dequeueing()
+        with phase(self.instrumentation, 'dequeue'):
+            txns_to_process = self.queue.begin_dequeueing()
         # process dequeued transactions
-        for _ in map(settle_transaction, txns_to_process): pass
-        # get failed transactions
-        failed_transactions = [transaction for transaction in transactions if transaction.status_code==TRANSACTION_STATUS_CODES['Failed']]
-
-        # return processed transactions
-        return {'Processed': txns_to_process, 'Failed': failed_transactions}
+        with phase(self.instrumentation, 'settle'):
+            for _ in map(settle_transaction, txns_to_process): pass
 
+        # return processed transactions and transactions failed by the constraint handler
+        return {'Processed': txns_to_process, 'Failed': constraint_results['Failed']}
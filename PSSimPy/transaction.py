@@ -6,6 +6,10 @@ from PSSimPy.utils.account_utils import is_failed_account
 
 class Transaction:
 
+    # fixed fields are stored in slots, while additional user-defined attributes go to an instance dictionary that is only created when first needed
+    __slots__ = ('sender_account', 'recipient_account', 'amount', 'priority', 'status_code', 'day', 'time', 'arrival_day', 'arrival_time',
+                 'submission_day', 'submission_time', 'settle_day', 'settle_time', '__dict__')
+
     # Class attribute to hold references to all instances
     _instances = set()
 
@@ -1,2 +1,8 @@
-from PSSimPy.transaction_fee.abstract_transaction_fee import *
-from PSSimPy.transaction_fee.fixed_transaction_fee import *
\ No newline at end of file
+from PSSimPy._lazy import attach
+
+__getattr__, __dir__, __all__ = attach(__name__, {
+    'abstract_transaction_fee': ['AbstractTransactionFee'],
+    'fixed_transaction_fee': ['FixedTransactionFee'],
+    'time_banded_transaction_fee': ['MINUTES_PER_DAY', 'TimeBandedTransactionFee'],
+    'tiered_transaction_fee': ['TIER_BASES', 'TieredTransactionFee']
+})
\ No newline at end of file
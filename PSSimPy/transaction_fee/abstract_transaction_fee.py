@@ -1,5 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import Union, Dict
+from typing import Union, Dict, Sequence
+import numpy as np
+
+from PSSimPy.utils.time_utils import minutes_to_time
 
 
 class AbstractTransactionFee:
@@ -10,4 +13,19 @@ class AbstractTransactionFee:
         Calculates the transaction fee on a transaction.
         Can be implemented to use a static rate or variable rate (where the condition on which rate to use is indicated by the key in the rate dictionary)
         """
+        pass
+
+    def calculate_fees(self, txn_amounts: np.ndarray, minutes: np.ndarray, rate: Union[float, Dict[str, float]], account_ids: Sequence[str] = None) -> np.ndarray:
+        """
+        Calculates the transaction fees on a batch of transactions.
+        minutes is the minute of the day (e.g. 510 for 08:30) at which each transaction is settled, either as an array or a single value for the whole batch.
+        account_ids are the ids of the accounts paying each fee, for fees that depend on the account.
+        By default, calculate_fee is called for each transaction. Subclasses can override this with an array implementation.
+        """
+        txn_amounts = np.asarray(txn_amounts)
+        minutes = np.broadcast_to(minutes, txn_amounts.shape)
+        return np.array([self.calculate_fee(txn_amount, minutes_to_time(int(minute)), rate) for txn_amount, minute in zip(txn_amounts.tolist(), minutes.tolist())], dtype=float)
+
+    def end_of_day(self, day: int) -> None:
+        """Called by the simulator at the end of each day. Can be implemented to reset any state kept across transactions."""
         pass
\ No newline at end of file
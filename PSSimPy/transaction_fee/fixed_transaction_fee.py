@@ -1,3 +1,6 @@
+from typing import Sequence
+import numpy as np
+
 from PSSimPy.transaction_fee.abstract_transaction_fee import AbstractTransactionFee
 
 
@@ -7,4 +10,7 @@ class FixedTransactionFee(AbstractTransactionFee):
         super().__init__()
 
     def calculate_fee(self, txn_amount: int, time: str, rate: float) -> float:
-        return txn_amount * rate
\ No newline at end of file
+        return txn_amount * rate
+
+    def calculate_fees(self, txn_amounts: np.ndarray, minutes: np.ndarray, rate: float, account_ids: Sequence[str] = None) -> np.ndarray:
+        return np.asarray(txn_amounts, dtype=float) * rate
\ No newline at end of file
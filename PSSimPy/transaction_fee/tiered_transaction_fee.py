@@ -0,0 +1,66 @@
+from bisect import bisect_right
+from collections import defaultdict
+from typing import List, Tuple, Sequence
+import numpy as np
+
+from PSSimPy.transaction_fee.abstract_transaction_fee import AbstractTransactionFee
+
+TIER_BASES = ('count', 'value')
+
+
+class TieredTransactionFee(AbstractTransactionFee):
+    """
+    Applies a rate that depends on the volume already sent by the paying account in the current pricing period.
+    tiers is a list of (threshold, rate) pairs, where the lowest threshold must be 0. A transaction is charged the rate of the highest threshold
+    that the account's running volume has reached before the transaction. Volume is either the number (tier_basis='count') or the value (tier_basis='value') of transactions.
+    Running volumes are kept per account and reset every reset_period_days days at the end of the day. If reset_period_days is None, they are never reset.
+    """
+
+    def __init__(self, tiers: List[Tuple[float, float]], tier_basis: str = 'count', reset_period_days: int = 1):
+        super().__init__()
+        if not tiers:
+            raise ValueError('tiers must define at least one tier.')
+        if tier_basis not in TIER_BASES:
+            raise ValueError(f"Invalid tier_basis: '{tier_basis}'. Must be one of {', '.join(TIER_BASES)}.")
+        if reset_period_days is not None and reset_period_days < 1:
+            raise ValueError('reset_period_days must be at least 1.')
+        sorted_tiers = sorted(tiers)
+        if sorted_tiers[0][0] != 0:
+            raise ValueError('The lowest tier threshold must be 0.')
+        self.thresholds = [threshold for threshold, _ in sorted_tiers]
+        self.rates = [rate for _, rate in sorted_tiers]
+        self.tier_basis = tier_basis
+        self.reset_period_days = reset_period_days
+        # running volumes in the current pricing period
+        self.txn_count = defaultdict(int)
+        self.txn_value = defaultdict(float)
+
+    def calculate_fee(self, txn_amount: int, time: str, rate: float = None, account_id: str = None) -> float:
+        """Without an account_id, the transaction is charged the rate of the lowest tier and is not counted towards any volume."""
+        if account_id is None:
+            return txn_amount * self.rates[0]
+        return self._price_and_count(txn_amount, account_id)
+
+    def calculate_fees(self, txn_amounts: np.ndarray, minutes: np.ndarray, rate: float = None, account_ids: Sequence[str] = None) -> np.ndarray:
+        if account_ids is None:
+            raise ValueError('account_ids are required to calculate tiered transaction fees.')
+        return np.array([self._price_and_count(txn_amount, account_id) for txn_amount, account_id in zip(np.asarray(txn_amounts).tolist(), account_ids)], dtype=float)
+
+    def end_of_day(self, day: int) -> None:
+        if self.reset_period_days is not None and day % self.reset_period_days == 0:
+            self.reset_volumes()
+
+    def reset_volumes(self) -> None:
+        self.txn_count.clear()
+        self.txn_value.clear()
+
+    def get_volume(self, account_id: str) -> Tuple[int, float]:
+        """Returns the number and value of transactions counted for an account in the current pricing period."""
+        return self.txn_count.get(account_id, 0), self.txn_value.get(account_id, 0.0)
+
+    def _price_and_count(self, txn_amount: float, account_id: str) -> float:
+        volume = self.txn_count[account_id] if self.tier_basis == 'count' else self.txn_value[account_id]
+        tier = bisect_right(self.thresholds, volume) - 1
+        self.txn_count[account_id] += 1
+        self.txn_value[account_id] += txn_amount
+        return txn_amount * self.rates[tier]
\ No newline at end of file
@@ -0,0 +1,41 @@
+from typing import Dict, Sequence
+import numpy as np
+
+from PSSimPy.transaction_fee.abstract_transaction_fee import AbstractTransactionFee
+from PSSimPy.utils.time_utils import is_valid_24h_time, time_to_minutes
+
+MINUTES_PER_DAY = 24 * 60
+
+
+class TimeBandedTransactionFee(AbstractTransactionFee):
+    """
+    Applies a rate that depends on the time of day at which the transaction is settled.
+    rate_schedule maps the start time of each band (in "HH:MM" format) to the rate applied from that time until the start of the next band.
+    Times before the earliest band use the rate of the latest band, as bands wrap around midnight.
+    The schedule is compiled into a lookup table by minute of the day, so the rate argument passed by the simulator is not used.
+    """
+
+    def __init__(self, rate_schedule: Dict[str, float]):
+        super().__init__()
+        if not rate_schedule:
+            raise ValueError('rate_schedule must define at least one band.')
+        if not all(is_valid_24h_time(band_start) for band_start in rate_schedule):
+            raise ValueError('Invalid time input. All keys of rate_schedule must be valid 24h format times.')
+        self.rate_schedule = rate_schedule
+        self.rate_table = self._compile_rate_table(rate_schedule)
+
+    def calculate_fee(self, txn_amount: int, time: str, rate: float = None) -> float:
+        return txn_amount * float(self.rate_table[time_to_minutes(time)])
+
+    def calculate_fees(self, txn_amounts: np.ndarray, minutes: np.ndarray, rate: float = None, account_ids: Sequence[str] = None) -> np.ndarray:
+        return np.asarray(txn_amounts, dtype=float) * self.rate_table[np.asarray(minutes) % MINUTES_PER_DAY]
+
+    @staticmethod
+    def _compile_rate_table(rate_schedule: Dict[str, float]) -> np.ndarray:
+        """Returns the rate applicable at each minute of the day."""
+        bands = sorted((time_to_minutes(band_start), rate) for band_start, rate in rate_schedule.items())
+        band_starts = np.array([band_start for band_start, _ in bands])
+        band_rates = np.array([rate for _, rate in bands], dtype=float)
+        # index of the latest band that starts at or before each minute; -1 wraps around to the last band
+        band_index = np.searchsorted(band_starts, np.arange(MINUTES_PER_DAY), side='right') - 1
+        return band_rates[band_index]
\ No newline at end of file
@@ -1,6 +1,16 @@
-from PSSimPy.utils.account_utils import *
-from PSSimPy.utils.constants import *
-from PSSimPy.utils.transaction_utils import *
-from PSSimPy.utils.time_utils import *
-from PSSimPy.utils.file_utils import *
-from PSSimPy.utils.logger import *
\ No newline at end of file
+from PSSimPy._lazy import attach
+
+__getattr__, __dir__, __all__ = attach(__name__, {
+    'account_utils': ['min_balance_maintained', 'is_failed_account', 'load_account_with_transactions', 'load_accounts_with_transactions', 'validate_account_history'],
+    'constants': ['TRANSACTION_STATUS_CODES', 'TRANSACTION_LOGGER_HEADER', 'TRANSACTION_FEE_LOGGER_HEADER', 'QUEUE_STATS_HEADER', 'TRANSACTION_ARRIVAL_HEADER',
+                  'ACCOUNT_BALANCE_HEADER', 'CREDIT_FACILITY_LOGGER_HEADER', 'ACCOUNT_HISTORY_POLICIES'],
+    'transaction_utils': ['settle_transaction', 'release_transaction_instances', 'calculate_transaction_fees'],
+    'time_utils': ['is_valid_24h_time', 'add_minutes_to_time', 'is_time_later', 'minutes_between', 'time_to_minutes', 'minutes_to_time'],
+    'file_utils': ['logger_file_name'],
+    'logger': ['Logger'],
+    'instrumentation': ['SNAPSHOT_STATS', 'PhaseCollector', 'TimingCollector', 'NULL_PHASE', 'Instrumentation', 'phase'],
+    'memory_profiler': ['CONTAINER_TYPES', 'structure_size', 'MemoryProfiler'],
+    'workload_utils': ['WorkloadGenerator'],
+    'component_utils': ['create_component', 'claim_components'],
+    'snapshot_utils': ['dumps_snapshot', 'loads_snapshot']
+})
\ No newline at end of file
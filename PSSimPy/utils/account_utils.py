@@ -1,4 +1,9 @@
+from typing import Iterable, Union
+
 from PSSimPy.account import Account
+from PSSimPy.utils.constants import ACCOUNT_HISTORY_POLICIES
+
+_NO_TRANSACTIONS = frozenset()
 
 def min_balance_maintained(sender_account: Account, txn_amount: float, min_balance: float=0) -> bool:
     return sender_account.balance - txn_amount >= min_balance
@@ -14,5 +19,31 @@ def load_account_with_transactions(account: Account, transactions: set):
             txn_out.add(transaction)
         elif transaction.recipient_account.id == account.id:
             txn_in.add(transaction)
-    account.txn_in.update(txn_in)
-    account.txn_out.update(txn_out)
\ No newline at end of file
+    account.add_transactions(txn_in, txn_out)
+
+def load_accounts_with_transactions(accounts: Iterable[Account], transactions: set, history: Union[str, int] = 'all') -> None:
+    """Records the transactions of a time window on their sender and recipient accounts in a single pass over the transactions."""
+    loaded = {}
+    for transaction in transactions:
+        sender_id = transaction.sender_account.id
+        recipient_id = transaction.recipient_account.id
+        if sender_id not in loaded:
+            loaded[sender_id] = (set(), set())
+        loaded[sender_id][1].add(transaction)
+        # transactions to the sending account itself only count as outgoing
+        if recipient_id != sender_id:
+            if recipient_id not in loaded:
+                loaded[recipient_id] = (set(), set())
+            loaded[recipient_id][0].add(transaction)
+    rolling = isinstance(history, int)
+    for account in accounts:
+        account_transactions = loaded.get(account.id)
+        if account_transactions is not None:
+            account.add_transactions(account_transactions[0], account_transactions[1], history)
+        elif rolling:
+            # an empty window still pushes the oldest window out of a rolling history
+            account.add_transactions(_NO_TRANSACTIONS, _NO_TRANSACTIONS, history)
+
+def validate_account_history(history: Union[str, int]) -> None:
+    if isinstance(history, bool) or not (history in ACCOUNT_HISTORY_POLICIES or (isinstance(history, int) and history > 0)):
+        raise ValueError(f"account_history must be one of {', '.join(ACCOUNT_HISTORY_POLICIES)} or a positive number of windows.")
@@ -0,0 +1,33 @@
+import threading
+import weakref
+from typing import Any, Callable, Dict, Union
+
+# component -> weak reference to the simulator using it
+_component_owners = weakref.WeakKeyDictionary()
+_component_owners_lock = threading.Lock()
+
+
+def create_component(component: Union[object, Callable[[], object], None], base_class: type, default_class: type) -> object:
+    """Returns a new default_class() if component is None, a new instance if component is a class or factory, and the component itself otherwise."""
+    if component is None:
+        return default_class()
+    if isinstance(component, type) or (callable(component) and not isinstance(component, base_class)):
+        return component()
+    return component
+
+
+def claim_components(owner: Any, components: Dict[str, object]) -> None:
+    """
+    Registers the simulator owner as the user of the components, keyed by parameter name.
+    Components such as queues and credit facilities hold the state of a simulation, so a component instance can only be used by one simulator at a time.
+    Raises a ValueError, without claiming any component, if another simulator that still exists already uses one of them.
+    """
+    with _component_owners_lock:
+        for name, component in components.items():
+            current_owner_ref = _component_owners.get(component)
+            current_owner = current_owner_ref() if current_owner_ref is not None else None
+            if current_owner is not None and current_owner is not owner:
+                raise ValueError(f"The {name} {component!r} is already used by the simulator {getattr(current_owner, 'name', current_owner)!r}. "
+                                 'Pass a new instance, or a class or factory that creates one, to each simulator.')
+        for component in components.values():
+            _component_owners[component] = weakref.ref(owner)
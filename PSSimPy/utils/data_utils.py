@@ -1,4 +1,9 @@
 import inspect
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from PSSimPy.utils.time_utils import time_to_minutes
 
 
 def initialize_classes_from_dict(class_type, data: dict) -> list:
@@ -31,4 +36,44 @@ def initialize_classes_from_dict(class_type, data: dict) -> list:
         instance = class_type(*args, **kwargs)
         instances.append(instance)
     
-    return instances
\ No newline at end of file
+    return instances
+
+
+def to_column_dict(data):
+    """Returns the columns of a pandas DataFrame as a dictionary of lists, and any other data unchanged. pandas is not imported, since a DataFrame can only exist once it has been."""
+    pandas = sys.modules.get('pandas')
+    if pandas is not None and isinstance(data, pandas.DataFrame):
+        return data.to_dict(orient='list')
+    return data
+
+
+def instance_attributes(instance) -> dict:
+    """Returns the attributes of an instance, including those stored in slots, in the order they are defined."""
+    attributes = {}
+    for cls in reversed(type(instance).__mro__):
+        slots = cls.__dict__.get('__slots__', ())
+        for slot in ((slots,) if isinstance(slots, str) else slots):
+            if slot not in ('__dict__', '__weakref__') and hasattr(instance, slot):
+                attributes[slot] = getattr(instance, slot)
+    attributes.update(getattr(instance, '__dict__', {}))
+    return attributes
+
+
+def compile_bank_failure_schedule(bank_failure: Dict[int, List[Tuple[str, str]]], open_time: str, processing_window: int) -> Dict[Tuple[int, int], List[str]]:
+    """
+    Indexes scheduled bank failures by the processing window in which they take effect.
+    The returned dictionary maps (day, minutes from open_time to the start of the window) to the names of the banks that fail in that window.
+    Failures scheduled before open_time never take effect.
+    """
+    schedule = defaultdict(list)
+    if bank_failure is None:
+        return {}
+    open_minutes = time_to_minutes(open_time)
+    for day, failures in bank_failure.items():
+        for time, bank_name in failures:
+            minutes_from_open = time_to_minutes(time) - open_minutes
+            if minutes_from_open < 0:
+                continue
+            window_start = minutes_from_open - minutes_from_open % processing_window
+            schedule[(day, window_start)].append(bank_name)
+    return dict(schedule)
\ No newline at end of file
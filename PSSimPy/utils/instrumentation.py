@@ -0,0 +1,160 @@
+from __future__ import annotations
+from time import perf_counter
+from typing import TYPE_CHECKING, Dict, List
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# window statistics that describe a state rather than a flow, aggregated by their maximum rather than their sum
+SNAPSHOT_STATS = ('queue_num_txns', 'queue_txn_amount', 'num_outstanding')
+
+
+class PhaseCollector:
+    """Receives the measurements of an instrumented simulation. Custom collectors override the hooks they need."""
+
+    def begin_window(self, day: int, time: str) -> None:
+        pass
+
+    def record_phase(self, day: int, time: str, phase: str, seconds: float) -> None:
+        pass
+
+    def end_window(self, day: int, time: str, stats: Dict[str, float]) -> None:
+        pass
+
+    def end_run(self) -> None:
+        pass
+
+
+class TimingCollector(PhaseCollector):
+    """Aggregates the wall-clock time and number of calls of each phase per processing window, alongside the window statistics."""
+
+    def __init__(self):
+        self.phase_totals = {} # (day, time, phase) -> [seconds, calls]
+        self.window_stats = {} # (day, time) -> statistics of the window
+
+    def record_phase(self, day: int, time: str, phase: str, seconds: float) -> None:
+        totals = self.phase_totals.get((day, time, phase))
+        if totals is None:
+            self.phase_totals[(day, time, phase)] = [seconds, 1]
+        else:
+            totals[0] += seconds
+            totals[1] += 1
+
+    def end_window(self, day: int, time: str, stats: Dict[str, float]) -> None:
+        self.window_stats.setdefault((day, time), {}).update(stats)
+
+    def to_dataframe(self, level: str = 'window') -> pd.DataFrame:
+        """
+        Returns the phase timings per 'window' (day, time, phase), per 'day' (day, phase) or per 'phase' over the whole run.
+        Window and day level rows include the window statistics, which are summed over a day except for snapshots such as the queue length, which take the maximum.
+        """
+        if level not in ('window', 'day', 'phase'):
+            raise ValueError("level must be 'window', 'day' or 'phase'.")
+        import pandas as pd
+        phases = pd.DataFrame([(day, time, phase, seconds, calls) for (day, time, phase), (seconds, calls) in self.phase_totals.items()],
+                              columns=['day', 'time', 'phase', 'seconds', 'calls'])
+        if level == 'phase':
+            phases = phases.groupby('phase', sort=False)[['seconds', 'calls']].sum().reset_index()
+            phases['share'] = phases['seconds'] / phases['seconds'].sum()
+            return phases
+        stats = pd.DataFrame([dict(day=day, time=time, **window_stats) for (day, time), window_stats in self.window_stats.items()])
+        if stats.empty:
+            stats = pd.DataFrame(columns=['day', 'time'])
+        if level == 'window':
+            return phases.merge(stats, on=['day', 'time'], how='left')
+        phases = phases.groupby(['day', 'phase'], sort=False)[['seconds', 'calls']].sum().reset_index()
+        aggregations = {column: 'max' if column in SNAPSHOT_STATS else 'sum' for column in stats.columns if column not in ('day', 'time')}
+        aggregations['time'] = 'count'
+        day_stats = stats.groupby('day').agg(aggregations).rename(columns={'time': 'num_windows'}).reset_index()
+        return phases.merge(day_stats, on='day', how='left')
+
+    def report(self) -> dict:
+        """Summarizes the run as a dictionary of the total seconds and calls of each phase and the statistics of each day."""
+        phase_summary = self.to_dataframe('phase')
+        day_summary = self.to_dataframe('day').drop(columns=['phase', 'seconds', 'calls']).drop_duplicates('day')
+        return {
+            'total_seconds': float(phase_summary['seconds'].sum()),
+            'phases': {row.phase: {'seconds': float(row.seconds), 'calls': int(row.calls), 'share': float(row.share)} for row in phase_summary.itertuples()},
+            'days': {int(row['day']): {key: value for key, value in row.items() if key != 'day'} for row in day_summary.to_dict(orient='records')}
+        }
+
+
+class _Phase:
+    """Times a block of code and passes the measurement to the instrumentation."""
+
+    def __init__(self, instrumentation: 'Instrumentation', name: str):
+        self.instrumentation = instrumentation
+        self.name = name
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.instrumentation.record_phase(self.name, perf_counter() - self.start)
+        return False
+
+
+class _NullPhase:
+    """Stands in for a phase when instrumentation is disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NULL_PHASE = _NullPhase()
+
+
+class Instrumentation:
+    """
+    Measures the phases of a simulation run. The built-in TimingCollector is always attached and custom collectors can be added to receive the same measurements.
+    Pass an instance to the simulator's instrumentation parameter to enable it.
+    """
+
+    def __init__(self, collectors: List[PhaseCollector] = None):
+        self.timing = TimingCollector()
+        self.collectors = [self.timing] + list(collectors or [])
+        self.day = None
+        self.time = None
+        self._window_start = None
+
+    def add_collector(self, collector: PhaseCollector) -> None:
+        self.collectors.append(collector)
+
+    def phase(self, name: str) -> _Phase:
+        return _Phase(self, name)
+
+    def record_phase(self, name: str, seconds: float) -> None:
+        for collector in self.collectors:
+            collector.record_phase(self.day, self.time, name, seconds)
+
+    def begin_window(self, day: int, time: str) -> None:
+        self.day = day
+        self.time = time
+        self._window_start = perf_counter()
+        for collector in self.collectors:
+            collector.begin_window(day, time)
+
+    def end_window(self, **stats) -> None:
+        stats['window_seconds'] = perf_counter() - self._window_start
+        for collector in self.collectors:
+            collector.end_window(self.day, self.time, stats)
+
+    def end_run(self) -> None:
+        for collector in self.collectors:
+            collector.end_run()
+
+    def to_dataframe(self, level: str = 'window') -> pd.DataFrame:
+        return self.timing.to_dataframe(level)
+
+    def report(self) -> dict:
+        return self.timing.report()
+
+
+def phase(instrumentation: Instrumentation, name: str):
+    """Returns a context manager timing the named phase, which does nothing if instrumentation is None."""
+    return NULL_PHASE if instrumentation is None else instrumentation.phase(name)
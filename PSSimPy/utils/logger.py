@@ -19,4 +19,9 @@ class Logger:
             mode = 'a'
         with open(self.file_path, mode, newline='') as csvfile:
             writer = csv.writer(csvfile)
-            writer.writerows(data)
\ No newline at end of file
+            writer.writerows(data)
+
+    def clear(self):
+        """Removes the log file, so that the next write starts a new file with the headers."""
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
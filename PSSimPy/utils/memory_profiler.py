@@ -0,0 +1,137 @@
+from __future__ import annotations
+import os
+import sys
+import tracemalloc
+from collections import deque
+from typing import TYPE_CHECKING, Dict, Tuple
+from sortedcontainers import SortedList
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+CONTAINER_TYPES = (set, frozenset, list, tuple, dict, deque)
+
+
+def structure_size(structure: object) -> Tuple[int, int]:
+    """
+    Returns the bytes and the number of distinct objects reachable from a data structure.
+    Containers are followed into their items, while other objects such as transactions count their own size, and attribute dictionary if they have no slots, without following their attributes.
+    """
+    seen = set()
+    stack = [structure]
+    total_bytes = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total_bytes += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, CONTAINER_TYPES):
+            stack.extend(obj)
+        elif isinstance(obj, SortedList):
+            # follow the internal lists of the sorted list
+            stack.extend(vars(obj).values())
+        elif not isinstance(obj, type) and '__dict__' not in getattr(type(obj), '__slots__', ()) and hasattr(obj, '__dict__'):
+            # the lazily created attribute dictionary of slotted objects such as transactions is not sized, since vars() would create it
+            total_bytes += sys.getsizeof(vars(obj))
+    return total_bytes, len(seen)
+
+
+def _allocation_source(filename: str) -> str:
+    """Groups an allocation by the PSSimPy module or third-party package that made it."""
+    parts = filename.replace(os.sep, '/').split('/')
+    if 'PSSimPy' in parts:
+        module_parts = parts[len(parts) - parts[::-1].index('PSSimPy') - 1:]
+        module_parts[-1] = os.path.splitext(module_parts[-1])[0]
+        return '.'.join(module_parts)
+    for packages_dir in ('site-packages', 'dist-packages'):
+        if packages_dir in parts and parts.index(packages_dir) + 1 < len(parts):
+            return parts[parts.index(packages_dir) + 1].split('.')[0]
+    return '<other>'
+
+
+class MemoryProfiler:
+    """
+    Samples the size of the simulator's data structures at each day boundary, optionally together with the memory traced by tracemalloc grouped by the module that allocated it.
+    Pass an instance to the simulator's memory_profiler parameter to enable it. Sizes of components that share objects, such as transactions, are not additive.
+    """
+
+    def __init__(self, trace_allocations: bool = True, num_frames: int = 1):
+        self.trace_allocations = trace_allocations
+        self.num_frames = num_frames
+        self.component_samples = [] # (day, component, bytes, number of objects)
+        self.traced_samples = [] # (day, current traced bytes, peak traced bytes since the previous sample)
+        self.allocation_samples = [] # (day, source module, bytes, number of allocations)
+        self._started_tracing = False
+
+    def start(self) -> None:
+        if self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start(self.num_frames)
+            self._started_tracing = True
+
+    def stop(self) -> None:
+        # only stop tracing started by the profiler
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def sample(self, day: int, components: Dict[str, object]) -> None:
+        """Records the traced memory and the size of each component. Day 0 stands for the state before the first day."""
+        # traced memory is read before sizing the components so that the profiler's own allocations are not part of the peak
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            self.traced_samples.append((day, current, peak))
+            snapshot = tracemalloc.take_snapshot().filter_traces((tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)))
+            allocations = {}
+            for statistic in snapshot.statistics('filename'):
+                source = _allocation_source(statistic.traceback[0].filename)
+                num_bytes, count = allocations.get(source, (0, 0))
+                allocations[source] = (num_bytes + statistic.size, count + statistic.count)
+            self.allocation_samples.extend((day, source, num_bytes, count) for source, (num_bytes, count) in allocations.items())
+        for component, structure in components.items():
+            num_bytes, num_objects = structure_size(structure)
+            self.component_samples.append((day, component, num_bytes, num_objects))
+        # peaks are reported per day where the interpreter supports resetting them
+        if tracemalloc.is_tracing() and hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Returns the size of each component per day, with its growth since the previous sample."""
+        import pandas as pd
+        components = pd.DataFrame(self.component_samples, columns=['day', 'component', 'bytes', 'num_objects'])
+        components['growth'] = components.groupby('component')['bytes'].diff().fillna(0).astype(int)
+        return components
+
+    def traced_dataframe(self) -> pd.DataFrame:
+        """Returns the traced memory per day and the bytes retained by each allocating module."""
+        import pandas as pd
+        traced = pd.DataFrame(self.traced_samples, columns=['day', 'current_bytes', 'peak_bytes'])
+        allocations = pd.DataFrame(self.allocation_samples, columns=['day', 'source', 'bytes', 'num_allocations'])
+        return allocations.merge(traced, on='day', how='left')
+
+    def report(self) -> dict:
+        """Summarizes the peak, retained and per-day growth of the bytes of each component and allocating module."""
+        import pandas as pd
+
+        def summarize(samples: pd.DataFrame, key: str) -> dict:
+            summary = {}
+            for name, group in samples.groupby(key, sort=False):
+                group = group.sort_values('day')
+                num_days = group['day'].iloc[-1] - group['day'].iloc[0]
+                summary[name] = {
+                    'peak_bytes': int(group['bytes'].max()),
+                    'retained_bytes': int(group['bytes'].iloc[-1]),
+                    'growth_per_day': float((group['bytes'].iloc[-1] - group['bytes'].iloc[0]) / num_days) if num_days else 0.0
+                }
+            return summary
+
+        allocations = pd.DataFrame(self.allocation_samples, columns=['day', 'source', 'bytes', 'num_allocations'])
+        return {
+            'components': summarize(self.to_dataframe(), 'component'),
+            'allocations': summarize(allocations, 'source'),
+            'traced': {int(day): {'current_bytes': int(current), 'peak_bytes': int(peak)} for day, current, peak in self.traced_samples}
+        }
@@ -0,0 +1,61 @@
+import io
+import pickle
+from typing import Any
+
+from PSSimPy.account import Account
+from PSSimPy.transaction import Transaction
+
+# fields of a transaction besides its accounts, in the order they are stored in its record
+TRANSACTION_RECORD_FIELDS = ('amount', 'priority', 'status_code', 'day', 'time', 'arrival_day', 'arrival_time', 'submission_day', 'submission_time', 'settle_day', 'settle_time')
+ACCOUNT_RECORD_FIELDS = ('id', 'owner', 'balance', 'posted_collateral', 'txn_in_count', 'txn_in_value', 'txn_out_count', 'txn_out_value')
+
+
+class _SnapshotPickler(pickle.Pickler):
+    """Pickles transactions and accounts as compact records, leaving out the transaction history of the accounts."""
+
+    def reducer_override(self, obj):
+        if isinstance(obj, Transaction):
+            return _rebuild_transaction, (type(obj), obj.sender_account, obj.recipient_account, tuple(getattr(obj, field) for field in TRANSACTION_RECORD_FIELDS)), _extra_attributes(obj)
+        if isinstance(obj, Account):
+            return _rebuild_account, (type(obj), tuple(getattr(obj, field) for field in ACCOUNT_RECORD_FIELDS)), _extra_attributes(obj)
+        return NotImplemented
+
+
+def dumps_snapshot(obj: Any) -> bytes:
+    """
+    Pickles obj for use in another process, with the transactions and accounts it refers to reduced to records.
+    The size of the snapshot therefore depends on the transactions it holds rather than on the history of their accounts.
+    """
+    buffer = io.BytesIO()
+    _SnapshotPickler(buffer, pickle.HIGHEST_PROTOCOL).dump(obj)
+    return buffer.getvalue()
+
+
+def loads_snapshot(snapshot: bytes) -> Any:
+    """Rebuilds an object pickled by dumps_snapshot. The rebuilt transactions are not registered in Transaction._instances and the accounts have no history."""
+    return pickle.loads(snapshot)
+
+
+def _extra_attributes(obj: object) -> dict:
+    # user-defined attributes, if any
+    return getattr(obj, '__dict__', None) or None
+
+
+def _rebuild_transaction(cls: type, sender_account: Account, recipient_account: Account, fields: tuple) -> Transaction:
+    # Transaction.__new__ is bypassed so that the copy does not register itself
+    transaction = object.__new__(cls)
+    transaction.sender_account = sender_account
+    transaction.recipient_account = recipient_account
+    for field, value in zip(TRANSACTION_RECORD_FIELDS, fields):
+        setattr(transaction, field, value)
+    return transaction
+
+
+def _rebuild_account(cls: type, fields: tuple) -> Account:
+    account = object.__new__(cls)
+    for field, value in zip(ACCOUNT_RECORD_FIELDS, fields):
+        setattr(account, field, value)
+    account._txn_in = None
+    account._txn_out = None
+    account._history_windows = None
+    return account
@@ -69,4 +69,15 @@ def minutes_between(time_str1: str, time_str2: str) -> int:
     delta = time2 - time1
 
     # Return the difference in minutes
-    return int(delta.total_seconds() / 60)
\ No newline at end of file
+    return int(delta.total_seconds() / 60)
+
+
+def time_to_minutes(time_str: str) -> int:
+    """Converts a time string in "HH:MM" format into the number of minutes since midnight."""
+    hours, minutes = time_str.split(':')
+    return int(hours) * 60 + int(minutes)
+
+
+def minutes_to_time(minutes: int) -> str:
+    """Converts a number of minutes since midnight into a time string in "HH:MM" format."""
+    return f'{(minutes // 60) % 24:02d}:{minutes % 60:02d}'
\ No newline at end of file
@@ -1,4 +1,11 @@
+import inspect
+from functools import lru_cache
+from typing import List, Tuple, Union, Dict, Sequence, Callable, Iterable
+import numpy as np
+
+from PSSimPy.transaction import Transaction
 from PSSimPy.utils.constants import TRANSACTION_STATUS_CODES
+from PSSimPy.utils.time_utils import time_to_minutes
 
 def settle_transaction(transaction) -> None:
     sender_account = transaction.sender_account
@@ -8,4 +15,34 @@ def settle_transaction(transaction) -> None:
     sender_account.balance -= txn_amount
     recipient_account.balance += txn_amount
 
-    transaction.update_transaction_status('Success')
\ No newline at end of file
+    transaction.update_transaction_status('Success')
+
+def release_transaction_instances(accounts: Iterable) -> None:
+    """
+    Removes the transactions sent from the given accounts, including the pieces of split transactions, from Transaction._instances.
+    Used once the simulation that owns the accounts is no longer needed, so that its transactions, accounts and banks can be freed.
+    """
+    account_ids = {id(account) for account in accounts}
+    Transaction._instances.difference_update([transaction for transaction in Transaction._instances if id(transaction.sender_account) in account_ids])
+
+def calculate_transaction_fees(transaction_fee_handler, transactions: list, day: int, time: str, rate: Union[float, Dict[str, float]]) -> List[Tuple]:
+    """Calculates the fees of transactions settled at the same time as one batch and returns them as transaction fee log entries."""
+    if not transactions:
+        return []
+    txn_amounts = np.array([transaction.amount for transaction in transactions])
+    account_ids = [transaction.sender_account.id for transaction in transactions]
+    fees = calculate_fees(transaction_fee_handler, txn_amounts, time_to_minutes(time), rate, account_ids)
+    return [(account_id, day, time, fee) for account_id, fee in zip(account_ids, np.asarray(fees).tolist())]
+
+def calculate_fees(transaction_fee_handler, txn_amounts: np.ndarray, minutes: Union[int, np.ndarray], rate: Union[float, Dict[str, float]], account_ids: Sequence[str]) -> np.ndarray:
+    """Calls the batch fee calculation of the handler, passing account_ids only if its calculate_fees accepts them."""
+    if _accepts_account_ids(getattr(transaction_fee_handler.calculate_fees, '__func__', transaction_fee_handler.calculate_fees)):
+        return transaction_fee_handler.calculate_fees(txn_amounts, minutes, rate, account_ids=account_ids)
+    # custom handlers may override the signature without account ids
+    return transaction_fee_handler.calculate_fees(txn_amounts, minutes, rate)
+
+
+@lru_cache(maxsize=None)
+def _accepts_account_ids(calculate_fees_function: Callable) -> bool:
+    parameters = inspect.signature(calculate_fees_function).parameters.values()
+    return any(parameter.name == 'account_ids' or parameter.kind == inspect.Parameter.VAR_KEYWORD for parameter in parameters)
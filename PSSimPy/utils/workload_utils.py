@@ -0,0 +1,130 @@
+import os
+from typing import Dict, Iterator, List, Sequence, Tuple
+import numpy as np
+
+from PSSimPy.utils.time_utils import time_to_minutes, minutes_to_time
+
+
+class WorkloadGenerator:
+    """
+    Generates synthetic banks, accounts and transactions in the column layout expected by the simulators.
+
+    - Counterparties follow a scale-free network: each account's activity is proportional to rank ** -network_exponent over a random order of the accounts.
+    - Arrivals follow an intraday curve that rises towards close_time, peaking at peak_factor times the opening rate.
+    - Amounts are lognormal around amount_median with the heavy tail set by amount_sigma.
+    - The number of payments each day is Poisson around num_payments_per_day scaled by day_factors, which repeat across days (e.g. a weekly cycle).
+
+    Each day is generated from its own random stream derived from the seed, so days can be generated independently and in any order.
+    """
+
+    def __init__(self,
+                 num_banks: int,
+                 num_payments_per_day: int,
+                 num_days: int = 1,
+                 accounts_per_bank: int = 1,
+                 open_time: str = '08:00',
+                 close_time: str = '17:00',
+                 network_exponent: float = 1.0,
+                 peak_factor: float = 4.0,
+                 peak_width: int = 60, # minutes over which the arrival rate rises towards close_time
+                 amount_median: float = 100.0,
+                 amount_sigma: float = 1.5,
+                 day_factors: Sequence[float] = (1.0,),
+                 priority_range: Tuple[int, int] = (1, 1),
+                 liquidity_ratio: float = 0.2, # opening balance as a share of an account's expected daily outflow
+                 seed: int = None
+                 ):
+        if num_banks < 2:
+            raise ValueError('At least two banks are required to generate payments between banks.')
+        if priority_range[0] > priority_range[1]:
+            raise ValueError('The first value of priority_range cannot be greater than the second value.')
+        self.num_banks = num_banks
+        self.num_payments_per_day = num_payments_per_day
+        self.num_days = num_days
+        self.accounts_per_bank = accounts_per_bank
+        self.open_time = open_time
+        self.close_time = close_time
+        self.network_exponent = network_exponent
+        self.peak_factor = peak_factor
+        self.peak_width = peak_width
+        self.amount_median = amount_median
+        self.amount_sigma = amount_sigma
+        self.day_factors = list(day_factors)
+        self.priority_range = priority_range
+        self.liquidity_ratio = liquidity_ratio
+        self.seed = seed if seed is not None else np.random.SeedSequence().entropy
+
+        # the network and arrival curve are shared by all days
+        rng = np.random.default_rng([self.seed, 0])
+        num_accounts = num_banks * accounts_per_bank
+        self.account_ids = np.array([f'acc{i}' for i in range(num_accounts)])
+        self.account_banks = np.arange(num_accounts) // accounts_per_bank
+        weights = np.arange(1, num_accounts + 1, dtype=float) ** -network_exponent
+        self.account_weights = rng.permutation(weights) / weights.sum()
+        self._account_cdf = np.cumsum(self.account_weights)
+        open_minutes = time_to_minutes(open_time)
+        day_length = time_to_minutes(close_time) - open_minutes
+        self.times = np.array([minutes_to_time(open_minutes + minute) for minute in range(day_length)])
+        arrival_rate = 1 + (peak_factor - 1) * np.exp((np.arange(day_length) - (day_length - 1)) / peak_width)
+        self._time_cdf = np.cumsum(arrival_rate / arrival_rate.sum())
+
+    def banks(self) -> Dict[str, List]:
+        return {'name': [f'b{i}' for i in range(self.num_banks)]}
+
+    def accounts(self) -> Dict[str, List]:
+        # balances follow each account's share of the expected daily outflow
+        mean_amount = self.amount_median * np.exp(self.amount_sigma ** 2 / 2)
+        expected_outflow = self.account_weights * self.num_payments_per_day * mean_amount
+        return {
+            'id': self.account_ids.tolist(),
+            'owner': [f'b{bank}' for bank in self.account_banks],
+            'balance': np.round(self.liquidity_ratio * expected_outflow, 2).tolist()
+        }
+
+    def generate_day(self, day: int) -> Dict[str, np.ndarray]:
+        """Returns the transactions arriving on the given day as arrays, sorted by arrival time."""
+        rng = np.random.default_rng([self.seed, day])
+        num_payments = rng.poisson(self.num_payments_per_day * self.day_factors[(day - 1) % len(self.day_factors)])
+        senders = self._sample(rng, self._account_cdf, num_payments)
+        recipients = self._sample(rng, self._account_cdf, num_payments)
+        # redraw recipients until every payment goes to another bank
+        same_bank = np.flatnonzero(self.account_banks[senders] == self.account_banks[recipients])
+        while same_bank.size:
+            recipients[same_bank] = self._sample(rng, self._account_cdf, same_bank.size)
+            same_bank = same_bank[self.account_banks[senders[same_bank]] == self.account_banks[recipients[same_bank]]]
+        minutes = np.sort(self._sample(rng, self._time_cdf, num_payments))
+        amounts = np.maximum(np.round(rng.lognormal(np.log(self.amount_median), self.amount_sigma, num_payments), 2), 0.01)
+        return {
+            'sender_account': self.account_ids[senders],
+            'recipient_account': self.account_ids[recipients],
+            'amount': amounts,
+            'priority': rng.integers(self.priority_range[0], self.priority_range[1] + 1, num_payments),
+            'day': np.full(num_payments, day),
+            'time': self.times[minutes]
+        }
+
+    def iter_days(self) -> Iterator[Dict[str, List]]:
+        """Yields the transactions of one day at a time, so that long workloads never have to be held in memory at once."""
+        for day in range(1, self.num_days + 1):
+            yield {column: values.tolist() for column, values in self.generate_day(day).items()}
+
+    def transactions(self) -> Dict[str, List]:
+        """Returns the transactions of all days in a single dictionary."""
+        days = [self.generate_day(day) for day in range(1, self.num_days + 1)]
+        return {column: np.concatenate([transactions[column] for transactions in days]).tolist() for column in days[0]}
+
+    def to_parquet(self, directory: str) -> List[str]:
+        """Writes the transactions of each day to its own Parquet file in the directory and returns the file paths. Requires pyarrow or fastparquet."""
+        import pandas as pd
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for day in range(1, self.num_days + 1):
+            path = os.path.join(directory, f'transactions_day{day}.parquet')
+            pd.DataFrame(self.generate_day(day)).to_parquet(path, index=False)
+            paths.append(path)
+        return paths
+
+    @staticmethod
+    def _sample(rng: np.random.Generator, cdf: np.ndarray, size: int) -> np.ndarray:
+        # inverse transform sampling, which is much faster than Generator.choice with probabilities for large samples
+        return np.minimum(np.searchsorted(cdf, rng.random(size), side='right'), len(cdf) - 1)
@@ -0,0 +1,57 @@
+"""
+Measures the throughput of VectorABMEnv in environment steps per second, stepping in this process and across worker processes.
+
+Each environment generates transactions between a number of single-account banks and lets every bank follow its default strategy.
+Run from the repository root with `python -m benchmarks.bench_abm_env --num-envs 4 --num-banks 20`.
+"""
+import argparse
+import glob
+import os
+import tempfile
+import time
+
+from PSSimPy.simulator import VectorABMEnv
+
+
+def make_env_kwargs(num_envs: int, num_banks: int, include_views: bool = True) -> list:
+    banks = {'name': [f'b{i}' for i in range(num_banks)]}
+    accounts = {'id': [f'acc{i}' for i in range(num_banks)], 'owner': banks['name'], 'balance': [1000] * num_banks}
+    return [dict(name=f'bench-env{i}', banks=banks, accounts=accounts, txn_arrival_prob=0.05, txn_amount_range=(1, 100),
+                 open_time='08:00', close_time='17:00', processing_window=15, include_views=include_views) for i in range(num_envs)]
+
+
+def time_steps(vector_env: VectorABMEnv, num_steps: int) -> float:
+    vector_env.reset(seed=0)
+    start = time.perf_counter()
+    for _ in range(num_steps):
+        vector_env.step()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--num-envs', type=int, default=4)
+    parser.add_argument('--num-banks', type=int, default=20)
+    parser.add_argument('--num-steps', type=int, default=72)
+    parser.add_argument('--no-views', action='store_true', help='do not return views of outstanding transactions')
+    args = parser.parse_args()
+
+    env_kwargs = make_env_kwargs(args.num_envs, args.num_banks, not args.no_views)
+    cwd = os.getcwd()
+    # simulation logs are written to a temporary directory
+    with tempfile.TemporaryDirectory() as log_dir:
+        os.chdir(log_dir)
+        try:
+            for mode in ('sync', 'process'):
+                vector_env = VectorABMEnv(env_kwargs, mode=mode)
+                elapsed = time_steps(vector_env, args.num_steps)
+                vector_env.close()
+                print(f'{mode:>8}: {args.num_steps * args.num_envs / elapsed:10.1f} env-steps/s')
+                for path in glob.glob('bench-env*.csv'):
+                    os.remove(path)
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == '__main__':
+    main()
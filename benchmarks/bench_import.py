@@ -0,0 +1,57 @@
+"""
+Measures the time taken to import PSSimPy in a fresh interpreter and the heavy dependencies each import loads.
+
+Each statement is timed in its own `python -c` process, as a worker process or command line invocation would pay it, and the fastest of the repeats is kept.
+Run from the repository root with `python -m benchmarks.bench_import --max-ms 100` to exit with status 1 when `import PSSimPy` takes longer than that.
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+STATEMENTS = [
+    'import PSSimPy',
+    'from PSSimPy import Transaction',
+    'from PSSimPy.simulator import BasicSim',
+    'from PSSimPy.simulator import ABMSim',
+    'from PSSimPy import *'
+]
+HEAVY_MODULES = ('numpy', 'pandas', 'simpy', 'sortedcontainers')
+
+# imports the interpreter's own modules first, so that only the statement is timed
+TIMER = """
+import json, sys, time
+import typing, inspect, asyncio, concurrent.futures
+start = time.perf_counter()
+{statement}
+seconds = time.perf_counter() - start
+print(json.dumps([seconds, [module for module in {heavy_modules!r} if module in sys.modules]]))
+"""
+
+
+def time_import(statement: str, repeat: int) -> tuple:
+    """Returns the fastest import time in milliseconds and the heavy modules loaded by the statement."""
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', TIMER.format(statement=statement, heavy_modules=HEAVY_MODULES)],
+                                capture_output=True, text=True, check=True).stdout
+        runs.append(json.loads(output))
+    seconds, loaded_modules = min(runs)
+    return seconds * 1000, loaded_modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--max-ms', type=float, default=None, help='maximum milliseconds allowed for `import PSSimPy`')
+    args = parser.parse_args()
+
+    results = {statement: time_import(statement, args.repeat) for statement in STATEMENTS}
+    for statement, (milliseconds, loaded_modules) in results.items():
+        print(f"{statement:>40}: {milliseconds:8.1f} ms, loads {', '.join(loaded_modules) or 'no heavy modules'}")
+    if args.max_ms is not None and results['import PSSimPy'][0] > args.max_ms:
+        sys.exit(f"import PSSimPy took {results['import PSSimPy'][0]:.1f} ms, more than the {args.max_ms:.1f} ms allowed")
+
+
+if __name__ == '__main__':
+    main()
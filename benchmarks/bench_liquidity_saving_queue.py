@@ -0,0 +1,50 @@
+"""
+Times one dequeue cycle of LiquiditySavingQueue on a gridlocked queue.
+
+Accounts start with less liquidity than any single payment and pay each other around a ring, so no payment can settle on its own
+but most of the queue nets out. Run from the repository root with `python -m benchmarks.bench_liquidity_saving_queue --num-txns 100000`.
+"""
+import argparse
+import random
+import time
+
+from PSSimPy import Account, Bank, Transaction
+from PSSimPy.queues import FIFOQueue, LiquiditySavingQueue
+
+
+def build_gridlock(num_accounts: int, num_txns: int, seed: int):
+    rng = random.Random(seed)
+    bank = Bank('bank')
+    accounts = [Account(f'acc{i}', bank, balance=40) for i in range(num_accounts)]
+    transactions = []
+    for i in range(num_txns):
+        sender = accounts[i % num_accounts]
+        recipient = accounts[(i + 1) % num_accounts]
+        transactions.append(Transaction(sender, recipient, rng.randint(90, 110)))
+    return accounts, transactions
+
+
+def time_dequeue_cycle(queue_class, transactions) -> tuple:
+    queue = queue_class()
+    queue.bulk_enqueue(transactions)
+    start = time.perf_counter()
+    dequeued = queue.begin_dequeueing()
+    return time.perf_counter() - start, len(dequeued)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--num-accounts', type=int, default=1000)
+    parser.add_argument('--num-txns', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    _, transactions = build_gridlock(args.num_accounts, args.num_txns, args.seed)
+    for queue_class in (FIFOQueue, LiquiditySavingQueue):
+        elapsed, num_dequeued = time_dequeue_cycle(queue_class, transactions)
+        print(f'{queue_class.__name__:>22}: {elapsed:.3f}s per cycle, {num_dequeued}/{len(transactions)} transactions dequeued')
+    Transaction.clear_instances()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,225 @@
+"""
+Benchmark suite measuring the throughput, peak memory and per-phase timings of BasicSim and ABMSim on synthetic workloads.
+
+The cases scale the number of accounts and payments, vary the processing window, cover each queue class, constraint handler and scheduling engine,
+and generate ABM payments at several arrival probabilities. The 'small' tier runs in about a minute, while 'full' goes up to 10k accounts
+and 10M payments. Each case runs in a fresh process so that its peak RSS is its own. Results are saved as JSON keyed by commit in
+benchmarks/results, and can be stored as the baseline and compared against it to flag regressions.
+Run from the repository root with `python -m benchmarks.bench_suite --tier small --save-baseline`, then `python -m benchmarks.bench_suite --tier small --compare` on later commits.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import resource
+except ImportError: # not available on Windows
+    resource = None
+
+from PSSimPy.constraint_handler import PassThroughHandler, MinBalanceConstraintHandler, MaxSizeConstraintHandler
+from PSSimPy.queues import DirectQueue, FIFOQueue, PriorityQueue, BilateralOffsetQueue, LiquiditySavingQueue
+from PSSimPy.credit_facilities import SimpleCollateralized
+from PSSimPy.simulator import BasicSim, ABMSim, ENGINES
+from PSSimPy.utils import Instrumentation
+
+
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+BASELINE_PATH = RESULTS_DIR / 'baseline.json'
+QUEUES = {'DirectQueue': DirectQueue, 'FIFOQueue': FIFOQueue, 'PriorityQueue': PriorityQueue, 'BilateralOffsetQueue': BilateralOffsetQueue,
+          'LiquiditySavingQueue': LiquiditySavingQueue}
+CONSTRAINT_HANDLERS = {'PassThroughHandler': PassThroughHandler, 'MinBalanceConstraintHandler': lambda: MinBalanceConstraintHandler(0),
+                       'MaxSizeConstraintHandler': lambda: MaxSizeConstraintHandler(50)}
+# tier -> (account counts, payment counts, reference size for the component cases, ABM account count, ABM arrival probabilities)
+TIERS = {
+    'small': ([10, 100], [1000, 10000], (100, 5000), 20, [0.01, 0.05]),
+    'medium': ([10, 100, 1000], [1000, 10000, 100000], (1000, 50000), 100, [0.001, 0.01, 0.05]),
+    'large': ([10, 100, 1000, 10000], [1000, 10000, 100000, 1000000], (1000, 100000), 200, [0.001, 0.01, 0.05]),
+    'full': ([10, 100, 1000, 10000], [1000, 10000, 100000, 1000000, 10000000], (1000, 100000), 500, [0.0001, 0.001, 0.01])
+}
+
+
+def build_cases(tier: str) -> list:
+    """Returns the benchmark cases of a tier, each a dictionary of workload and component parameters."""
+    account_counts, payment_counts, (reference_accounts, reference_payments), abm_accounts, arrival_probs = TIERS[tier]
+    cases = []
+    # scaling of accounts and payments
+    for num_accounts in account_counts:
+        for num_payments in payment_counts:
+            cases.append(dict(sim='basic', num_accounts=num_accounts, num_payments=num_payments, queue='FIFOQueue', constraint_handler='PassThroughHandler', processing_window=15))
+    # each queue, constraint handler and window length at the reference size
+    for queue in QUEUES:
+        cases.append(dict(sim='basic', num_accounts=reference_accounts, num_payments=reference_payments, queue=queue, constraint_handler='PassThroughHandler', processing_window=15))
+    for constraint_handler in CONSTRAINT_HANDLERS:
+        cases.append(dict(sim='basic', num_accounts=reference_accounts, num_payments=reference_payments, queue='FIFOQueue', constraint_handler=constraint_handler, processing_window=15))
+    for processing_window in (5, 60):
+        cases.append(dict(sim='basic', num_accounts=reference_accounts, num_payments=reference_payments, queue='FIFOQueue', constraint_handler='PassThroughHandler', processing_window=processing_window))
+    # each scheduling engine with 1-minute windows, where the engine's overhead per window is largest
+    for engine in ENGINES:
+        cases.append(dict(sim='basic', num_accounts=reference_accounts, num_payments=reference_payments, queue='FIFOQueue', constraint_handler='PassThroughHandler', processing_window=1, engine=engine))
+    # ABM generation
+    for txn_arrival_prob in arrival_probs:
+        cases.append(dict(sim='abm', num_accounts=abm_accounts, txn_arrival_prob=txn_arrival_prob, queue='FIFOQueue', constraint_handler='PassThroughHandler', processing_window=15))
+    # the same case can come from several groups
+    unique_cases = {case_name(case): case for case in cases}
+    return list(unique_cases.values())
+
+
+def case_name(case: dict) -> str:
+    if case['sim'] == 'abm':
+        size = f"a{case['num_accounts']}-p{case['txn_arrival_prob']}"
+    else:
+        size = f"a{case['num_accounts']}-n{case['num_payments']}"
+    name = f"{case['sim']}-{size}-{case['queue']}-{case['constraint_handler']}-w{case['processing_window']}"
+    # cases run on the default engine keep their names from before engines could be selected
+    return name if case.get('engine', 'simpy') == 'simpy' else f"{name}-{case['engine']}"
+
+
+def make_workload(num_accounts: int, num_payments: int, open_time: str = '08:00', close_time: str = '17:00', seed: int = 0) -> tuple:
+    """Builds single-account banks and uniformly random payments between them, with each account holding about a quarter of its daily outflow."""
+    rng = np.random.default_rng(seed)
+    open_minutes = int(open_time[:2]) * 60 + int(open_time[3:])
+    day_length = int(close_time[:2]) * 60 + int(close_time[3:]) - open_minutes
+    times = np.array([f'{(open_minutes + minute) // 60:02d}:{(open_minutes + minute) % 60:02d}' for minute in range(day_length)])
+    senders = rng.integers(0, num_accounts, num_payments)
+    recipients = (senders + rng.integers(1, num_accounts, num_payments)) % num_accounts
+    amounts = rng.integers(1, 101, num_payments)
+    account_ids = np.array([f'acc{i}' for i in range(num_accounts)])
+    banks = {'name': [f'b{i}' for i in range(num_accounts)]}
+    accounts = {'id': account_ids.tolist(), 'owner': banks['name'], 'balance': [max(1, int(0.25 * 50.5 * num_payments / num_accounts))] * num_accounts}
+    transactions = {'sender_account': account_ids[senders].tolist(), 'recipient_account': account_ids[recipients].tolist(), 'amount': amounts.tolist(),
+                    'time': times[rng.integers(0, day_length, num_payments)].tolist()}
+    return banks, accounts, transactions
+
+
+def peak_rss_mb() -> float:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux and bytes on macOS
+    return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+
+
+def run_case(case: dict) -> dict:
+    """Runs a case in the current process and returns its metrics. Logs are written to a temporary directory."""
+    instrumentation = Instrumentation()
+    components = dict(queue=QUEUES[case['queue']](), constraint_handler=CONSTRAINT_HANDLERS[case['constraint_handler']](), credit_facility=SimpleCollateralized(),
+                      processing_window=case['processing_window'], instrumentation=instrumentation, engine=case.get('engine', 'simpy'))
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as log_dir:
+        os.chdir(log_dir)
+        try:
+            if case['sim'] == 'abm':
+                banks, accounts, _ = make_workload(case['num_accounts'], 0)
+                sim = ABMSim('bench', banks=banks, accounts=accounts, txn_arrival_prob=case['txn_arrival_prob'], txn_amount_range=(1, 100), seed=0, **components)
+            else:
+                banks, accounts, transactions = make_workload(case['num_accounts'], case['num_payments'])
+                sim = BasicSim('bench', banks=banks, accounts=accounts, transactions=transactions, **components)
+            start = time.perf_counter()
+            sim.run()
+            elapsed = time.perf_counter() - start
+        finally:
+            os.chdir(cwd)
+    num_payments = len(sim.transactions)
+    phases = instrumentation.to_dataframe('phase')
+    return {
+        'num_payments': num_payments,
+        'seconds': elapsed,
+        'payments_per_second': num_payments / elapsed,
+        'peak_rss_mb': peak_rss_mb(),
+        'phases': {row.phase: row.seconds for row in phases.itertuples()}
+    }
+
+
+def run_case_in_subprocess(case: dict) -> dict:
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+        return executor.submit(run_case, case).result()
+
+
+def current_commit() -> str:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return f'{commit}-dirty' if dirty else commit
+
+
+def save_results(results: dict, path: Path) -> None:
+    """Writes the results, keeping the cases of earlier runs of the same commit that were not run again."""
+    if path.exists():
+        with open(path) as f:
+            previous = json.load(f)
+        if previous.get('commit') == results['commit']:
+            results['cases'] = dict(previous['cases'], **results['cases'])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Returns a message for each case whose throughput dropped or peak RSS grew by more than the threshold fraction."""
+    regressions = []
+    for name, metrics in results['cases'].items():
+        baseline_metrics = baseline['cases'].get(name)
+        if baseline_metrics is None:
+            continue
+        throughput_change = metrics['payments_per_second'] / baseline_metrics['payments_per_second'] - 1
+        if throughput_change < -threshold:
+            regressions.append(f'{name}: payments/s {throughput_change:+.1%} ({baseline_metrics["payments_per_second"]:.0f} -> {metrics["payments_per_second"]:.0f})')
+        if metrics['peak_rss_mb'] and baseline_metrics['peak_rss_mb']:
+            memory_change = metrics['peak_rss_mb'] / baseline_metrics['peak_rss_mb'] - 1
+            if memory_change > threshold:
+                regressions.append(f'{name}: peak RSS {memory_change:+.1%} ({baseline_metrics["peak_rss_mb"]:.1f} -> {metrics["peak_rss_mb"]:.1f} MB)')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tier', choices=list(TIERS), default='small')
+    parser.add_argument('--cases', default='', help='only run cases whose name contains this text')
+    parser.add_argument('--repeat', type=int, default=1, help='number of runs per case, the fastest is kept')
+    parser.add_argument('--save-baseline', action='store_true', help='store the results as the baseline')
+    parser.add_argument('--compare', action='store_true', help='compare the results with the baseline and exit with status 1 on regressions')
+    parser.add_argument('--threshold', type=float, default=0.1, help='fraction by which a metric may get worse before it is flagged')
+    args = parser.parse_args()
+
+    commit = current_commit()
+    results = {'commit': commit, 'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'python': platform.python_version(), 'platform': platform.platform(), 'cases': {}}
+    for case in build_cases(args.tier):
+        name = case_name(case)
+        if args.cases not in name:
+            continue
+        metrics = min((run_case_in_subprocess(case) for _ in range(args.repeat)), key=lambda metrics: metrics['seconds'])
+        results['cases'][name] = dict(metrics, **case)
+        slowest_phase = max(metrics['phases'], key=metrics['phases'].get)
+        peak_rss = f"{metrics['peak_rss_mb']:8.1f} MB" if metrics['peak_rss_mb'] else '     n/a'
+        print(f"{name:>75}: {metrics['payments_per_second']:10.0f} payments/s {peak_rss}, slowest phase {slowest_phase}")
+
+    save_results(dict(results), RESULTS_DIR / f'{commit}.json')
+    if args.save_baseline:
+        save_results(dict(results), BASELINE_PATH)
+    if args.compare:
+        if not BASELINE_PATH.exists():
+            sys.exit(f'No baseline found at {BASELINE_PATH}. Run with --save-baseline first.')
+        with open(BASELINE_PATH) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        print(f"Compared with baseline {baseline['commit']}: {len(regressions)} regression(s)")
+        for regression in regressions:
+            print(f'  {regression}')
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
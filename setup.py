@@ -17,4 +17,6 @@ setup(
     long_description=long_description,
     long_description_content_type='text/markdown',  # Specify the content type
     install_requires=requirements,
+    extras_require={'parquet': ['pyarrow'], 'yaml': ['pyyaml'], 'toml': ['tomli; python_version < "3.11"']},
+    entry_points={'console_scripts': ['pssimpy=PSSimPy.cli:main']},
 )
@@ -0,0 +1,96 @@
+import os
+import asyncio
+import unittest
+
+from PSSimPy import Bank
+from PSSimPy.queues import FIFOQueue
+from PSSimPy.simulator import ABMSim
+
+
+class RemoteBank(Bank):
+    """Stand-in for a bank whose decisions come from an externally served policy. Releases payments of at most 50."""
+
+    latency = 0.05
+    # number of strategies awaiting a response, shared by all remote banks
+    in_flight = 0
+    max_in_flight = 0
+
+    async def strategy(self, txns_to_settle, all_outstanding_transactions, sim_name, day, current_time, queue):
+        RemoteBank.in_flight += 1
+        RemoteBank.max_in_flight = max(RemoteBank.max_in_flight, RemoteBank.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            RemoteBank.in_flight -= 1
+        return {transaction for transaction in txns_to_settle if transaction.amount <= 50}
+
+
+class SlowRemoteBank(RemoteBank):
+    latency = 1
+
+
+class LocalBank(Bank):
+    """Synchronous equivalent of RemoteBank."""
+
+    def strategy(self, txns_to_settle, all_outstanding_transactions, sim_name, day, current_time, queue):
+        return {transaction for transaction in txns_to_settle if transaction.amount <= 50}
+
+
+class TestABMSimAsync(unittest.TestCase):
+
+    def setUp(self):
+        self.sim_ids = ['Async', 'Sync', 'Hold', 'Release', 'Fallback', 'Invalid']
+        self.output_log_paths = [f'{id}-{log}.csv' for id in self.sim_ids
+                                 for log in ('processed_transactions', 'transaction_fees', 'queue_stats', 'account_balance', 'credit_facility')]
+        self.banks = {'name': ['b1', 'b2', 'b3', 'b4'], 'strategy_type': ['Remote', 'Remote', 'Remote', 'Normal']}
+        self.accounts = {'id': ['acc1', 'acc2', 'acc3', 'acc4'], 'owner': ['b1', 'b2', 'b3', 'b4'], 'balance': [100, 100, 100, 100]}
+        self.transactions = {
+            'sender_account': ['acc1', 'acc2', 'acc3', 'acc4', 'acc1', 'acc2'],
+            'recipient_account': ['acc2', 'acc3', 'acc4', 'acc1', 'acc3', 'acc4'],
+            'amount': [10, 60, 30, 70, 40, 80],
+            'time': ['08:00', '08:00', '08:15', '08:15', '08:30', '08:30']
+        }
+
+    def tearDown(self):
+        for path in self.output_log_paths:
+            if os.path.exists(path): os.remove(path)
+
+    def create_sim(self, name, bank_class):
+        return ABMSim(name, banks=self.banks, accounts=self.accounts, transactions=self.transactions, strategy_mapping={'Remote': bank_class},
+                      open_time='08:00', close_time='09:00', queue=FIFOQueue())
+
+    @staticmethod
+    def statuses(sim):
+        return sorted((txn.sender_account.id, txn.amount, txn.status_code) for txn, _, _ in sim.transactions)
+
+    def test_async_matches_sync(self):
+        sync_sim = self.create_sim('Sync', LocalBank)
+        sync_sim.run()
+        async_sim = self.create_sim('Async', RemoteBank)
+        RemoteBank.max_in_flight = 0
+        asyncio.run(async_sim.run_async())
+        self.assertEqual(self.statuses(async_sim), self.statuses(sync_sim))
+        # the 3 remote banks of a window await their responses at the same time
+        self.assertEqual(RemoteBank.max_in_flight, 3)
+
+    def test_timeout_fallback(self):
+        sim = self.create_sim('Hold', SlowRemoteBank)
+        asyncio.run(sim.run_async(strategy_timeout=0.01))
+        # only the synchronous bank settles its payment
+        self.assertEqual([status for sender, _, status in self.statuses(sim) if sender != 'acc4'], [0] * 5)
+        self.assertIn(('acc4', 70, 2), self.statuses(sim))
+
+        sim = self.create_sim('Release', SlowRemoteBank)
+        asyncio.run(sim.run_async(strategy_timeout=0.01, strategy_fallback='release'))
+        self.assertTrue(all(status == 2 for _, _, status in self.statuses(sim)))
+
+        sim = self.create_sim('Fallback', SlowRemoteBank)
+        fallback = lambda bank, txns_to_settle, *args: {transaction for transaction in txns_to_settle if transaction.amount < 20}
+        asyncio.run(sim.run_async(strategy_timeout=0.01, strategy_fallback=fallback))
+        self.assertIn(('acc1', 10, 2), self.statuses(sim))
+        self.assertIn(('acc1', 40, 0), self.statuses(sim))
+
+    def test_sync_run_with_async_strategy(self):
+        sim = self.create_sim('Invalid', RemoteBank)
+        with self.assertRaises(TypeError):
+            sim.run()
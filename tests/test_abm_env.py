@@ -0,0 +1,135 @@
+import os
+import glob
+import unittest
+import numpy as np
+import pandas as pd
+
+from PSSimPy.queues import FIFOQueue
+from PSSimPy.credit_facilities import SimplePriced
+from PSSimPy import Transaction
+from PSSimPy.simulator import ABMSim, ABMEnv, VectorABMEnv
+from PSSimPy.utils import Instrumentation
+
+
+class TestABMEnv(unittest.TestCase):
+
+    def setUp(self):
+        self.sim_kwargs = {
+            'name': 'Env',
+            'banks': {'name': ['b1', 'b2', 'b3']},
+            'accounts': {'id': ['acc1', 'acc2', 'acc3'], 'owner': ['b1', 'b2', 'b3'], 'balance': [100, 100, 100]},
+            'txn_arrival_prob': 0.5,
+            'txn_amount_range': (10, 80),
+            'open_time': '08:00',
+            'close_time': '09:00',
+            'num_days': 2,
+            'queue': FIFOQueue()
+        }
+
+    def tearDown(self):
+        for path in glob.glob('Env*.csv'):
+            os.remove(path)
+
+    def test_matches_run(self):
+        sim = ABMSim(seed=7, **dict(self.sim_kwargs, queue=FIFOQueue(), credit_facility=SimplePriced()))
+        sim.run()
+
+        env = ABMEnv(**self.sim_kwargs)
+        observation, info = env.reset(seed=7)
+        self.assertEqual((info['day'], info['time']), (1, '08:00'))
+        num_steps, terminated = 0, False
+        while not terminated:
+            observation, reward, terminated, truncated, info = env.step()
+            num_steps += 1
+        self.assertEqual(num_steps, 8) # 4 windows per day for 2 days
+        np.testing.assert_array_equal(observation['balances'], [account.balance for account in sim.accounts.values()])
+        with self.assertRaises(RuntimeError):
+            env.step()
+
+    def test_actions(self):
+        env = ABMEnv(reward_fn=lambda sim: -len(sim.outstanding_transactions), **self.sim_kwargs)
+        observation, info = env.reset(seed=1)
+        num_outstanding = observation['outstanding_num_txns'].copy()
+        self.assertEqual(set(info['views']), {'b1', 'b2', 'b3'})
+        # hold all payments of every bank
+        actions = {bank_name: np.zeros(len(view), dtype=bool) for bank_name, view in info['views'].items()}
+        observation, reward, _, _, info = env.step(actions)
+        self.assertTrue(np.all(observation['outstanding_num_txns'] >= num_outstanding))
+        self.assertEqual(reward, -int(num_outstanding.sum()))
+        # release all payments of every bank
+        released = [transaction for transactions in env._view_transactions.values() for transaction in transactions]
+        actions = {bank_name: np.arange(len(view)) for bank_name, view in info['views'].items()}
+        env.step(actions)
+        self.assertTrue(released)
+        self.assertTrue(all(transaction.status_code == 2 for transaction in released))
+
+    def test_without_views(self):
+        env = ABMEnv(include_views=False, **self.sim_kwargs)
+        _, info = env.reset(seed=1)
+        self.assertNotIn('views', info)
+        # actions still refer to the outstanding transactions in order of arrival
+        env.step({'b1': []})
+        self.assertEqual(env.step()[-1]['day'], 1)
+
+    def test_reset_reproducible(self):
+        env = ABMEnv(**self.sim_kwargs)
+        first, _ = env.reset(seed=3)
+        first_step = env.step()[0]
+        second, _ = env.reset(seed=3)
+        second_step = env.step()[0]
+        np.testing.assert_array_equal(first_step['outstanding_amount'], second_step['outstanding_amount'])
+        np.testing.assert_array_equal(first['balances'], second['balances'])
+
+    def test_components_copied_and_observers_shared(self):
+        instrumentation = Instrumentation()
+        env = ABMEnv(instrumentation=instrumentation, credit_facility=SimplePriced, **self.sim_kwargs)
+        env.reset(seed=2)
+        env.step()
+        # the queue given is copied for each episode, while the instrumentation records every episode
+        self.assertIsNot(env.sim.queue, self.sim_kwargs['queue'])
+        self.assertEqual(self.sim_kwargs['queue'].get_num_txns(), 0)
+        self.assertIsInstance(env.sim.credit_facility, SimplePriced)
+        self.assertIs(env.sim.instrumentation, instrumentation)
+        self.assertTrue(instrumentation.timing.window_stats)
+        first_queue = env.sim.queue
+        env.reset()
+        self.assertIsNot(env.sim.queue, first_queue)
+
+    def test_resets_release_previous_episodes(self):
+        env = ABMEnv(**self.sim_kwargs)
+        registry_sizes = []
+        for _ in range(4):
+            env.reset(seed=5)
+            terminated = False
+            while not terminated:
+                terminated = env.step()[2]
+            registry_sizes.append(len(Transaction.get_instances()))
+        # each episode's transactions are released when the next one starts, and the logs only hold the last episode
+        self.assertEqual(len(set(registry_sizes)), 1)
+        arrivals = pd.read_csv('Env-transactions_arrival.csv')
+        self.assertEqual(len(arrivals), sum(account.txn_out_count for account in env.sim.accounts.values()))
+        accounts = set(env.sim.accounts.values())
+        env.close()
+        self.assertFalse(any(transaction.sender_account in accounts for transaction in Transaction.get_instances()))
+
+    def test_vector_env(self):
+        env_kwargs = [dict(self.sim_kwargs, name=f'Env{i}') for i in range(3)]
+        results = {}
+        for mode in ('sync', 'process'):
+            vector_env = VectorABMEnv(env_kwargs, mode=mode)
+            observations, infos = vector_env.reset(seed=10)
+            self.assertEqual(observations['balances'].shape, (3, 3))
+            trajectory = []
+            for _ in range(8):
+                observations, rewards, terminated, truncated, infos = vector_env.step()
+                trajectory.append(observations['balances'])
+            vector_env.close()
+            # all environments end after 8 steps and are reset automatically
+            self.assertTrue(terminated.all())
+            self.assertIn('final_observation', infos[0])
+            results[mode] = np.stack(trajectory)
+        np.testing.assert_array_equal(results['sync'], results['process'])
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            VectorABMEnv([self.sim_kwargs], mode='gpu')
@@ -7,6 +7,7 @@ import PSSimPy
 from PSSimPy import Bank
 from PSSimPy.credit_facilities import SimplePriced, SimpleCollateralized
 from PSSimPy.queues import PriorityQueue, FIFOQueue
+from PSSimPy.constraint_handler import MaxSizeConstraintHandler
 from PSSimPy.simulator import ABMSim
 from PSSimPy.utils import is_valid_24h_time
 
@@ -114,5 +115,15 @@ class TestABMSimEOD(unittest.TestCase):
         # assert transaction status code (0 for not settled/queued, -1 for rejected, 2 for settled)
         self.assertEqual(sum([trx[0].status_code for trx in sim_carry_forward.transactions]), 7*2)
 
+    def test_split_transactions_pruned_from_exposure(self):
+        accounts = {'id': ['acc1', 'acc2', 'acc3'], 'owner': ['b1', 'b2', 'b3'], 'balance': [1000, 0, 0]}
+        transactions = {'sender_account': ['acc1'], 'recipient_account': ['acc2'], 'amount': [300], 'time': ['08:00']}
+        sim = ABMSim(self.sim_ids[0], banks=self.banks, accounts=accounts, transactions=transactions, open_time='08:00', close_time='09:00', num_days=2,
+                     constraint_handler=MaxSizeConstraintHandler(max_txn_size=100), bank_failure={2: [('08:30', 'b3')]})
+        sim.run()
+        # the split payment and its settled pieces are no longer pending
+        self.assertEqual(sim.accounts['acc2'].balance, 300)
+        self.assertEqual(dict(sim.exposure_by_bank), {})
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
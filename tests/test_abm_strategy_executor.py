@@ -0,0 +1,86 @@
+import os
+import unittest
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from PSSimPy import Bank, Account, Transaction
+from PSSimPy.queues import FIFOQueue
+from PSSimPy.credit_facilities import SimplePriced
+from PSSimPy.simulator import ABMSim
+from PSSimPy.utils import dumps_snapshot, loads_snapshot
+
+
+def count_transaction_instances():
+    return len(Transaction.get_instances())
+
+
+class PettyBank(Bank):
+    """This class of banks will not settle transactions to another bank's account if the counter party has an outstanding transaction to this bank that is not yet settled."""
+
+    def __init__(self, name, strategy_type='Petty', **kwargs):
+        super().__init__(name, strategy_type, **kwargs)
+
+    def strategy(self, txns_to_settle: set, all_outstanding_transactions: set, sim_name: str, day: int, current_time: str, queue) -> set:
+        counterparties_with_outstanding = {transaction.sender_account.owner.name for transaction in all_outstanding_transactions if transaction.recipient_account.owner.name == self.name}
+        return {transaction for transaction in txns_to_settle if transaction.recipient_account.owner.name not in counterparties_with_outstanding}
+
+
+class TestABMStrategyExecutor(unittest.TestCase):
+
+    def setUp(self):
+        self.sim_ids = ['Sequential', 'Thread', 'Process', 'Executor', 'ProcessExecutor']
+        self.output_log_paths = [f'{id}-{log}.csv' for id in self.sim_ids
+                                 for log in ('processed_transactions', 'transaction_fees', 'queue_stats', 'account_balance', 'credit_facility')]
+        self.banks = {'name': ['b1', 'b2', 'b3', 'b4'], 'strategy_type': ['Petty', 'Petty', 'Normal', 'Petty']}
+        self.accounts = {'id': ['acc1', 'acc2', 'acc3', 'acc4'], 'owner': ['b1', 'b2', 'b3', 'b4'], 'balance': [100, 100, 100, 100]}
+        self.transactions = {
+            'sender_account': ['acc1', 'acc2', 'acc3', 'acc4', 'acc2', 'acc1', 'acc3', 'acc4'],
+            'recipient_account': ['acc2', 'acc3', 'acc4', 'acc1', 'acc1', 'acc3', 'acc2', 'acc2'],
+            'amount': [10, 20, 30, 40, 50, 60, 70, 80],
+            'time': ['08:00', '08:00', '08:15', '08:15', '08:30', '08:30', '08:45', '08:45']
+        }
+
+    def tearDown(self):
+        for path in self.output_log_paths:
+            if os.path.exists(path): os.remove(path)
+
+    def run_sim(self, name, **kwargs):
+        sim = ABMSim(name, banks=self.banks, accounts=self.accounts, transactions=self.transactions, strategy_mapping={'Petty': PettyBank},
+                     open_time='08:00', close_time='09:30', queue=FIFOQueue(), credit_facility=SimplePriced(), **kwargs)
+        sim.run()
+        statuses = sorted((txn.sender_account.id, txn.amount, txn.status_code, txn.settle_time) for txn, _, _ in sim.transactions)
+        balances = {account_id: account.balance for account_id, account in sim.accounts.items()}
+        return statuses, balances
+
+    def test_concurrent_results_match_sequential(self):
+        expected = self.run_sim('Sequential')
+        self.assertEqual(self.run_sim('Thread', strategy_executor='thread', max_workers=2), expected)
+        self.assertEqual(self.run_sim('Process', strategy_executor='process', max_workers=2), expected)
+        with ThreadPoolExecutor() as executor:
+            self.assertEqual(self.run_sim('Executor', strategy_executor=executor), expected)
+
+    def test_process_workers_release_transactions(self):
+        expected = self.run_sim('Sequential')
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            self.assertEqual(self.run_sim('ProcessExecutor', strategy_executor=executor), expected)
+            num_worker_instances = executor.submit(count_transaction_instances).result()
+            self.assertEqual(self.run_sim('ProcessExecutor', strategy_executor=executor), expected)
+            # the copies of the transactions sent to the worker are not registered there
+            self.assertEqual(executor.submit(count_transaction_instances).result(), num_worker_instances)
+
+    def test_snapshot_leaves_out_account_history(self):
+        sender, recipient = Account('acc1', Bank('b1'), 100), Account('acc2', Bank('b2'), 100)
+        transaction = Transaction(sender, recipient, 10, time='08:00', reference='abc')
+        size = len(dumps_snapshot([transaction]))
+        sender.txn_out.update(Transaction(sender, recipient, amount) for amount in range(1000))
+        self.assertEqual(len(dumps_snapshot([transaction])), size)
+        num_instances = len(Transaction.get_instances())
+        copy, = loads_snapshot(dumps_snapshot([transaction]))
+        self.assertEqual(len(Transaction.get_instances()), num_instances)
+        self.assertEqual((copy.sender_account.id, copy.recipient_account.owner.name, copy.amount, copy.arrival_time, copy.reference), ('acc1', 'b2', 10, '08:00', 'abc'))
+        self.assertEqual(copy.sender_account.txn_out, set())
+        for txn in sender.txn_out | {transaction}:
+            Transaction._instances.discard(txn)
+
+    def test_invalid_executor(self):
+        with self.assertRaises(ValueError):
+            ABMSim('Invalid', banks=self.banks, accounts=self.accounts, transactions=self.transactions, strategy_executor='gpu')
@@ -0,0 +1,82 @@
+import os
+import glob
+import unittest
+
+from PSSimPy import Account, Transaction
+from PSSimPy.queues import FIFOQueue
+from PSSimPy.credit_facilities import SimplePriced
+from PSSimPy.simulator import BasicSim, ABMSim
+from PSSimPy.utils import load_account_with_transactions, load_accounts_with_transactions
+
+
+class TestAccountHistory(unittest.TestCase):
+
+    def setUp(self):
+        self.banks = {'name': ['b1', 'b2', 'b3']}
+        self.accounts = {'id': ['acc1', 'acc2', 'acc3'], 'owner': ['b1', 'b2', 'b3'], 'balance': [100, 100, 100]}
+        self.transactions = {
+            'sender_account': ['acc1', 'acc2', 'acc3', 'acc1', 'acc2', 'acc3'],
+            'recipient_account': ['acc2', 'acc3', 'acc1', 'acc3', 'acc1', 'acc2'],
+            'amount': [10, 20, 30, 40, 50, 60],
+            'day': [1, 1, 1, 2, 2, 2],
+            'time': ['08:00', '08:15', '08:30', '08:00', '08:15', '08:45']
+        }
+
+    def tearDown(self):
+        for path in glob.glob('History*.csv'):
+            os.remove(path)
+
+    def run_sim(self, account_history):
+        sim = BasicSim(f'History-{account_history}', banks=self.banks, accounts=self.accounts, transactions=self.transactions, open_time='08:00', close_time='09:00',
+                       num_days=2, queue=FIFOQueue(), credit_facility=SimplePriced(), account_history=account_history)
+        sim.run()
+        return sim
+
+    def test_all(self):
+        sim = self.run_sim('all')
+        self.assertEqual({transaction.amount for transaction in sim.accounts['acc1'].txn_out}, {10, 40})
+        self.assertEqual({transaction.amount for transaction in sim.accounts['acc1'].txn_in}, {30, 50})
+
+    def test_counters(self):
+        sim = self.run_sim('counters')
+        account = sim.accounts['acc1']
+        self.assertIsNone(account._txn_in)
+        self.assertIsNone(account._txn_out)
+        self.assertEqual((account.txn_out_count, account.txn_out_value, account.txn_in_count, account.txn_in_value), (2, 50, 2, 80))
+
+    def test_day(self):
+        sim = self.run_sim('day')
+        # the history is dropped at each end of day while the totals are kept
+        self.assertEqual(sim.accounts['acc1'].txn_out, set())
+        self.assertEqual(sim.accounts['acc1'].txn_in_value, 80)
+
+    def test_rolling_windows(self):
+        sim = self.run_sim(2)
+        # the last two windows of day 2 are 08:30 and 08:45
+        self.assertEqual({transaction.amount for transaction in sim.accounts['acc3'].txn_out}, {60})
+        self.assertEqual(sim.accounts['acc1'].txn_in, set())
+        self.assertEqual(sim.accounts['acc3'].txn_out_count, 2)
+
+    def test_abm_sim(self):
+        sim = ABMSim('History-abm', banks=self.banks, accounts=self.accounts, txn_arrival_prob=0.5, txn_amount_range=(10, 80), open_time='08:00', close_time='09:00',
+                     queue=FIFOQueue(), credit_facility=SimplePriced(), seed=1, account_history='counters')
+        sim.run()
+        self.assertEqual(sum(account.txn_out_count for account in sim.accounts.values()), len(sim.transactions))
+
+    def test_single_pass_loading_matches(self):
+        accounts = [Account(f'acc{i}', None) for i in range(3)]
+        other_accounts = [Account(f'acc{i}', None) for i in range(3)]
+        transactions = {Transaction(accounts[i], accounts[(i + 1) % 3], i) for i in range(3)} | {Transaction(accounts[0], accounts[0], 5)}
+        load_accounts_with_transactions(accounts, transactions)
+        for account, other_account in zip(accounts, other_accounts):
+            load_account_with_transactions(other_account, transactions)
+        for account in accounts:
+            self.assertEqual((account.txn_in_count, account.txn_out_count), (len(account.txn_in), len(account.txn_out)))
+        self.assertEqual([(len(account.txn_in), len(account.txn_out)) for account in accounts], [(len(account.txn_in), len(account.txn_out)) for account in other_accounts])
+        for transaction in transactions:
+            Transaction._instances.discard(transaction)
+
+    def test_invalid_policy(self):
+        for account_history in ('week', 0, True):
+            with self.assertRaises(ValueError):
+                self.run_sim(account_history)
@@ -0,0 +1,93 @@
+import os
+import unittest
+import numpy as np
+
+from PSSimPy import Bank, Account, Transaction, ArrayStrategyBank, StrategyView
+from PSSimPy.credit_facilities import SimplePriced
+from PSSimPy.queues import FIFOQueue
+from PSSimPy.simulator import ABMSim
+
+
+class SmallPaymentsBank(ArrayStrategyBank):
+    """Only releases payments of at most 50, returning a boolean mask."""
+
+    def array_strategy(self, view, sim_name, day, current_time):
+        return view.amounts <= 50
+
+
+class SmallPaymentsIndexBank(ArrayStrategyBank):
+    """Only releases payments of at most 50, returning an index array."""
+
+    def array_strategy(self, view, sim_name, day, current_time):
+        return np.flatnonzero(view.amounts <= 50)
+
+
+class SmallPaymentsSetBank(Bank):
+    """Set-based equivalent of SmallPaymentsBank."""
+
+    def strategy(self, txns_to_settle, all_outstanding_transactions, sim_name, day, current_time, queue):
+        return {transaction for transaction in txns_to_settle if transaction.amount <= 50}
+
+
+class TestStrategyView(unittest.TestCase):
+
+    def test_view_arrays(self):
+        b1, b2 = Bank('b1'), Bank('b2')
+        acc1, acc2 = Account('acc1', b1, 100), Account('acc2', b2, 100)
+        transactions = [Transaction(acc1, acc2, 10, 2, day=1, time='08:00'), Transaction(acc1, acc2, 20, 1, day=2, time='08:30')]
+        credit_facility = SimplePriced()
+        credit_facility.lend_credit(acc1, 30)
+        view = StrategyView(transactions, [acc1], 2, '09:00', credit_facility)
+        np.testing.assert_array_equal(view.amounts, [10, 20])
+        np.testing.assert_array_equal(view.counterparties, ['b2', 'b2'])
+        np.testing.assert_array_equal(view.priorities, [2, 1])
+        np.testing.assert_array_equal(view.arrival_minutes, [480, 510])
+        np.testing.assert_array_equal(view.ages, [1440 + 60, 30])
+        np.testing.assert_array_equal(view.balances, [130]) # lent credit is added to the balance
+        np.testing.assert_array_equal(view.credit, [30])
+
+    def test_selected_positions(self):
+        b1 = Bank('b1')
+        acc1 = Account('acc1', b1, 100)
+        view = StrategyView([Transaction(acc1, acc1, amount) for amount in (1, 2, 3)], [acc1], 1, '08:00')
+        np.testing.assert_array_equal(view.selected_positions(np.array([True, False, True])), [0, 2])
+        np.testing.assert_array_equal(view.selected_positions([2, 0, 2]), [0, 2])
+        np.testing.assert_array_equal(view.selected_positions([]), [])
+        for selection in (np.array([True, False]), [-1], [0, 3]):
+            with self.assertRaises(ValueError):
+                view.selected_positions(selection)
+
+
+class TestABMSimArrayStrategy(unittest.TestCase):
+
+    def setUp(self):
+        self.sim_ids = ['Array Mask', 'Array Index', 'Array Set', 'Array Process']
+        self.output_log_paths = [f'{id}-{log}.csv' for id in self.sim_ids
+                                 for log in ('processed_transactions', 'transaction_fees', 'queue_stats', 'account_balance', 'credit_facility')]
+        self.banks = {'name': ['b1', 'b2', 'b3'], 'strategy_type': ['Small', 'Small', 'Normal']}
+        self.accounts = {'id': ['acc1', 'acc2', 'acc3'], 'owner': ['b1', 'b2', 'b3'], 'balance': [100, 100, 100]}
+        self.transactions = {
+            'sender_account': ['acc1', 'acc2', 'acc3', 'acc1', 'acc2', 'acc3'],
+            'recipient_account': ['acc2', 'acc3', 'acc1', 'acc3', 'acc1', 'acc2'],
+            'amount': [10, 60, 30, 70, 40, 50],
+            'time': ['08:00', '08:00', '08:15', '08:15', '08:30', '08:30']
+        }
+
+    def tearDown(self):
+        for path in self.output_log_paths:
+            if os.path.exists(path): os.remove(path)
+
+    def run_sim(self, name, bank_class, **kwargs):
+        sim = ABMSim(name, banks=self.banks, accounts=self.accounts, transactions=self.transactions, strategy_mapping={'Small': bank_class},
+                     open_time='08:00', close_time='09:00', queue=FIFOQueue(), **kwargs)
+        sim.run()
+        return sorted((txn.sender_account.id, txn.amount, txn.status_code) for txn, _, _ in sim.transactions)
+
+    def test_array_strategy_matches_set_strategy(self):
+        expected = self.run_sim('Array Set', SmallPaymentsSetBank)
+        self.assertEqual(self.run_sim('Array Mask', SmallPaymentsBank), expected)
+        self.assertEqual(self.run_sim('Array Index', SmallPaymentsIndexBank), expected)
+        self.assertEqual(self.run_sim('Array Process', SmallPaymentsBank, strategy_executor='process', max_workers=2), expected)
+        # payments above 50 from array strategy banks are held back
+        self.assertIn(('acc1', 70, 0), expected)
+        self.assertIn(('acc3', 50, 2), expected)
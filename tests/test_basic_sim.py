@@ -6,6 +6,7 @@ import pandas as pd
 import PSSimPy
 from PSSimPy.credit_facilities import SimplePriced, SimpleCollateralized
 from PSSimPy.queues import PriorityQueue, FIFOQueue
+from PSSimPy.constraint_handler import MaxSizeConstraintHandler
 from PSSimPy.simulator import BasicSim
 from PSSimPy.utils import is_valid_24h_time
 
@@ -121,6 +122,39 @@ class TestBasicSimMultipleDays(unittest.TestCase):
         self.assertEqual(sum([trx[0].status_code for trx in self.sim_setting_2.transactions]), 18)
 
 
+    def test_run_bank_failure(self):
+        # b2 fails on day 1 after its incoming and outgoing transactions have been queued
+        params = self.setup_params(FIFOQueue(), SimpleCollateralized())
+        params['bank_failure'] = {1: [('09:10', 'b2')]}
+        self.sim_base = BasicSim(self.sim_ids[0], **params)
+        self.assertEqual(self.sim_base.bank_failure_schedule, {(1, 60): ['b2']})
+
+        self.sim_base.run()
+
+        # queued transactions involving b2 are removed from the queue, later ones fail on arrival
+        self.assertTrue(self.sim_base.banks['b2'].is_failed)
+        self.assertEqual(len(self.sim_base.queue.queue), 3)
+        self.assertTrue(all(txn.sender_account.id == 'acc3' for txn, _ in self.sim_base.queue.queue))
+        self.assertEqual(sum([trx[0].status_code for trx in self.sim_base.transactions]), -6)
+        # only the still queued transactions remain indexed
+        self.assertNotIn('b2', self.sim_base.exposure_by_bank)
+        self.assertEqual(len(self.sim_base.exposure_by_bank['b3']), 3)
+
+    def test_run_bank_failure_with_split_transactions(self):
+        # b2's payment is split into pieces that stay queued until b2 fails
+        params = self.setup_params(FIFOQueue(), SimpleCollateralized())
+        params.update(num_days=1, constraint_handler=MaxSizeConstraintHandler(max_txn_size=100), bank_failure={1: [('08:30', 'b2')]},
+                      accounts={'id': ['acc1', 'acc2', 'acc3'], 'owner': ['b1', 'b2', 'b3'], 'balance': [1000, 0, 0]},
+                      transactions={'sender_account': ['acc2', 'acc1'], 'recipient_account': ['acc3', 'acc3'], 'amount': [300, 50], 'time': ['08:00', '08:00']})
+        self.sim_base = BasicSim(self.sim_ids[0], **params)
+        self.sim_base.run()
+        self.assertEqual(self.sim_base.queue.get_num_txns(), 0)
+        self.assertEqual(self.sim_base.accounts['acc3'].balance, 50)
+        processed = pd.read_csv(f'{self.sim_ids[0]}-processed_transactions.csv')
+        self.assertEqual(sorted(processed.loc[processed['status'] == 'Failed', 'amount']), [100, 100, 100])
+        # the split payment is not kept in the index once the end of day has pruned it
+        self.assertEqual(dict(self.sim_base.exposure_by_bank), {})
+
 
 class TestBasicSim(unittest.TestCase):
     def setUp(self) -> None:
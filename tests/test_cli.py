@@ -0,0 +1,108 @@
+import os
+import json
+import tempfile
+import unittest
+import pandas as pd
+
+from PSSimPy import Transaction
+from PSSimPy.cli import main, load_spec, expand_jobs, run_jobs, DONE_MARKER, ERROR_FILE
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+
+class TestCLI(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = self.directory.name
+        pd.DataFrame({'name': ['b1', 'b2', 'b3']}).to_csv(os.path.join(self.path, 'banks.csv'), index=False)
+        pd.DataFrame({'id': ['acc1', 'acc2', 'acc3'], 'owner': ['b1', 'b2', 'b3'], 'balance': [100, 100, 100]}).to_csv(os.path.join(self.path, 'accounts.csv'), index=False)
+        with open(os.path.join(self.path, 'transactions.json'), 'w') as f:
+            json.dump({'sender_account': ['acc1', 'acc2', 'acc3'], 'recipient_account': ['acc2', 'acc3', 'acc1'], 'amount': [150, 20, 30],
+                       'time': ['08:00', '08:05', '08:20']}, f)
+        self.spec = {
+            'output_dir': 'out',
+            'defaults': {'banks': 'banks.csv', 'accounts': 'accounts.csv', 'open_time': '08:00', 'close_time': '09:00', 'queue': 'FIFOQueue'},
+            'jobs': [
+                {'name': 'basic', 'transactions': 'transactions.json', 'constraint_handler': {'class': 'MinBalanceConstraintHandler', 'params': {'min_balance': 10}},
+                 'credit_facility': 'SimpleCollateralized'},
+                {'name': 'abm', 'simulator': 'abm', 'txn_arrival_prob': 0.5, 'txn_amount_range': [10, 80], 'num_days': 2, 'seeds': [1, 2]},
+                {'name': 'synthetic', 'workload': {'num_banks': 3, 'num_payments_per_day': 20, 'num_days': 2, 'open_time': '08:00', 'close_time': '09:00'},
+                 'seed': 0, 'release_finished_transactions': True}
+            ]
+        }
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_spec(self, spec, file_name='spec.json'):
+        spec_path = os.path.join(self.path, file_name)
+        with open(spec_path, 'w') as f:
+            if file_name.endswith('.json'):
+                json.dump(spec, f)
+            else:
+                yaml.safe_dump(spec, f)
+        return spec_path
+
+    def test_runs_and_resumes(self):
+        spec_path = self.write_spec(self.spec)
+        held_transaction = Transaction('acc1', 'acc2', 10)
+        registered_before = set(Transaction.get_instances())
+        self.assertEqual(main([spec_path]), 0)
+        # the jobs' transactions are released, while those held by the caller stay registered
+        self.assertEqual(Transaction.get_instances(), registered_before)
+        Transaction._instances.discard(held_transaction)
+        output_dir = os.path.join(self.path, 'out')
+        self.assertEqual(sorted(os.listdir(output_dir)), ['abm-seed1', 'abm-seed2', 'basic', 'synthetic'])
+        for job_name in os.listdir(output_dir):
+            self.assertTrue(os.path.exists(os.path.join(output_dir, job_name, DONE_MARKER)))
+        processed = pd.read_csv(os.path.join(output_dir, 'basic', 'basic-processed_transactions.csv'))
+        # without credit the first payment cannot settle above the minimum balance
+        self.assertEqual(sorted(processed.loc[processed['status'] == 'Success', 'amount']), [20, 30])
+        seed1 = pd.read_csv(os.path.join(output_dir, 'abm-seed1', 'abm-seed1-transactions_arrival.csv'))
+        seed2 = pd.read_csv(os.path.join(output_dir, 'abm-seed2', 'abm-seed2-transactions_arrival.csv'))
+        self.assertNotEqual(seed1['amount'].tolist(), seed2['amount'].tolist())
+
+        # finished jobs are skipped unless their spec changed
+        jobs = expand_jobs(load_spec(spec_path), self.path)
+        self.assertEqual(sorted(run_jobs(jobs, output_dir, report=lambda message: None)['skipped']), ['abm-seed1', 'abm-seed2', 'basic', 'synthetic'])
+        jobs[0]['num_days'] = 2
+        outcomes = run_jobs(jobs, output_dir, report=lambda message: None)
+        self.assertEqual((outcomes['done'], len(outcomes['skipped'])), (['basic'], 3))
+        self.assertEqual(len(run_jobs(jobs, output_dir, force=True, report=lambda message: None)['done']), 4)
+
+    def test_failed_job_does_not_stop_others(self):
+        self.spec['jobs'][0]['queue'] = 'NotAQueue'
+        messages = []
+        jobs = expand_jobs(self.spec, self.path)
+        output_dir = os.path.join(self.path, 'out')
+        outcomes = run_jobs(jobs, output_dir, workers=2, report=messages.append)
+        self.assertEqual(outcomes['failed'], ['basic'])
+        self.assertEqual(len(outcomes['done']), 3)
+        self.assertTrue(any('basic failed: AttributeError' in message for message in messages))
+        self.assertTrue(os.path.exists(os.path.join(output_dir, 'basic', ERROR_FILE)))
+        self.assertFalse(os.path.exists(os.path.join(output_dir, 'basic', DONE_MARKER)))
+        self.assertEqual(main([self.write_spec(self.spec), '--only', 'basic']), 1)
+
+    def test_invalid_specs(self):
+        with self.assertRaises(ValueError):
+            expand_jobs({'jobs': [{'name': 'a'}, {'name': 'a'}]}, self.path)
+        with self.assertRaises(ValueError):
+            expand_jobs({'jobs': [{'name': 'a', 'simulator': 'agent'}]}, self.path)
+        for name in ('', '.', '..', '../other', 'a/b', 1):
+            with self.assertRaises(ValueError):
+                expand_jobs({'jobs': [{'name': name}]}, self.path)
+        with self.assertRaises(ValueError):
+            load_spec(os.path.join(self.path, 'spec.ini'))
+        outcomes = run_jobs(expand_jobs({'jobs': [dict(self.spec['jobs'][0], seed=1, **self.spec['defaults'])]}, self.path), os.path.join(self.path, 'out'),
+                            report=lambda message: None)
+        self.assertEqual(outcomes['failed'], ['basic'])
+
+    @unittest.skipIf(yaml is None, 'PyYAML is not installed')
+    def test_yaml_spec(self):
+        self.spec['jobs'] = self.spec['jobs'][1:2]
+        self.assertEqual(main([self.write_spec(self.spec, 'spec.yaml'), '--output-dir', os.path.join(self.path, 'yaml_out')]), 0)
+        self.assertEqual(sorted(os.listdir(os.path.join(self.path, 'yaml_out'))), ['abm-seed1', 'abm-seed2'])
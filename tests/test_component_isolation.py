@@ -0,0 +1,69 @@
+import os
+import gc
+import glob
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from PSSimPy.queues import DirectQueue, FIFOQueue
+from PSSimPy.credit_facilities import SimplePriced, SimpleCollateralized
+from PSSimPy.constraint_handler import MinBalanceConstraintHandler
+from PSSimPy.simulator import BasicSim, ABMSim
+
+
+class TestComponentIsolation(unittest.TestCase):
+
+    def setUp(self):
+        self.banks = {'name': ['b1', 'b2', 'b3']}
+        self.accounts = {'id': ['acc1', 'acc2', 'acc3'], 'owner': ['b1', 'b2', 'b3'], 'balance': [100, 100, 100]}
+        self.transactions = {
+            'sender_account': ['acc1', 'acc2', 'acc3', 'acc1', 'acc2', 'acc3'],
+            'recipient_account': ['acc2', 'acc3', 'acc1', 'acc3', 'acc1', 'acc2'],
+            'amount': [150, 20, 30, 80, 200, 60],
+            'time': ['08:00', '08:05', '08:20', '08:30', '08:40', '08:45']
+        }
+
+    def tearDown(self):
+        for path in glob.glob('Isolation*.csv'):
+            os.remove(path)
+
+    def make_sim(self, name, **kwargs):
+        return BasicSim(name, banks=self.banks, accounts=self.accounts, transactions=self.transactions, open_time='08:00', close_time='09:00', **kwargs)
+
+    def test_defaults_are_created_per_simulator(self):
+        sim, other_sim = self.make_sim('Isolation1'), self.make_sim('Isolation2')
+        for component in ('constraint_handler', 'queue', 'credit_facility', 'transaction_fee_handler'):
+            self.assertIsNot(getattr(sim, component), getattr(other_sim, component), component)
+        self.assertIsInstance(sim.queue, DirectQueue)
+        self.assertIsInstance(sim.credit_facility, SimplePriced)
+        sim.run()
+        self.assertTrue(sim.credit_facility.history)
+        self.assertFalse(other_sim.credit_facility.history)
+
+    def test_classes_and_factories(self):
+        sim = self.make_sim('Isolation1', queue=FIFOQueue, constraint_handler=lambda: MinBalanceConstraintHandler(50))
+        self.assertIsInstance(sim.queue, FIFOQueue)
+        self.assertIsInstance(sim.constraint_handler, MinBalanceConstraintHandler)
+        self.assertIs(sim.system.queue, sim.queue)
+
+    def test_shared_component_is_rejected(self):
+        queue = FIFOQueue()
+        sim = self.make_sim('Isolation1', queue=queue)
+        with self.assertRaises(ValueError):
+            self.make_sim('Isolation2', queue=queue)
+        with self.assertRaises(ValueError):
+            ABMSim('Isolation3', banks=self.banks, accounts=self.accounts, txn_arrival_prob=0.5, txn_amount_range=(10, 80), queue=queue)
+        # the component can be used again once its simulator no longer exists
+        del sim
+        gc.collect()
+        self.assertIs(self.make_sim('Isolation2', queue=queue).queue, queue)
+
+    def test_concurrent_runs_match_sequential_runs(self):
+        def run(name):
+            sim = self.make_sim(name, queue=FIFOQueue, credit_facility=SimpleCollateralized, constraint_handler=lambda: MinBalanceConstraintHandler(0))
+            sim.run()
+            return sorted((transaction.sender_account.id, transaction.amount, transaction.status_code, transaction.settle_time) for transaction, _, _ in sim.transactions)
+        sequential_result = run('Isolation-sequential')
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            concurrent_results = list(executor.map(run, [f'Isolation-thread{i}' for i in range(8)]))
+        for result in concurrent_results:
+            self.assertEqual(result, sequential_result)
@@ -1,11 +1,21 @@
 import unittest
 
-from PSSimPy.constraint_handler import MaxSizeConstraintHandler, MinBalanceConstraintHandler, PassThroughHandler
+from PSSimPy.constraint_handler import AbstractConstraintHandler, MaxSizeConstraintHandler, MinBalanceConstraintHandler, PassThroughHandler
 from PSSimPy import Transaction
 from PSSimPy import Account
 from PSSimPy.utils import TRANSACTION_STATUS_CODES
 
 
+class OddAmountHandler(AbstractConstraintHandler):
+    """Fails transactions with odd amounts. Relies on the default batch implementation."""
+
+    def process_transaction(self, transaction: Transaction):
+        if transaction.amount % 2 == 0:
+            self.passed_transactions.append(transaction)
+        else:
+            transaction.update_transaction_status('Failed')
+
+
 class TestConstraintHandler(unittest.TestCase):
 
     def setUp(self) -> None:
@@ -52,10 +62,47 @@ class TestConstraintHandler(unittest.TestCase):
         self.assertEqual(self.max_size_constraint_handler.passed_transactions[2].amount, 100)
         self.assertEqual(self.max_size_constraint_handler.passed_transactions[4].amount, 5)
 
+    def test_process_transaction_split_large(self):
+        large_txn = Transaction(self.acc1, self.acc2, 10000000000)
+        handler = MaxSizeConstraintHandler(max_txn_size=1000000)
+        handler.process_transaction(large_txn)
+        passed_transactions = handler.get_passed_transactions()
+        self.assertEqual(len(passed_transactions), 10000)
+        self.assertTrue(all(txn.parent_transaction is large_txn for txn in passed_transactions))
+        self.assertEqual(sum(txn.amount for txn in passed_transactions), 10000000000)
+
+    def test_process_transaction_too_many_splits(self):
+        handler = MaxSizeConstraintHandler(max_txn_size=0.000001, max_num_splits=1000)
+        results = handler.process_batch([self.txn1])
+        self.assertEqual(results['Passed'], [])
+        self.assertEqual(results['Failed'], [self.txn1])
+        self.assertEqual(self.txn1.status_code, TRANSACTION_STATUS_CODES['Failed'])
+
     def test_process_transaction_fail(self):
         self.min_balance_constraint_handler.process_transaction(self.txn5)
         self.assertEqual(len(self.min_balance_constraint_handler.passed_transactions), 0)
         self.assertEqual(self.txn5.status_code, TRANSACTION_STATUS_CODES['Failed'])
 
+    def test_process_batch(self):
+        txns = [self.txn1, self.txn2, self.txn3, self.txn4, self.txn5]
+        results = self.pass_through_handler.process_batch(txns)
+        self.assertEqual(results['Passed'], txns)
+        self.assertEqual(results['Failed'], [])
+
+        results = self.min_balance_constraint_handler.process_batch(txns)
+        self.assertEqual(results['Passed'], [self.txn1, self.txn2, self.txn3, self.txn4])
+        self.assertEqual(results['Failed'], [self.txn5])
+        self.assertEqual(self.txn5.status_code, TRANSACTION_STATUS_CODES['Failed'])
+
+        results = self.max_size_constraint_handler.process_batch([self.txn1, self.txn3])
+        self.assertEqual([txn.amount for txn in results['Passed']], [100, 100, 100, 5])
+        self.assertEqual(len(self.max_size_constraint_handler.get_passed_transactions()), 4)
+
+    def test_process_batch_fallback(self):
+        handler = OddAmountHandler()
+        results = handler.process_batch([self.txn1, self.txn3, self.txn5])
+        self.assertEqual(results['Passed'], [self.txn1])
+        self.assertEqual(results['Failed'], [self.txn3, self.txn5])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
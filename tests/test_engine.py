@@ -0,0 +1,94 @@
+import os
+import glob
+import asyncio
+import unittest
+import pandas as pd
+import simpy
+
+from PSSimPy.queues import FIFOQueue
+from PSSimPy.credit_facilities import SimplePriced
+from PSSimPy.simulator import BasicSim, ABMSim, ABMEnv, NativeEnvironment
+
+LOGS = ('processed_transactions', 'queue_stats', 'account_balance', 'transaction_fees', 'credit_facility')
+
+
+class TestNativeEnvironment(unittest.TestCase):
+
+    def record(self, env, name, delay, steps, events):
+        for _ in range(steps):
+            events.append((env.now, name))
+            yield env.timeout(delay)
+
+    def test_matches_simpy_schedule(self):
+        schedules = []
+        for env in (simpy.Environment(), NativeEnvironment()):
+            events = []
+            env.process(self.record(env, 'a', 15, 10, events))
+            env.process(self.record(env, 'b', 10, 3, events))
+            env.run(until=60)
+            now_at_until = env.now
+            env.run(until=75)
+            schedules.append((events, now_at_until, env.now))
+        self.assertEqual(schedules[0], schedules[1])
+
+    def test_run_without_processes_advances_time(self):
+        env = NativeEnvironment()
+        env.run(until=30)
+        self.assertEqual(env.now, 30)
+        with self.assertRaises(ValueError):
+            env.run(until=10)
+
+
+class TestEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.banks = {'name': ['b1', 'b2', 'b3']}
+        self.accounts = {'id': ['acc1', 'acc2', 'acc3'], 'owner': ['b1', 'b2', 'b3'], 'balance': [100, 100, 100]}
+        self.transactions = {
+            'sender_account': ['acc1', 'acc2', 'acc3', 'acc1', 'acc2', 'acc3'],
+            'recipient_account': ['acc2', 'acc3', 'acc1', 'acc3', 'acc1', 'acc2'],
+            'amount': [50, 150, 30, 80, 20, 60],
+            'day': [1, 1, 1, 2, 2, 2],
+            'time': ['08:00', '08:05', '08:20', '08:00', '08:40', '08:45']
+        }
+
+    def tearDown(self):
+        for path in glob.glob('Engine*.csv'):
+            os.remove(path)
+
+    def assertSameLogs(self, name, other_name, logs=LOGS):
+        for log in logs:
+            log_rows = pd.read_csv(f'{name}-{log}.csv').astype(str).values.tolist()
+            other_log_rows = pd.read_csv(f'{other_name}-{log}.csv').astype(str).values.tolist()
+            self.assertEqual(sorted(log_rows), sorted(other_log_rows), log)
+
+    def test_basic_sim(self):
+        for engine in ('simpy', 'native'):
+            sim = BasicSim(f'Engine-{engine}', banks=self.banks, accounts=self.accounts, transactions=self.transactions, open_time='08:00', close_time='09:00',
+                           processing_window=5, num_days=2, queue=FIFOQueue(), credit_facility=SimplePriced(), engine=engine)
+            sim.run()
+        self.assertSameLogs('Engine-simpy', 'Engine-native')
+
+    def test_abm_sim(self):
+        def make_sim(name, engine):
+            return ABMSim(name, banks=self.banks, accounts=self.accounts, txn_arrival_prob=0.5, txn_amount_range=(10, 80), open_time='08:00', close_time='09:00',
+                          num_days=2, queue=FIFOQueue(), credit_facility=SimplePriced(), seed=3, engine=engine)
+        make_sim('Engine-abm-simpy', 'simpy').run()
+        make_sim('Engine-abm-native', 'native').run()
+        asyncio.run(make_sim('Engine-abm-async', NativeEnvironment).run_async())
+        self.assertSameLogs('Engine-abm-simpy', 'Engine-abm-native', LOGS + ('transactions_arrival',))
+        self.assertSameLogs('Engine-abm-simpy', 'Engine-abm-async', LOGS + ('transactions_arrival',))
+
+        env = ABMEnv(name='Engine-abm-env', banks=self.banks, accounts=self.accounts, txn_arrival_prob=0.5, txn_amount_range=(10, 80), open_time='08:00',
+                     close_time='09:00', num_days=2, queue=FIFOQueue(), credit_facility=SimplePriced(), engine='native')
+        env.reset(seed=3)
+        self.assertIsInstance(env.sim.env, NativeEnvironment)
+        terminated = False
+        while not terminated:
+            _, _, terminated, _, _ = env.step()
+        env.close()
+        self.assertSameLogs('Engine-abm-simpy', 'Engine-abm-env', LOGS + ('transactions_arrival',))
+
+    def test_invalid_engine(self):
+        with self.assertRaises(ValueError):
+            BasicSim('Engine-invalid', banks=self.banks, accounts=self.accounts, transactions=self.transactions, engine='salabim')
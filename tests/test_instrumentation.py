@@ -0,0 +1,92 @@
+import os
+import glob
+import unittest
+
+from PSSimPy.queues import FIFOQueue
+from PSSimPy.credit_facilities import SimplePriced
+from PSSimPy.simulator import BasicSim, ABMSim
+from PSSimPy.utils import Instrumentation, PhaseCollector
+
+
+class WindowCounter(PhaseCollector):
+
+    def __init__(self):
+        self.windows = []
+        self.phases = set()
+        self.finished = False
+
+    def record_phase(self, day, time, phase, seconds):
+        self.phases.add(phase)
+
+    def end_window(self, day, time, stats):
+        self.windows.append((day, time, stats['queue_num_txns']))
+
+    def end_run(self):
+        self.finished = True
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        self.banks = {'name': ['b1', 'b2', 'b3']}
+        self.accounts = {'id': ['acc1', 'acc2', 'acc3'], 'owner': ['b1', 'b2', 'b3'], 'balance': [100, 100, 100]}
+        self.transactions = {
+            'sender_account': ['acc1', 'acc2', 'acc3', 'acc1', 'acc2'],
+            'recipient_account': ['acc2', 'acc3', 'acc1', 'acc3', 'acc1'],
+            'amount': [50, 150, 30, 80, 20],
+            'day': [1, 1, 1, 2, 2],
+            'time': ['08:00', '08:05', '08:20', '08:00', '08:40']
+        }
+
+    def tearDown(self):
+        for path in glob.glob('Instrumented*.csv'):
+            os.remove(path)
+
+    def run_basic_sim(self, name, instrumentation=None):
+        sim = BasicSim(name, banks=self.banks, accounts=self.accounts, transactions=self.transactions, open_time='08:00', close_time='09:00', num_days=2,
+                       queue=FIFOQueue(), credit_facility=SimplePriced(), instrumentation=instrumentation)
+        sim.run()
+        return sim
+
+    def test_basic_sim(self):
+        collector = WindowCounter()
+        instrumentation = Instrumentation([collector])
+        sim = self.run_basic_sim('Instrumented', instrumentation)
+        # instrumentation does not change the outcome
+        plain_sim = self.run_basic_sim('InstrumentedPlain')
+        self.assertEqual([account.balance for account in sim.accounts.values()], [account.balance for account in plain_sim.accounts.values()])
+
+        self.assertTrue(collector.finished)
+        self.assertEqual(len(collector.windows), 2 * 5) # 4 windows and the end of day, for 2 days
+        self.assertIn('dequeue', collector.phases)
+        self.assertIn('log_credit_facility', collector.phases)
+
+        windows = instrumentation.to_dataframe()
+        gather = windows[windows['phase'] == 'gather']
+        self.assertEqual(len(gather), 8)
+        self.assertTrue((gather['calls'] == 1).all())
+        self.assertEqual(gather['num_arrivals'].sum(), 5)
+        days = instrumentation.to_dataframe('day')
+        self.assertEqual(days.loc[(days['day'] == 1) & (days['phase'] == 'gather'), 'calls'].item(), 4)
+        self.assertEqual(days.loc[days['phase'] == 'gather', 'num_windows'].tolist(), [5, 5])
+
+        report = instrumentation.report()
+        self.assertAlmostEqual(sum(phase['share'] for phase in report['phases'].values()), 1.0)
+        self.assertEqual(report['phases']['settle']['calls'], 8)
+        self.assertEqual(report['days'][1]['num_arrivals'], 3)
+
+    def test_abm_sim(self):
+        instrumentation = Instrumentation()
+        sim = ABMSim('InstrumentedABM', banks=self.banks, accounts=self.accounts, txn_arrival_prob=0.5, txn_amount_range=(10, 80), open_time='08:00',
+                     close_time='09:00', queue=FIFOQueue(), credit_facility=SimplePriced(), seed=1, instrumentation=instrumentation)
+        sim.run()
+        phases = instrumentation.to_dataframe('phase')
+        self.assertEqual(phases.loc[phases['phase'] == 'strategy', 'calls'].item(), 4)
+        self.assertIn('generate', phases['phase'].tolist())
+        self.assertIn('log_transaction_arrivals', phases['phase'].tolist())
+        windows = instrumentation.to_dataframe()
+        self.assertEqual(windows.drop_duplicates(['day', 'time'])['num_arrivals'].sum(), len(sim.transactions))
+
+    def test_invalid_level(self):
+        with self.assertRaises(ValueError):
+            Instrumentation().to_dataframe('hour')
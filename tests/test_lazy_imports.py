@@ -0,0 +1,52 @@
+import os
+import sys
+import json
+import tempfile
+import subprocess
+import unittest
+
+import PSSimPy
+
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(PSSimPy.__file__)))
+
+
+def run_in_fresh_interpreter(code: str) -> list:
+    """Runs the code in a new interpreter and returns the heavy dependencies loaded by then."""
+    code += "\nimport json, sys\nprint(json.dumps([module for module in ('numpy', 'pandas', 'simpy', 'sortedcontainers') if module in sys.modules]))"
+    with tempfile.TemporaryDirectory() as directory:
+        output = subprocess.run([sys.executable, '-c', code], cwd=directory, capture_output=True, text=True, check=True,
+                                env=dict(os.environ, PYTHONPATH=PACKAGE_ROOT)).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+class TestLazyImports(unittest.TestCase):
+
+    def test_package_import_loads_no_dependencies(self):
+        self.assertEqual(run_in_fresh_interpreter('import PSSimPy'), [])
+        self.assertEqual(run_in_fresh_interpreter('from PSSimPy import Transaction, Account'), [])
+
+    def test_simulation_without_dataframes_does_not_import_pandas(self):
+        loaded_modules = run_in_fresh_interpreter(
+            "from PSSimPy.simulator import BasicSim\n"
+            "from PSSimPy.queues import FIFOQueue\n"
+            "from PSSimPy.credit_facilities import SimplePriced\n"
+            "sim = BasicSim('Lazy', banks={'name': ['b1', 'b2']}, accounts={'id': ['acc1', 'acc2'], 'owner': ['b1', 'b2'], 'balance': [100, 100]},\n"
+            "               transactions={'sender_account': ['acc1'], 'recipient_account': ['acc2'], 'amount': [10], 'time': ['08:00']},\n"
+            "               queue=FIFOQueue(), credit_facility=SimplePriced(), engine='native')\n"
+            "sim.run()"
+        )
+        self.assertNotIn('pandas', loaded_modules)
+        self.assertNotIn('simpy', loaded_modules)
+
+    def test_public_names(self):
+        from PSSimPy.simulator.basic_sim import BasicSim
+        from PSSimPy.utils.constants import TRANSACTION_STATUS_CODES
+        self.assertIs(PSSimPy.BasicSim, BasicSim)
+        self.assertIs(PSSimPy.TRANSACTION_STATUS_CODES, TRANSACTION_STATUS_CODES)
+        self.assertIs(PSSimPy.queues.FIFOQueue, PSSimPy.FIFOQueue)
+        self.assertIn('WorkloadGenerator', dir(PSSimPy))
+        namespace = {}
+        exec('from PSSimPy import *', namespace)
+        self.assertTrue(set(PSSimPy.__all__) <= set(namespace))
+        with self.assertRaises(AttributeError):
+            PSSimPy.NotAName
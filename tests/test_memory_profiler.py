@@ -0,0 +1,64 @@
+import os
+import glob
+import unittest
+import tracemalloc
+
+from PSSimPy import Transaction
+from PSSimPy.queues import FIFOQueue
+from PSSimPy.credit_facilities import SimplePriced
+from PSSimPy.simulator import BasicSim, ABMSim
+from PSSimPy.utils import MemoryProfiler, structure_size
+
+
+class TestMemoryProfiler(unittest.TestCase):
+
+    def setUp(self):
+        self.banks = {'name': ['b1', 'b2', 'b3']}
+        self.accounts = {'id': ['acc1', 'acc2', 'acc3'], 'owner': ['b1', 'b2', 'b3'], 'balance': [100, 100, 100]}
+        self.transactions = {
+            'sender_account': ['acc1', 'acc2', 'acc3', 'acc1', 'acc2', 'acc3'],
+            'recipient_account': ['acc2', 'acc3', 'acc1', 'acc3', 'acc1', 'acc2'],
+            'amount': [50, 150, 30, 80, 20, 60],
+            'day': [1, 1, 1, 2, 2, 2],
+            'time': ['08:00', '08:05', '08:20', '08:00', '08:40', '08:45']
+        }
+
+    def tearDown(self):
+        for path in glob.glob('Memory*.csv'):
+            os.remove(path)
+
+    def test_basic_sim(self):
+        memory_profiler = MemoryProfiler()
+        sim = BasicSim('Memory', banks=self.banks, accounts=self.accounts, transactions=self.transactions, open_time='08:00', close_time='09:00', num_days=2,
+                       queue=FIFOQueue(), credit_facility=SimplePriced(), memory_profiler=memory_profiler)
+        sim.run()
+        self.assertFalse(tracemalloc.is_tracing())
+
+        components = memory_profiler.to_dataframe()
+        self.assertEqual(components['day'].unique().tolist(), [0, 1, 2])
+        self.assertEqual(set(components['component']), {'transactions', 'account_transactions', 'queue', 'credit_facility_history', 'exposure_by_bank', 'transaction_instances'})
+        account_transactions = components[components['component'] == 'account_transactions']
+        self.assertTrue((account_transactions['growth'].iloc[1:] > 0).all())
+
+        report = memory_profiler.report()
+        self.assertEqual(report['components']['account_transactions']['retained_bytes'], account_transactions['bytes'].iloc[-1])
+        self.assertGreater(report['components']['account_transactions']['growth_per_day'], 0)
+        self.assertEqual(set(report['traced']), {0, 1, 2})
+        self.assertTrue(any(source.startswith('PSSimPy.simulator') for source in report['allocations']))
+        self.assertIn('source', memory_profiler.traced_dataframe().columns)
+
+    def test_abm_sim_without_tracing(self):
+        memory_profiler = MemoryProfiler(trace_allocations=False)
+        sim = ABMSim('MemoryABM', banks=self.banks, accounts=self.accounts, txn_arrival_prob=0.5, txn_amount_range=(10, 80), open_time='08:00',
+                     close_time='09:00', queue=FIFOQueue(), credit_facility=SimplePriced(), seed=1, memory_profiler=memory_profiler)
+        sim.run()
+        self.assertEqual(memory_profiler.traced_samples, [])
+        self.assertIn('outstanding_transactions', memory_profiler.to_dataframe()['component'].tolist())
+
+    def test_structure_size_counts_shared_objects_once(self):
+        transaction = Transaction(None, None, 10)
+        single_bytes, single_objects = structure_size([transaction])
+        shared_bytes, shared_objects = structure_size([transaction, {transaction}])
+        self.assertEqual(shared_objects, single_objects + 1)
+        self.assertGreater(shared_bytes, single_bytes)
+        Transaction._instances.discard(transaction)
@@ -1,5 +1,5 @@
 import unittest
-from PSSimPy.queues import DirectQueue, FIFOQueue, PriorityQueue
+from PSSimPy.queues import DirectQueue, FIFOQueue, PriorityQueue, LiquiditySavingQueue, BilateralOffsetQueue
 from PSSimPy import Transaction
 from PSSimPy import Account
 
@@ -53,6 +53,119 @@ class TestQueue(unittest.TestCase):
         self.assertEqual(len(dequeued_txns), 1, "Only one transaction should have been eligible to be dequeued")
         self.assertEqual(dequeued_txns[0].sender_account.id, 'acc2', "Wrong transaction dequeued")
 
+    def test_running_stats(self):
+        acc1 = Account('acc1', None, 0)
+        acc2 = Account('acc2', None, 10)
+        txn1 = Transaction(acc1, acc2, 5, 1)
+        txn2 = Transaction(acc2, acc1, 7, 2)
+        txn3 = Transaction(acc2, acc1, 3, 2)
+        fifo_queue = FIFOQueue(track_sender_stats=True, track_priority_stats=True)
+        fifo_queue.bulk_enqueue([txn1, txn2, txn3])
+        self.assertEqual(fifo_queue.get_num_txns(), 3)
+        self.assertEqual(fifo_queue.get_txn_amount_total(), 15)
+        self.assertEqual(fifo_queue.get_sender_stats(), {'acc1': (1, 5), 'acc2': (2, 10)})
+        self.assertEqual(fifo_queue.get_priority_stats(), {1: (1, 5), 2: (2, 10)})
+        fifo_queue.begin_dequeueing()
+        self.assertEqual(fifo_queue.get_num_txns(), 1)
+        self.assertEqual(fifo_queue.get_txn_amount_total(), 5)
+        self.assertEqual(fifo_queue.get_sender_stats(), {'acc1': (1, 5)})
+        self.assertEqual(fifo_queue.get_priority_stats(), {1: (1, 5)})
+
+    def test_time_weighted_stats(self):
+        self.q.enqueue(self.txn1)
+        self.q.accumulate_time_weighted_stats(10)
+        self.q.enqueue(self.txn2)
+        self.q.accumulate_time_weighted_stats(30)
+        stats = self.q.get_time_weighted_stats()
+        self.assertEqual(stats['elapsed_time'], 40)
+        self.assertAlmostEqual(stats['avg_num_txns'], (1 * 10 + 2 * 30) / 40)
+        self.assertAlmostEqual(stats['avg_txn_amount'], (1 * 10 + 3 * 30) / 40)
+
+
+    def test_bulk_enqueue_keeps_existing_items_first(self):
+        acc1 = Account('acc1', None, 100)
+        acc2 = Account('acc2', None, 100)
+        priority_queue = PriorityQueue()
+        first = Transaction(acc1, acc2, 1, 1)
+        priority_queue.enqueue(first)
+        later = [Transaction(acc1, acc2, amount, 1) for amount in range(2, 6)]
+        priority_queue.bulk_enqueue(later)
+        self.assertIs(priority_queue.queue[0][0], first)
+        self.assertEqual(priority_queue.get_num_txns(), 5)
+
+    def test_batch_dequeue(self):
+        acc1 = Account('acc1', None, 3)
+        acc2 = Account('acc2', None, 0)
+        txns = [Transaction(acc1, acc2, amount) for amount in (1, 5, 2, 7, 3)]
+        fifo_queue = FIFOQueue()
+        fifo_queue.bulk_enqueue(txns)
+        dequeued_txns = fifo_queue.begin_dequeueing()
+        self.assertEqual([txn.amount for txn in dequeued_txns], [1, 2, 3])
+        self.assertEqual([txn.amount for txn, _ in fifo_queue.queue], [5, 7])
+        self.assertEqual(fifo_queue.get_txn_amount_total(), 12)
+        self.assertEqual([txn.amount for txn in fifo_queue.dequeue_all()], [5, 7])
+        self.assertEqual(fifo_queue.get_num_txns(), 0)
+
+
+    def test_liquidity_saving_gridlock(self):
+        acc1 = Account('acc1', None, 5)
+        acc2 = Account('acc2', None, 5)
+        acc3 = Account('acc3', None, 5)
+        ring = [Transaction(acc1, acc2, 10), Transaction(acc2, acc3, 10), Transaction(acc3, acc1, 10)]
+        fifo_queue = FIFOQueue()
+        fifo_queue.bulk_enqueue(ring)
+        self.assertEqual(len(fifo_queue.begin_dequeueing()), 0, "No single transaction can settle on its own")
+        lsm_queue = LiquiditySavingQueue()
+        lsm_queue.bulk_enqueue(ring)
+        self.assertEqual(len(lsm_queue.begin_dequeueing()), 3, "The ring nets out and should settle together")
+        self.assertEqual(lsm_queue.get_num_txns(), 0)
+
+    def test_liquidity_saving_partial(self):
+        acc1 = Account('acc1', None, 5)
+        acc2 = Account('acc2', None, 5)
+        acc3 = Account('acc3', None, 5)
+        lsm_queue = LiquiditySavingQueue()
+        ring = [Transaction(acc1, acc2, 10), Transaction(acc2, acc3, 10), Transaction(acc3, acc1, 10)]
+        lsm_queue.bulk_enqueue(ring)
+        lsm_queue.next_period()
+        oversized = Transaction(acc1, acc3, 50)
+        lsm_queue.enqueue(oversized)
+        dequeued_txns = lsm_queue.begin_dequeueing()
+        self.assertEqual(set(dequeued_txns), set(ring))
+        self.assertEqual([txn for txn, _ in lsm_queue.queue], [oversized])
+        for txn in dequeued_txns:
+            txn.sender_account.balance -= txn.amount
+            txn.recipient_account.balance += txn.amount
+        self.assertTrue(all(acc.balance >= 0 for acc in (acc1, acc2, acc3)))
+
+    def test_liquidity_saving_min_balance(self):
+        acc1 = Account('acc1', None, 20)
+        acc2 = Account('acc2', None, 0)
+        lsm_queue = LiquiditySavingQueue(min_balance=15)
+        txn = Transaction(acc1, acc2, 10)
+        self.assertFalse(lsm_queue.dequeue_criteria((txn, 0)))
+        lsm_queue.enqueue(txn)
+        self.assertEqual(lsm_queue.begin_dequeueing(), [])
+        self.assertTrue(LiquiditySavingQueue(min_balance=10).dequeue_criteria((txn, 0)))
+
+
+    def test_bilateral_offset(self):
+        acc1 = Account('acc1', None, 5)
+        acc2 = Account('acc2', None, 5)
+        acc3 = Account('acc3', None, 5)
+        txn1 = Transaction(acc1, acc2, 100)
+        txn2 = Transaction(acc2, acc1, 98)
+        txn3 = Transaction(acc2, acc3, 50)
+        txn4 = Transaction(acc3, acc2, 40)
+        bilateral_queue = BilateralOffsetQueue()
+        bilateral_queue.bulk_enqueue([txn1, txn2, txn3, txn4])
+        self.assertEqual(set(bilateral_queue.offset_candidates), {('acc1', 'acc2'), ('acc2', 'acc3')})
+        dequeued_txns = bilateral_queue.begin_dequeueing()
+        # acc1 can pay the net amount of 2 to acc2, but acc3 cannot pay its net amount of 10 to acc2
+        self.assertEqual(set(dequeued_txns), {txn1, txn2})
+        self.assertEqual(set(bilateral_queue.offset_candidates), {('acc2', 'acc3')})
+        self.assertNotIn(('acc1', 'acc2'), bilateral_queue.pair_index)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
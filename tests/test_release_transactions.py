@@ -0,0 +1,107 @@
+import os
+import glob
+import unittest
+import pandas as pd
+
+from PSSimPy import Transaction
+from PSSimPy.queues import FIFOQueue
+from PSSimPy.credit_facilities import SimplePriced
+from PSSimPy.constraint_handler import MaxSizeConstraintHandler
+from PSSimPy.simulator import BasicSim, ABMSim
+from PSSimPy.utils import WorkloadGenerator
+
+
+class TestReleaseTransactions(unittest.TestCase):
+
+    def setUp(self):
+        self.banks = {'name': ['b1', 'b2', 'b3']}
+        self.accounts = {'id': ['acc1', 'acc2', 'acc3'], 'owner': ['b1', 'b2', 'b3'], 'balance': [100, 100, 100]}
+        self.transactions = {
+            'sender_account': ['acc1', 'acc2', 'acc3', 'acc1', 'acc2', 'acc3'],
+            'recipient_account': ['acc2', 'acc3', 'acc1', 'acc3', 'acc1', 'acc2'],
+            'amount': [10, 20, 30, 40, 50, 60],
+            'day': [1, 1, 1, 2, 2, 2],
+            'time': ['08:00', '08:15', '08:30', '08:00', '08:15', '08:45']
+        }
+
+    def tearDown(self):
+        for path in glob.glob('Release*.csv'):
+            os.remove(path)
+
+    def run_sim(self, name, transactions, release_finished_transactions, num_days=2):
+        sim = BasicSim(name, banks=self.banks, accounts=self.accounts, transactions=transactions, open_time='08:00', close_time='09:00', num_days=num_days,
+                       queue=FIFOQueue(), credit_facility=SimplePriced(), release_finished_transactions=release_finished_transactions)
+        sim.run()
+        return sim
+
+    def test_basic_sim_releases_logged_transactions(self):
+        sim = self.run_sim('Release', self.transactions, True)
+        self.assertEqual(sim.transactions, set())
+        self.assertFalse(any(transaction.sender_account is sim.accounts['acc1'] for transaction in Transaction._instances))
+        # the log still holds every transaction
+        self.assertEqual(len(pd.read_csv('Release-processed_transactions.csv')), 6)
+
+    def test_basic_sim_keeps_transactions_by_default(self):
+        sim = self.run_sim('ReleaseOff', self.transactions, False)
+        self.assertEqual(len(sim.transactions), 6)
+
+    def test_basic_sim_transaction_chunks(self):
+        days = [{column: [value for value, day in zip(values, self.transactions['day']) if day == chunk_day] for column, values in self.transactions.items()} for chunk_day in (1, 2)]
+        loaded = []
+        def chunks():
+            for chunk in days:
+                loaded.append(chunk['day'][0])
+                yield chunk
+        sim = BasicSim('ReleaseChunks', banks=self.banks, accounts=self.accounts, transactions=chunks(), open_time='08:00', close_time='09:00', num_days=2,
+                       queue=FIFOQueue(), credit_facility=SimplePriced())
+        self.assertEqual(loaded, [])
+        with self.assertRaises(ValueError):
+            sim.run_scenarios(transaction_fee_rates=[0.1])
+        sim.run()
+        self.assertEqual(loaded, [1, 2])
+        self.assertEqual(len(sim.transactions), 6)
+        self.assertTrue(all(transaction.status_code == 2 for transaction, _, _ in sim.transactions))
+        streamed_log = pd.read_csv('ReleaseChunks-processed_transactions.csv')
+        self.run_sim('ReleaseWhole', self.transactions, False)
+        whole_log = pd.read_csv('ReleaseWhole-processed_transactions.csv')
+        columns = list(whole_log.columns)
+        self.assertEqual(streamed_log.sort_values(columns).values.tolist(), whole_log.sort_values(columns).values.tolist())
+
+    def test_basic_sim_workload_chunks(self):
+        generator = WorkloadGenerator(num_banks=3, num_payments_per_day=50, num_days=3, open_time='08:00', close_time='09:00', seed=0)
+        accounts = generator.accounts()
+        sim = BasicSim('ReleaseWorkload', banks=generator.banks(), accounts=accounts, transactions=generator.iter_days(), open_time='08:00', close_time='09:00',
+                       num_days=3, queue=FIFOQueue(), credit_facility=SimplePriced(), eod_force_settlement=True, account_history='counters',
+                       release_finished_transactions=True)
+        sim.run()
+        self.assertEqual(sim.transactions, set())
+        self.assertEqual(sum(account.txn_out_count for account in sim.accounts.values()), len(generator.transactions()['amount']))
+
+    def test_split_transactions_released(self):
+        generator = WorkloadGenerator(num_banks=3, num_payments_per_day=50, num_days=3, open_time='08:00', close_time='09:00', seed=0)
+        sim = BasicSim('ReleaseSplit', banks=generator.banks(), accounts=generator.accounts(), transactions=generator.iter_days(), open_time='08:00', close_time='09:00',
+                       num_days=3, constraint_handler=MaxSizeConstraintHandler(max_txn_size=50), eod_force_settlement=True, account_history='counters',
+                       release_finished_transactions=True)
+        sim.run()
+        self.assertEqual(sim.transactions, set())
+        abm_sim = ABMSim('ReleaseSplitABM', banks=self.banks, accounts=self.accounts, txn_arrival_prob=0.5, txn_amount_range=(10, 200), open_time='08:00',
+                         close_time='09:00', num_days=3, constraint_handler=MaxSizeConstraintHandler(max_txn_size=50), eod_force_settlement=True, seed=1,
+                         release_finished_transactions=True)
+        abm_sim.run()
+        # the parents of split transactions are not kept once their pieces have finished
+        self.assertEqual(abm_sim.transactions, set())
+        self.assertFalse(any(transaction.sender_account is abm_sim.accounts['acc1'] for transaction in Transaction._instances))
+
+    def test_abm_sim(self):
+        sim = ABMSim('ReleaseABM', banks=self.banks, accounts=self.accounts, txn_arrival_prob=0.5, txn_amount_range=(10, 80), open_time='08:00', close_time='09:00',
+                     num_days=2, queue=FIFOQueue(), credit_facility=SimplePriced(), seed=1, release_finished_transactions=True)
+        sim.run()
+        # only the transactions that are still open are kept
+        self.assertTrue(all(transaction.status_code in (0, 1) for transaction, _, _ in sim.transactions))
+        self.assertLessEqual(len(sim.transactions), len(sim.outstanding_transactions) + sim.queue.get_num_txns())
+        # arrivals are logged window by window, including the transactions already released
+        arrivals = pd.read_csv('ReleaseABM-transactions_arrival.csv')
+        self.assertEqual(len(arrivals), sum(account.txn_out_count for account in sim.accounts.values()))
+        self.assertEqual(sorted(set(arrivals['day'])), [1, 2])
+        for transaction, _, _ in sim.transactions:
+            Transaction._instances.discard(transaction)
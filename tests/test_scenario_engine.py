@@ -0,0 +1,92 @@
+import os
+import glob
+import random
+import unittest
+import numpy as np
+
+from PSSimPy.queues import DirectQueue, FIFOQueue, PriorityQueue, LiquiditySavingQueue
+from PSSimPy.constraint_handler import PassThroughHandler, MinBalanceConstraintHandler
+from PSSimPy.credit_facilities import SimplePriced, SimpleCollateralized
+from PSSimPy.transaction_fee import TimeBandedTransactionFee
+from PSSimPy.simulator import BasicSim
+
+
+class TestLockstepScenarios(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(0)
+        self.banks = {'name': ['b1', 'b2', 'b3']}
+        self.accounts = {'id': ['acc1', 'acc2', 'acc3', 'acc4', 'acc5', 'acc6'], 'owner': ['b1', 'b1', 'b2', 'b2', 'b3', 'b3'],
+                         'balance': [100] * 6, 'posted_collateral': [50] * 6}
+        num_txns = 120
+        senders = [rng.choice(self.accounts['id']) for _ in range(num_txns)]
+        self.transactions = {
+            'sender_account': senders,
+            'recipient_account': [rng.choice([account_id for account_id in self.accounts['id'] if account_id != sender]) for sender in senders],
+            'amount': [rng.randint(1, 120) for _ in range(num_txns)],
+            'priority': [rng.randint(1, 3) for _ in range(num_txns)],
+            'day': [rng.randint(1, 2) for _ in range(num_txns)],
+            'time': ['%02d:%02d' % (rng.randint(8, 9), rng.randint(0, 59)) for _ in range(num_txns)],
+            'ref': list(range(num_txns))
+        }
+        self.balances = np.array([[100] * 6, [10, 200, 30, 0, 80, 60], [0] * 6, [500] * 6])
+        self.collateral = np.array([[50] * 6, [0] * 6, [100] * 6, [20] * 6])
+        self.rates = [0.0, 0.01, 0.02, 0.005]
+
+    def tearDown(self):
+        for path in glob.glob('Scenario*.csv'):
+            os.remove(path)
+
+    def create_sim(self, name, balances=None, collateral=None, rate=0.0, **components):
+        accounts = dict(self.accounts)
+        if balances is not None:
+            accounts['balance'] = list(balances)
+            accounts['posted_collateral'] = list(collateral)
+        return BasicSim(name, banks=dict(self.banks), accounts=accounts, transactions=dict(self.transactions), open_time='08:00', close_time='10:00',
+                        num_days=2, transaction_fee_rate=rate, **components)
+
+    def assert_matches_separate_runs(self, make_components, **sim_kwargs):
+        self.tearDown()
+        results = self.create_sim('Scenario', **make_components(), **sim_kwargs).run_scenarios(self.balances, self.rates, self.collateral)
+        refs = [transaction.ref for transaction in results.transactions]
+        for k in range(len(self.balances)):
+            sim = self.create_sim(f'Scenario{k}', self.balances[k], self.collateral[k], self.rates[k], **make_components(), **sim_kwargs)
+            sim.run()
+            np.testing.assert_allclose(results.balances[k], [sim.accounts[account_id].balance for account_id in results.account_ids])
+            np.testing.assert_allclose(results.posted_collateral[k], [sim.accounts[account_id].posted_collateral for account_id in results.account_ids])
+            transactions = {transaction.ref: transaction for transaction, _, _ in sim.transactions}
+            np.testing.assert_array_equal(results.status[k], [transactions[ref].status_code for ref in refs])
+            np.testing.assert_array_equal(results.settle_day[k], [transactions[ref].settle_day or 0 for ref in refs])
+            # transaction fees are only logged by the simulator
+            fees = {account_id: 0.0 for account_id in results.account_ids}
+            with open(f'Scenario{k}-transaction_fees.csv') as fee_log:
+                for line in fee_log.readlines()[1:]:
+                    account_id, _, _, fee = line.strip().split(',')
+                    fees[account_id] += float(fee)
+            np.testing.assert_allclose(results.transaction_fees[k], [fees[account_id] for account_id in results.account_ids])
+        return results
+
+    def test_fifo_simple_priced(self):
+        results = self.assert_matches_separate_runs(lambda: {'queue': FIFOQueue(), 'credit_facility': SimplePriced()})
+        self.assertEqual(results.status.shape, (4, 120))
+        self.assertEqual(results.queue_num_txns.shape, (2 * 9, 4)) # 8 windows and the end of day, for 2 days
+
+    def test_priority_min_balance_collateralized(self):
+        self.assert_matches_separate_runs(lambda: {'queue': PriorityQueue(), 'constraint_handler': MinBalanceConstraintHandler(10),
+                                                   'credit_facility': SimpleCollateralized()}, eod_force_settlement=True)
+
+    def test_bank_failure_time_banded_fees(self):
+        self.assert_matches_separate_runs(lambda: {'queue': FIFOQueue(), 'constraint_handler': PassThroughHandler(), 'credit_facility': SimpleCollateralized(),
+                                                   'transaction_fee_handler': TimeBandedTransactionFee({'08:00': 0.01, '09:00': 0.02})},
+                                          eod_clear_queue=True, bank_failure={1: [('08:40', 'b2')]})
+        self.assert_matches_separate_runs(lambda: {'queue': DirectQueue(), 'credit_facility': SimplePriced()})
+
+    def test_unsupported(self):
+        sim = self.create_sim('Scenario', queue=LiquiditySavingQueue(), credit_facility=SimplePriced())
+        with self.assertRaises(ValueError):
+            sim.run_scenarios(self.balances)
+        sim = self.create_sim('Scenario', queue=FIFOQueue(), credit_facility=SimplePriced())
+        with self.assertRaises(ValueError):
+            sim.run_scenarios(self.balances, self.rates[:2])
+        with self.assertRaises(ValueError):
+            sim.run_scenarios()
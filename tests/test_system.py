@@ -55,7 +55,8 @@ class TestSystem(unittest.TestCase):
         txns_to_process = set([self.txn1, self.txn2, self.txn3])
         self.assertEqual(len(Transaction.get_instances()), 5)
         system.process(txns_to_process)
-        self.assertEqual(len(Transaction.get_instances()), 11)
+        # txn2 (200) is split into 2 pieces and txn3 (205) into 3 pieces
+        self.assertEqual(len(Transaction.get_instances()), 10)
 
         # check status
         self.assertEqual(self.txn1.status_code, TRANSACTION_STATUS_CODES['Success'])
@@ -1,7 +1,9 @@
 import unittest
 from unittest.mock import patch
-from PSSimPy import Account, Transaction
+import pickle
+from PSSimPy import Account, Bank, Transaction
 from PSSimPy.utils import TRANSACTION_STATUS_CODES
+from PSSimPy.utils.data_utils import instance_attributes
 
 class TestTransaction(unittest.TestCase):
 
@@ -41,5 +43,31 @@ class TestTransaction(unittest.TestCase):
         self.assertEqual(len(Transaction.get_instances()), 0)
 
 
+class TestSlottedObjects(unittest.TestCase):
+
+    def test_additional_attributes(self):
+        bank = Bank('b1', region='EU')
+        account = Account('acc1', bank, 100, branch='main')
+        txn = Transaction(account, account, 10, ref='A1', day=2, time='08:15')
+        self.assertEqual((bank.region, account.branch, txn.ref, txn.day, txn.arrival_time), ('EU', 'main', 'A1', 2, '08:15'))
+        txn.note = 'manual'
+        self.assertEqual(txn.note, 'manual')
+        copied_txn = pickle.loads(pickle.dumps(txn))
+        self.assertEqual((copied_txn.ref, copied_txn.note, copied_txn.amount, copied_txn.sender_account.owner.region), ('A1', 'manual', 10, 'EU'))
+        Transaction._instances.discard(txn)
+
+    def test_account_transaction_sets(self):
+        account = Account('acc1', None)
+        self.assertIsNone(account._txn_in)
+        account.txn_in.add('txn')
+        self.assertEqual(account.txn_in, {'txn'})
+        account.txn_out = {'other'}
+        self.assertEqual(account.txn_out, {'other'})
+
+    def test_instance_attributes(self):
+        bank = Bank('b1', 'Petty', region='EU')
+        self.assertEqual(instance_attributes(bank), {'name': 'b1', 'strategy_type': 'Petty', 'is_failed': False, 'region': 'EU'})
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,95 @@
+import unittest
+import numpy as np
+
+from PSSimPy.transaction_fee import AbstractTransactionFee, FixedTransactionFee, TimeBandedTransactionFee, TieredTransactionFee
+from PSSimPy.utils import time_to_minutes, minutes_to_time
+from PSSimPy.utils.transaction_utils import calculate_fees
+
+
+class PeakHourFee(AbstractTransactionFee):
+    """Doubles the rate from 12:00 onwards. Relies on the default batch implementation."""
+
+    def calculate_fee(self, txn_amount, time, rate):
+        return txn_amount * rate * (2 if time >= '12:00' else 1)
+
+
+class ThreeArgumentBatchFee(AbstractTransactionFee):
+    """Overrides the batch calculation with the signature that has no account ids."""
+
+    def calculate_fee(self, txn_amount, time, rate):
+        return txn_amount * rate
+
+    def calculate_fees(self, txn_amounts, minutes, rate):
+        return np.asarray(txn_amounts) * rate
+
+
+class TestTransactionFee(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.amounts = np.array([100, 200, 300])
+        self.minutes = np.array([time_to_minutes('08:00'), time_to_minutes('12:00'), time_to_minutes('16:59')])
+
+    def test_time_conversion(self):
+        self.assertEqual(time_to_minutes('08:30'), 510)
+        self.assertEqual(minutes_to_time(510), '08:30')
+        self.assertEqual(minutes_to_time(time_to_minutes('23:59')), '23:59')
+
+    def test_fixed_fee(self):
+        fee_handler = FixedTransactionFee()
+        fees = fee_handler.calculate_fees(self.amounts, self.minutes, 0.01)
+        np.testing.assert_allclose(fees, [1.0, 2.0, 3.0])
+        self.assertEqual(fee_handler.calculate_fee(100, '08:00', 0.01), 1.0)
+
+    def test_time_banded_fee(self):
+        fee_handler = TimeBandedTransactionFee({'08:00': 0.01, '12:00': 0.02, '16:00': 0.05})
+        fees = fee_handler.calculate_fees(self.amounts, self.minutes)
+        np.testing.assert_allclose(fees, [1.0, 4.0, 15.0])
+        self.assertAlmostEqual(fee_handler.calculate_fee(100, '11:59'), 1.0)
+        # times before the first band wrap around to the last band
+        self.assertAlmostEqual(fee_handler.calculate_fee(100, '07:00'), 5.0)
+        # a single minute of the day can be given for the whole batch
+        np.testing.assert_allclose(fee_handler.calculate_fees(self.amounts, time_to_minutes('12:30')), [2.0, 4.0, 6.0])
+
+    def test_time_banded_fee_invalid_schedule(self):
+        with self.assertRaises(ValueError):
+            TimeBandedTransactionFee({})
+        with self.assertRaises(ValueError):
+            TimeBandedTransactionFee({'25:00': 0.01})
+
+    def test_tiered_fee_by_count(self):
+        fee_handler = TieredTransactionFee([(0, 0.03), (2, 0.02), (3, 0.01)], tier_basis='count')
+        fees = fee_handler.calculate_fees(np.array([100, 100, 100]), self.minutes, None, ['acc1', 'acc1', 'acc2'])
+        np.testing.assert_allclose(fees, [3.0, 3.0, 3.0])
+        # volumes carry over to the next batch
+        fees = fee_handler.calculate_fees(np.array([100, 100]), time_to_minutes('13:00'), None, ['acc1', 'acc1'])
+        np.testing.assert_allclose(fees, [2.0, 1.0])
+        self.assertEqual(fee_handler.get_volume('acc1'), (4, 400))
+
+    def test_tiered_fee_by_value_with_reset(self):
+        fee_handler = TieredTransactionFee([(0, 0.02), (1000, 0.01)], tier_basis='value', reset_period_days=2)
+        fees = fee_handler.calculate_fees(np.array([1000, 500]), self.minutes[:2], None, ['acc1', 'acc1'])
+        np.testing.assert_allclose(fees, [20.0, 5.0])
+        fee_handler.end_of_day(1)
+        self.assertEqual(fee_handler.calculate_fee(500, '08:00', account_id='acc1'), 5.0)
+        fee_handler.end_of_day(2)
+        self.assertEqual(fee_handler.get_volume('acc1'), (0, 0.0))
+        self.assertEqual(fee_handler.calculate_fee(500, '08:00', account_id='acc1'), 10.0)
+
+    def test_tiered_fee_invalid_tiers(self):
+        with self.assertRaises(ValueError):
+            TieredTransactionFee([(10, 0.01)])
+        with self.assertRaises(ValueError):
+            TieredTransactionFee([(0, 0.01)], tier_basis='size')
+
+    def test_default_batch_implementation(self):
+        fees = PeakHourFee().calculate_fees(self.amounts, self.minutes, 0.01)
+        np.testing.assert_allclose(fees, [1.0, 4.0, 6.0])
+
+    def test_batch_fees_without_account_ids(self):
+        account_ids = ['acc1', 'acc2', 'acc3']
+        np.testing.assert_allclose(calculate_fees(ThreeArgumentBatchFee(), self.amounts, self.minutes, 0.01, account_ids), [1.0, 2.0, 3.0])
+        np.testing.assert_allclose(calculate_fees(TieredTransactionFee([(0, 0.01)]), self.amounts, self.minutes, None, account_ids), [1.0, 2.0, 3.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,68 @@
+import os
+import glob
+import tempfile
+import unittest
+import numpy as np
+
+from PSSimPy.queues import FIFOQueue
+from PSSimPy.credit_facilities import SimplePriced
+from PSSimPy.simulator import BasicSim
+from PSSimPy.utils import WorkloadGenerator
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+class TestWorkloadGenerator(unittest.TestCase):
+
+    def setUp(self):
+        self.generator = WorkloadGenerator(num_banks=20, num_payments_per_day=5000, num_days=3, accounts_per_bank=2, day_factors=(1.0, 2.0), seed=42)
+
+    def tearDown(self):
+        for path in glob.glob('Workload*.csv'):
+            os.remove(path)
+
+    def test_reproducible_days(self):
+        days = list(self.generator.iter_days())
+        other_generator = WorkloadGenerator(num_banks=20, num_payments_per_day=5000, num_days=3, accounts_per_bank=2, day_factors=(1.0, 2.0), seed=42)
+        # a day can be generated on its own and matches the stream
+        self.assertEqual({column: values.tolist() for column, values in other_generator.generate_day(2).items()}, days[1])
+        all_transactions = self.generator.transactions()
+        self.assertEqual(all_transactions['amount'], days[0]['amount'] + days[1]['amount'] + days[2]['amount'])
+        self.assertNotEqual(WorkloadGenerator(num_banks=20, num_payments_per_day=5000, seed=1).generate_day(1)['amount'].tolist(), days[0]['amount'])
+
+    def test_workload_shape(self):
+        accounts = self.generator.accounts()
+        self.assertEqual(len(accounts['id']), 40)
+        self.assertEqual(set(accounts['owner']), set(self.generator.banks()['name']))
+        first_day, second_day = self.generator.generate_day(1), self.generator.generate_day(2)
+        self.assertGreater(len(second_day['amount']), 1.5 * len(first_day['amount'])) # seasonality
+        owners = dict(zip(accounts['id'], accounts['owner']))
+        self.assertTrue(all(owners[sender] != owners[recipient] for sender, recipient in zip(first_day['sender_account'], first_day['recipient_account'])))
+        # arrivals peak near the close and amounts are heavy tailed
+        self.assertGreater(np.sum(first_day['time'] >= '16:00'), 2 * np.sum(first_day['time'] < '09:00'))
+        self.assertGreater(np.percentile(first_day['amount'], 99), 10 * np.median(first_day['amount']))
+        self.assertTrue(np.all(first_day['time'][:-1] <= first_day['time'][1:]))
+
+    def test_runs_in_simulator(self):
+        generator = WorkloadGenerator(num_banks=5, num_payments_per_day=200, num_days=2, open_time='08:00', close_time='10:00', seed=0)
+        sim = BasicSim('Workload', banks=generator.banks(), accounts=generator.accounts(), transactions=generator.transactions(), open_time='08:00', close_time='10:00',
+                       num_days=2, queue=FIFOQueue(), credit_facility=SimplePriced())
+        sim.run()
+        self.assertTrue(all(transaction.status_code == 2 for transaction, _, _ in sim.transactions))
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_to_parquet(self):
+        import pandas as pd
+        with tempfile.TemporaryDirectory() as directory:
+            paths = self.generator.to_parquet(directory)
+            self.assertEqual(len(paths), 3)
+            self.assertEqual(pd.read_parquet(paths[2])['amount'].tolist(), self.generator.generate_day(3)['amount'].tolist())
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            WorkloadGenerator(num_banks=1, num_payments_per_day=10)
+        with self.assertRaises(ValueError):
+            WorkloadGenerator(num_banks=3, num_payments_per_day=10, priority_range=(3, 1))